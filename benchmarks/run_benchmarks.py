@@ -0,0 +1,227 @@
+"""
+Benchmark suite for WLSender hot paths.
+Runs headless and offline against the recorded fixtures in benchmarks/fixtures.
+
+Usage:
+    python -m benchmarks.run_benchmarks                       # run all benchmarks
+    python -m benchmarks.run_benchmarks --save baseline.json  # save results as baseline
+    python -m benchmarks.run_benchmarks --compare baseline.json --threshold 0.2
+    python -m benchmarks.run_benchmarks --filter adif
+Exits with code 1 if a benchmark is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BENCHMARKS = []
+
+# Benchmarks write into this directory, removed at the end of the run
+WORK_DIR = tempfile.mkdtemp(prefix="wlsender_bench_")
+
+def benchmark(name):
+    """
+    Register a benchmark. The decorated function does the setup and returns
+    the callable that is measured.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+def read_fixture(name):
+    """
+    Return the content of a fixture file.
+    """
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+@benchmark("flrig.freq_to_band")
+def bench_freq_to_band():
+    from src.flrig_worker import FLRigWorker
+    freqs = itertools.cycle([1.84, 3.573, 7.074, 10.136, 14.074, 21.074, 28.074, 50.313, 144.3, 432.1, 5.357])
+    return lambda: FLRigWorker.freq_to_band(next(freqs))
+
+@benchmark("flrig.decode_poll")
+def bench_decode_poll():
+    from src.flrig_worker import FLRigWorker
+    polls = itertools.cycle(json.loads(read_fixture("flrig_polls.json")))
+
+    def run():
+        p = next(polls)
+        return FLRigWorker.decode_poll(p["vfo"], float(p["vfoA"]), p["modeA"],
+                                       float(p["vfoB"]), p["modeB"], "A")
+    return run
+
+@benchmark("qrz.parse_callsign")
+def bench_qrz_parse():
+    from src.qrz_lookup import parse_qrz_response
+    text = read_fixture("qrz_callsign.xml")
+    return lambda: parse_qrz_response(text)
+
+@benchmark("qrz.parse_not_found")
+def bench_qrz_parse_not_found():
+    from src.qrz_lookup import parse_qrz_response
+    text = read_fixture("qrz_not_found.xml")
+    return lambda: parse_qrz_response(text)
+
+@benchmark("adif.encode_record")
+def bench_encode_record():
+    from src.adif import encode_record
+    record = json.loads(read_fixture("qso_record.json"))
+    return lambda: encode_record(record)
+
+@benchmark("adif.encode_records_1000")
+def bench_encode_records():
+    from src.adif import encode_records
+    record = json.loads(read_fixture("qso_record.json"))
+    records = [dict(record, CALL=f"DL{i}ABC") for i in range(1000)]
+    return lambda: encode_records(records)
+
+@benchmark("adif.adif_safe")
+def bench_adif_safe():
+    from src.adif import adif_safe
+    texts = itertools.cycle(["Grüße aus Köln", "Besançon", "Scottsdale", "Ærøskøbing", "DL1ABC"])
+    return lambda: adif_safe(next(texts))
+
+@benchmark("adif.adif_safe_uncached")
+def bench_adif_safe_uncached():
+    from src.adif import adif_safe
+    texts = itertools.cycle(["Grüße aus Köln", "Besançon", "Scottsdale", "Ærøskøbing", "DL1ABC"])
+    return lambda: adif_safe.__wrapped__(next(texts))
+
+@benchmark("tags.get_callsign_tags_5000")
+def bench_tags():
+    from src.callsign_tag_editor import get_callsign_tags
+    tags_file = os.path.join(WORK_DIR, "callsign_tags.json")
+    with open(tags_file, "w", encoding="utf-8") as f:
+        json.dump({f"DL{i}ABC": ["POTA", f"Tag {i}"] for i in range(5000)}, f)
+    calls = itertools.cycle([f"DL{i}ABC" for i in range(0, 5000, 7)])
+    return lambda: get_callsign_tags(next(calls), tags_file)
+
+@benchmark("history.save_session_history")
+def bench_history():
+    from src.history import save_session_history
+    history_dir = os.path.join(WORK_DIR, "historie")
+    sent_file = os.path.join(WORK_DIR, "sent_qsos.adi")
+    record = read_fixture("qso_record.json")
+    from src.adif import encode_records
+    with open(sent_file, "w", encoding="utf-8") as f:
+        f.write(encode_records([json.loads(record)] * 200))
+    return lambda: save_session_history(sent_file, max_mb=5, history_dir=history_dir)
+
+@benchmark("history.search_callsign_50000")
+def bench_history_search():
+    from src.history import HistoryArchive
+    archive = HistoryArchive(os.path.join(WORK_DIR, "historie_search"))
+    if not archive.segments:
+        base = json.loads(read_fixture("qso_record.json"))
+        archive.append_records(dict(base, CALL=f"DL{i}XYZ", QSO_DATE=f"2024{1 + i % 12:02d}15")
+                               for i in range(50000))
+    calls = itertools.cycle(["DL123XYZ", "DL49999XYZ", "K1ABC"])
+    return lambda: archive.search_callsign(next(calls))
+
+@benchmark("adif_import.parse_chunk_1000")
+def bench_adif_import_chunk():
+    from src.adif import encode_records
+    from src.adif_import import parse_chunk
+    base = json.loads(read_fixture("qso_record.json"))
+    path = os.path.join(WORK_DIR, "import.adi")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(encode_records(dict(base, CALL=f"DL{i}XYZ", BAND="") for i in range(1000)))
+    size = os.path.getsize(path)
+    return lambda: parse_chunk((path, 0, size))
+
+def percentile(sorted_values, fraction):
+    """
+    Return the given percentile (0..1) of an already sorted list.
+    """
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def measure(fn, duration=0.5, warmup=0.1):
+    """
+    Call fn repeatedly for the given duration and return ops/sec and latency percentiles (µs).
+    """
+    clock = time.perf_counter_ns
+    end = time.perf_counter() + warmup
+    while time.perf_counter() < end:
+        fn()
+    samples = []
+    start = clock()
+    stop = start + int(duration * 1e9)
+    now = start
+    while now < stop:
+        t0 = clock()
+        fn()
+        now = clock()
+        samples.append(now - t0)
+    samples.sort()
+    total = sum(samples)
+    return {
+        "ops_per_sec": round(len(samples) / (total / 1e9), 1) if total else 0.0,
+        "p50_us": round(percentile(samples, 0.50) / 1000, 3),
+        "p95_us": round(percentile(samples, 0.95) / 1000, 3),
+        "p99_us": round(percentile(samples, 0.99) / 1000, 3),
+        "calls": len(samples),
+    }
+
+def compare(results, baseline, threshold):
+    """
+    Return a list of (name, current, baseline) for benchmarks slower than baseline by more than threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append((name, result["ops_per_sec"], base["ops_per_sec"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WLSender benchmark suite")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--duration", type=float, default=0.5, help="Seconds per benchmark")
+    parser.add_argument("--save", help="Save results as baseline JSON file")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    try:
+        print(f"{'benchmark':34} {'ops/sec':>12} {'p50 µs':>10} {'p95 µs':>10} {'p99 µs':>10}")
+        for name, setup in BENCHMARKS:
+            if args.filter not in name:
+                continue
+            result = measure(setup(), duration=args.duration)
+            results[name] = result
+            print(f"{name:34} {result['ops_per_sec']:>12.1f} {result['p50_us']:>10.3f} "
+                  f"{result['p95_us']:>10.3f} {result['p99_us']:>10.3f}")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, current, base in regressions:
+            print(f"REGRESSION {name}: {current:.1f} ops/sec (baseline {base:.1f})")
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+DX cluster telnet stand-in streaming random spots at a configurable rate.
+
+Usage:
+    python -m simulators.dxcluster_sim --port 7300 --rate 20
+"""
+
+import argparse
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+BAND_RANGES_KHZ = ((1810, 1850), (3500, 3800), (7000, 7200), (10100, 10150), (14000, 14350),
+                   (18068, 18168), (21000, 21450), (24890, 24990), (28000, 29000))
+PREFIXES = ("DL", "G", "F", "I", "EA", "OH", "SM", "K", "W", "VE", "JA", "VK", "ZS", "PY", "UA", "SP", "OK", "HB9")
+COMMENTS = ("CW 599", "SSB 59", "FT8 -12 dB", "tnx QSO", "", "RTTY", "up 2", "CQ CQ")
+
+def random_call():
+    return f"{random.choice(PREFIXES)}{random.randint(1, 9)}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=random.randint(2, 3)))}"
+
+def spot_line(freq_khz, call, spotter, comment):
+    """
+    Format a spot like AR-Cluster/DXSpider: 'DX de SPOTTER:  FREQ  CALL  COMMENT  HHMMZ'.
+    """
+    utc = datetime.now(timezone.utc).strftime("%H%M")
+    return f"DX de {spotter + ':':<10}{freq_khz:>8.1f}  {call:<13}{comment:<30} {utc}Z\r\n"
+
+class DXClusterSim:
+    """
+    Telnet server that asks for a login and then streams random spots to every client.
+    """
+    def __init__(self, host="127.0.0.1", port=7300, rate=10.0, calls=500):
+        self.rate = rate
+        self.calls = [random_call() for _ in range(calls)]
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        self.sent = 0
+
+    def start(self):
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        return self
+
+    def accept_loop(self):
+        while self.running:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.serve_client, args=(conn,), daemon=True).start()
+
+    def serve_client(self, conn):
+        try:
+            conn.sendall(b"Welcome to the WLSender DX cluster simulator\r\nlogin: ")
+            conn.settimeout(30)
+            login = conn.recv(256).decode("ascii", errors="replace").strip()
+            conn.sendall(f"Hello {login}\r\n{login} de SIM >\r\n".encode("ascii"))
+            interval = 1.0 / self.rate if self.rate > 0 else 1.0
+            while self.running:
+                low, high = random.choice(BAND_RANGES_KHZ)
+                freq = round(random.uniform(low, high), 1)
+                conn.sendall(spot_line(freq, random.choice(self.calls), random_call(),
+                                       random.choice(COMMENTS)).encode("ascii"))
+                self.sent += 1
+                time.sleep(interval)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def stop(self):
+        self.running = False
+        self.server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DX cluster telnet simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7300)
+    parser.add_argument("--rate", type=float, default=10.0, help="Spots per second per client")
+    parser.add_argument("--calls", type=int, default=500, help="Number of different spotted callsigns")
+    args = parser.parse_args(argv)
+
+    sim = DXClusterSim(args.host, args.port, args.rate, args.calls).start()
+    print(f"DX cluster simulator listening on {args.host}:{sim.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+        print(f"{sim.sent} spots sent.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Scriptable FLRig XML-RPC stand-in with tunable latency and VFO motion.
+
+Usage:
+    python -m simulators.flrig_sim --port 12345 --latency 50 --drift 100
+    python -m simulators.flrig_sim --script steps.json
+
+A script is a JSON list of steps applied one after another, e.g.
+    [{"after": 5, "vfoA": 7074000, "modeA": "LSB"}, {"after": 10, "vfo": "B"}]
+"after" is the number of seconds after the previous step.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from socketserver import ThreadingMixIn
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+class ThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+class RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ("/RPC2",)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet
+
+class SimulatedRig:
+    """
+    Rig state served via the FLRig XML-RPC API (rig.get_vfo, rig.get_vfoA, ...).
+    """
+    def __init__(self, latency_ms=0, jitter_ms=0, drift_hz=0, fail_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.drift_hz = drift_hz  # VFO motion in Hz per second on the active VFO
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.state = {"vfoA": 14074000.0, "modeA": "USB", "vfoB": 7074000.0, "modeB": "LSB", "vfo": "A"}
+        self.last_motion = time.monotonic()
+        self.calls = 0
+
+    def _delay(self):
+        self.calls += 1
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if self.fail_rate and random.random() < self.fail_rate:
+            raise RuntimeError("Simulated FLRig failure")
+
+    def _move(self):
+        now = time.monotonic()
+        if self.drift_hz:
+            key = "vfo" + self.state["vfo"]
+            self.state[key] += self.drift_hz * (now - self.last_motion)
+        self.last_motion = now
+
+    def _get(self, key):
+        self._delay()
+        with self.lock:
+            self._move()
+            return self.state[key]
+
+    def get_vfo(self):
+        with self.lock:
+            active = self.state["vfo"]
+        return str(int(self._get("vfo" + active)))
+
+    def get_vfoA(self):
+        return str(int(self._get("vfoA")))
+
+    def get_vfoB(self):
+        return str(int(self._get("vfoB")))
+
+    def get_modeA(self):
+        return self._get("modeA")
+
+    def get_modeB(self):
+        return self._get("modeB")
+
+    def get_mode(self):
+        with self.lock:
+            active = self.state["vfo"]
+        return self._get("mode" + active)
+
+    def set_frequency(self, freq):
+        self._delay()
+        with self.lock:
+            self.state["vfo" + self.state["vfo"]] = float(freq)
+        return 0
+
+    def set_mode(self, mode):
+        self._delay()
+        with self.lock:
+            self.state["mode" + self.state["vfo"]] = str(mode)
+        return 0
+
+    def apply(self, step):
+        """
+        Apply a script step to the rig state.
+        """
+        with self.lock:
+            for key, value in step.items():
+                if key in ("vfoA", "vfoB"):
+                    self.state[key] = float(value)
+                elif key in ("modeA", "modeB", "vfo"):
+                    self.state[key] = value
+
+    def run_script(self, steps, loop=False):
+        """
+        Apply the script steps with their delays (blocking).
+        """
+        while True:
+            for step in steps:
+                time.sleep(step.get("after", 0))
+                self.apply(step)
+            if not loop:
+                return
+
+def create_server(rig, host="127.0.0.1", port=12345):
+    """
+    Create an XML-RPC server serving the rig; call serve_forever() to run it.
+    """
+    server = ThreadingXMLRPCServer((host, port), requestHandler=RequestHandler,
+                                   allow_none=True, logRequests=False)
+    for name in ("get_vfo", "get_vfoA", "get_vfoB", "get_modeA", "get_modeB", "get_mode",
+                 "set_frequency", "set_mode"):
+        server.register_function(getattr(rig, name), f"rig.{name}")
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FLRig XML-RPC simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--latency", type=float, default=0, help="Response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Additional random latency in ms")
+    parser.add_argument("--drift", type=float, default=0, help="VFO motion in Hz per second")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of failing calls (0..1)")
+    parser.add_argument("--script", help="JSON file with state steps")
+    parser.add_argument("--loop", action="store_true", help="Repeat the script")
+    args = parser.parse_args(argv)
+
+    rig = SimulatedRig(args.latency, args.jitter, args.drift, args.fail_rate)
+    server = create_server(rig, args.host, args.port)
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            steps = json.load(f)
+        threading.Thread(target=rig.run_script, args=(steps, args.loop), daemon=True).start()
+    print(f"FLRig simulator listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{rig.calls} XML-RPC calls served.")
+
+if __name__ == "__main__":
+    main()
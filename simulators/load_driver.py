@@ -0,0 +1,154 @@
+"""
+Load driver measuring end-to-end QSO throughput against the simulators.
+
+Each simulated QSO optionally looks up the callsign (QRZ stand-in) and polls the rig
+(FLRig stand-in), like the form does before sending. It is then submitted to WLSender's
+QSO pipeline with the real stages (enrich, validate, dedupe, encode, deliver to a WLGate
+sink, archive to a temporary session file). Latency is measured from submit until the
+QSO is archived. No GUI is needed.
+
+Usage:
+    python -m simulators.load_driver --count 5000
+    python -m simulators.load_driver --count 500 --qrz http://127.0.0.1:8080/xml/current/ --flrig 127.0.0.1:12345
+Without --wlgate an in-process sink on a free port is used.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import xmlrpc.client
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run(count, rate=0.0, wlgate=None, qrz_url=None, flrig=None):
+    """
+    Send count QSOs through the QSO pipeline and return a result dict with throughput,
+    latency percentiles and the mean time per stage.
+    """
+    from PyQt5 import QtCore
+    from src.dxcc import load_resolver
+    from src.flrig_worker import FLRigWorker
+    from src.qrz_lookup import lookup_qrz
+    from src.session_log import SessionLogModel
+    from src.qso_pipeline import (QSOPipeline, EnrichStage, ValidateStage, DedupeStage, EncodeStage,
+                                  DeliverStage, ArchiveStage, send_to_wlgate)
+    from simulators.wlgate_sink import WLGateSink
+
+    sink = None
+    if wlgate:
+        host, port = wlgate.rsplit(":", 1)
+        target = (host, int(port))
+    else:
+        sink = WLGateSink(port=0, tcp=False).start()
+        target = (sink.host, sink.port)
+    rig = xmlrpc.client.ServerProxy(f"http://{flrig}/RPC2") if flrig else None
+    resolver = load_resolver()
+    session_dir = tempfile.mkdtemp(prefix="wlsender_load_")
+    session_file = os.path.join(session_dir, "sent_qsos.adi")
+    session_log = SessionLogModel(session_file)
+    stages = [EnrichStage(lambda: resolver), ValidateStage(), DedupeStage(), EncodeStage(),
+              DeliverStage(lambda record, adif: send_to_wlgate(adif, *target)),
+              ArchiveStage(session_log.archive_record)]
+    pipeline = QSOPipeline(stages)
+
+    lock = threading.Lock()
+    latencies = []
+    stage_seconds = {}
+    failures = 0
+    finished = threading.Event()
+    if not count:
+        finished.set()
+
+    def on_done(job):
+        with lock:
+            latencies.append(time.perf_counter() - job.submitted)
+            for name, seconds in job.timings.items():
+                stage_seconds[name] = stage_seconds.get(name, 0.0) + seconds
+            if len(latencies) + failures >= count:
+                finished.set()
+
+    def on_failed(job, stage, error):
+        nonlocal failures
+        print(f"QSO {job.record['CALL']} failed in {stage}: {error}", file=sys.stderr)
+        with lock:
+            failures += 1
+            if len(latencies) + failures >= count:
+                finished.set()
+
+    # The driver has no event loop, the results are taken in the stage threads
+    pipeline.qso_done.connect(on_done, QtCore.Qt.DirectConnection)
+    pipeline.qso_failed.connect(on_failed, QtCore.Qt.DirectConnection)
+    pipeline.start()
+
+    session_key = None
+    rejected = 0
+    interval = 1.0 / rate if rate else 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        call = f"DL{i % 10}{chr(65 + i % 26)}{chr(65 + (i // 26) % 26)}{chr(65 + (i // 676) % 26)}"
+        record = {"CALL": call, "QSO_DATE": time.strftime("%Y%m%d", time.gmtime()),
+                  "TIME_ON": time.strftime("%H%M%S", time.gmtime()), "BAND": "20M", "FREQ": "14.074",
+                  "MODE": "SSB", "RST_SENT": "59", "RST_RCVD": "59"}
+        try:
+            if qrz_url:
+                data, session_key = lookup_qrz(call, "loadtest", "loadtest", session_key, qrz_url)
+                if data:
+                    record.update(NAME=data["name"], QTH=data["qth"], COUNTRY=data["country"],
+                                  GRIDSQUARE=data["gridsquare"])
+            if rig:
+                freq, mode, band, _ = FLRigWorker.decode_poll(
+                    rig.rig.get_vfo(), float(rig.rig.get_vfoA()), rig.rig.get_modeA(),
+                    float(rig.rig.get_vfoB()), rig.rig.get_modeB(), "A")
+                record.update(FREQ=str(int(freq) / 1e6) if freq else "", MODE=mode or "SSB", BAND=band)
+        except Exception as e:
+            print(f"QSO {i}: lookup failed: {e}", file=sys.stderr)
+        while not pipeline.submit(record):  # Backpressure: the first stage queue is full
+            rejected += 1
+            time.sleep(0.001)
+        if interval:
+            next_time = start + (i + 1) * interval
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+    finished.wait()
+    elapsed = time.perf_counter() - start
+    pipeline.stop()
+    archived = 0
+    if os.path.exists(session_file):
+        with open(session_file, encoding="utf-8") as f:
+            archived = sum(1 for _ in f)
+    shutil.rmtree(session_dir, ignore_errors=True)
+
+    result = {"sent": len(latencies), "failures": failures, "rejected": rejected, "archived": archived,
+              "seconds": round(elapsed, 3), "qso_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0}
+    latencies.sort()
+    if latencies:
+        result.update({f"p{int(p * 100)}_ms": round(percentile(latencies, p) * 1000, 3) for p in (0.5, 0.95, 0.99)})
+        result.update({f"{name}_ms": round(seconds / len(latencies) * 1000, 3)
+                       for name, seconds in stage_seconds.items()})
+    if sink:
+        time.sleep(0.5)  # Let the sink drain its socket
+        result["received"] = sink.stats()["count"]
+        sink.stop()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end QSO load driver")
+    parser.add_argument("--count", type=int, default=1000, help="Number of QSOs")
+    parser.add_argument("--rate", type=float, default=0.0, help="QSOs per second (0 = as fast as possible)")
+    parser.add_argument("--wlgate", help="host:port of a running WLGate (sink); default: in-process sink")
+    parser.add_argument("--qrz", help="Base URL of a QRZ stand-in, e.g. http://127.0.0.1:8080/xml/current/")
+    parser.add_argument("--flrig", help="host:port of an FLRig (stand-in) to poll per QSO")
+    args = parser.parse_args(argv)
+    result = run(args.count, args.rate, args.wlgate, args.qrz, args.flrig)
+    for key, value in result.items():
+        print(f"{key:12} {value}")
+    return 0 if not result["failures"] else 1
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    sys.exit(main())
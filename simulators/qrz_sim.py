@@ -0,0 +1,166 @@
+"""
+QRZ.com XML API stand-in with configurable delay and failures.
+
+Usage:
+    python -m simulators.qrz_sim --port 8080 --delay 200 --fail-rate 0.1
+Then set "qrz_url": "http://127.0.0.1:8080/xml/current/" in data/wlsender_config.json.
+
+Callsigns containing "XX" are answered with "Not found", all others with
+generated data (or the entries of the --calls JSON file). The extended fields link to
+a generated profile image (/images/CALL.png) and a biography (html=CALL).
+"""
+
+import argparse
+import json
+import random
+import struct
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+SESSION_TEMPLATE = (
+    "<Session><Key>{key}</Key><Count>{count}</Count>"
+    "<GMTime>{gmtime}</GMTime></Session>"
+)
+ERROR_TEMPLATE = "<Session><Error>{error}</Error><GMTime>{gmtime}</GMTime></Session>"
+CALLSIGN_TEMPLATE = (
+    "<Callsign><call>{call}</call><fname>{fname}</fname><name>{name}</name>"
+    "<addr2>{qth}</addr2><country>{country}</country><grid>{grid}</grid>"
+    "<class>{license_class}</class><email>{email}</email>"
+    "<addr1>{addr1}</addr1><state>{state}</state><zip>{zip}</zip><qslmgr>{qslmgr}</qslmgr>"
+    "<eqsl>{eqsl}</eqsl><lotw>{lotw}</lotw><mqsl>{mqsl}</mqsl><image>{image}</image>"
+    "<bio>{bio}</bio><born>{born}</born><url>{url}</url></Callsign>"
+)
+BIO_TEMPLATE = "<html><body><h1>{call}</h1><p>Welcome to my QRZ.com page!</p><p>73 de {call}</p></body></html>"
+
+def png_image(call, size=480):
+    """
+    Generate a solid-colour PNG whose colour depends on the callsign.
+    """
+    color = bytes(zlib.crc32(call.encode("ascii")).to_bytes(4, "big")[:3])
+    raw = b"".join(b"\x00" + color * size for _ in range(size))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+def xml_document(body):
+    return (
+        '<?xml version="1.0" encoding="utf-8" ?>\n'
+        '<QRZDatabase version="1.34" xmlns="http://xmldata.qrz.com">' + body + "</QRZDatabase>"
+    )
+
+def parse_query(query):
+    """
+    Parse a QRZ style query string; QRZ uses ';' as well as '&' as separator.
+    """
+    params = {}
+    for part in query.replace("&", ";").split(";"):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            params[key.lower()] = unquote(value)
+    return params
+
+class QRZSimulator:
+    """
+    Session handling and callsign data of the simulated QRZ.com service.
+    """
+    def __init__(self, delay_ms=0, fail_rate=0.0, calls=None):
+        self.delay_ms = delay_ms
+        self.fail_rate = fail_rate
+        self.calls = calls or {}
+        self.sessions = set()
+        self.requests = 0
+
+    def respond(self, params, base_url="http://127.0.0.1:8080"):
+        """
+        Return (http_status, xml_text) for the query parameters.
+        """
+        self.requests += 1
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        gmtime = time.strftime("%a %b %d %H:%M:%S %Y", time.gmtime())
+        if self.fail_rate and random.random() < self.fail_rate:
+            return 503, "Service unavailable"
+        if "username" in params:
+            if not params.get("password"):
+                return 200, xml_document(ERROR_TEMPLATE.format(error="Username/password incorrect", gmtime=gmtime))
+            key = uuid.uuid4().hex
+            self.sessions.add(key)
+            return 200, xml_document(SESSION_TEMPLATE.format(key=key, count=self.requests, gmtime=gmtime))
+        key = params.get("s", "")
+        if key not in self.sessions:
+            return 200, xml_document(ERROR_TEMPLATE.format(error="Session Timeout", gmtime=gmtime))
+        session = SESSION_TEMPLATE.format(key=key, count=self.requests, gmtime=gmtime)
+        if params.get("html"):
+            return 200, BIO_TEMPLATE.format(call=params["html"].upper())
+        call = params.get("callsign", "").upper()
+        if not call or "XX" in call:
+            return 200, xml_document(
+                ERROR_TEMPLATE.format(error=f"Not found: {call}", gmtime=gmtime).replace("</Session>", "") +
+                f"<Key>{key}</Key></Session>")
+        data = {
+            "call": call, "fname": "Test", "name": f"Operator {call}", "qth": "Testcity",
+            "country": "Germany", "grid": "JO31", "license_class": "A", "email": f"{call.lower()}@example.com",
+            "addr1": "Teststrasse 1", "state": "NW", "zip": "12345", "qslmgr": "", "eqsl": "1", "lotw": "1",
+            "mqsl": "0", "image": f"{base_url}/images/{call}.png", "bio": "1024", "born": "1970",
+            "url": f"https://www.qrz.com/db/{call}",
+        }
+        data.update(self.calls.get(call, {}))
+        return 200, xml_document(CALLSIGN_TEMPLATE.format(**data) + session)
+
+def create_server(simulator, host="127.0.0.1", port=8080):
+    """
+    Create an HTTP server for the simulator; call serve_forever() to run it.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlsplit(self.path)
+            if path.path.startswith("/images/"):
+                body, content_type = png_image(path.path.rsplit("/", 1)[-1].split(".")[0]), "image/png"
+                status = 200
+            else:
+                status, text = simulator.respond(parse_query(path.query), f"http://{self.headers['Host']}")
+                body, content_type = text.encode("utf-8"), "text/xml; charset=utf-8"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QRZ.com XML API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=0, help="Response delay in ms")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of HTTP 503 responses (0..1)")
+    parser.add_argument("--calls", help="JSON file: {CALL: {fname, name, qth, country, grid, ...}}")
+    args = parser.parse_args(argv)
+
+    calls = {}
+    if args.calls:
+        with open(args.calls, "r", encoding="utf-8") as f:
+            calls = {call.upper(): data for call, data in json.load(f).items()}
+    simulator = QRZSimulator(args.delay, args.fail_rate, calls)
+    server = create_server(simulator, args.host, args.port)
+    print(f"QRZ simulator listening on http://{args.host}:{server.server_port}/xml/current/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{simulator.requests} requests served.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+WLGate stand-in: receives QSOs via UDP (and TCP), records and counts them.
+
+Usage:
+    python -m simulators.wlgate_sink --port 2237 --record received.adi
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+class WLGateSink:
+    """
+    Counts and optionally records received QSO datagrams / TCP lines.
+    """
+    def __init__(self, host="127.0.0.1", port=2237, record_file=None, tcp=True):
+        self.host = host
+        self.port = port
+        self.record_file = record_file
+        self.tcp = tcp
+        self.lock = threading.Lock()
+        self.count = 0
+        self.bytes = 0
+        self.first_time = None
+        self.last_time = None
+        self.running = False
+        self.udp_sock = None
+        self.tcp_sock = None
+        self.threads = []
+
+    def start(self):
+        """
+        Bind the sockets and start the receiver threads.
+        """
+        self.running = True
+        self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.udp_sock.bind((self.host, self.port))
+        self.port = self.udp_sock.getsockname()[1]  # Port 0 = choose a free port
+        self.udp_sock.settimeout(0.5)
+        self.threads.append(threading.Thread(target=self._udp_loop, daemon=True))
+        if self.tcp:
+            self.tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.tcp_sock.bind((self.host, self.port))
+            self.tcp_sock.listen(5)
+            self.tcp_sock.settimeout(0.5)
+            self.threads.append(threading.Thread(target=self._tcp_loop, daemon=True))
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the receiver threads and close the sockets.
+        """
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=2)
+        for sock in (self.udp_sock, self.tcp_sock):
+            if sock:
+                sock.close()
+
+    def _record(self, data):
+        now = time.perf_counter()
+        with self.lock:
+            self.count += 1
+            self.bytes += len(data)
+            self.first_time = self.first_time or now
+            self.last_time = now
+            if self.record_file:
+                with open(self.record_file, "ab") as f:
+                    f.write(data.rstrip(b"\n") + b"\n")
+
+    def _udp_loop(self):
+        while self.running:
+            try:
+                data, _ = self.udp_sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._record(data)
+
+    def _tcp_loop(self):
+        while self.running:
+            try:
+                conn, _ = self.tcp_sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._tcp_client, args=(conn,), daemon=True).start()
+
+    def _tcp_client(self, conn):
+        buffer = b""
+        with conn:
+            conn.settimeout(0.5)
+            while self.running:
+                try:
+                    chunk = conn.recv(65535)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        self._record(line)
+
+    def stats(self):
+        """
+        Return received count, bytes and receive rate.
+        """
+        with self.lock:
+            duration = (self.last_time - self.first_time) if self.count > 1 else 0.0
+            return {
+                "count": self.count,
+                "bytes": self.bytes,
+                "rate_per_sec": round((self.count - 1) / duration, 1) if duration else 0.0,
+            }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WLGate UDP/TCP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2237)
+    parser.add_argument("--record", help="Append received QSOs to this file")
+    parser.add_argument("--no-tcp", action="store_true", help="Only listen on UDP")
+    args = parser.parse_args(argv)
+
+    sink = WLGateSink(args.host, args.port, args.record, tcp=not args.no_tcp).start()
+    print(f"WLGate sink listening on {args.host}:{sink.port}")
+    last_count = 0
+    try:
+        while True:
+            time.sleep(5)
+            stats = sink.stats()
+            if stats["count"] != last_count:
+                print(f"{stats['count']} QSOs received ({stats['bytes']} bytes)")
+                last_count = stats["count"]
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+        print(f"Total: {sink.stats()}")
+
+if __name__ == "__main__":
+    main()
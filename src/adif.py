@@ -0,0 +1,103 @@
+"""
+ADIF reading and encoding helpers, independent of the GUI.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Field order of a QSO record as sent to WLGate
+ADIF_FIELDS = (
+    "CALL", "QSO_DATE", "TIME_ON", "TIME_OFF", "BAND", "FREQ", "MODE", "RST_SENT", "RST_RCVD",
+    "GRIDSQUARE", "COMMENT", "NAME", "QTH", "TX_PWR", "COUNTRY", "OPERATOR", "STATION_CALLSIGN", "DXCC",
+    "STX", "SRX", "CONTEST_ID",
+)
+
+# German umlauts and ß are transliterated, all other accents are removed
+_TRANSLITERATION = str.maketrans({
+    "ä": "ae", "ö": "oe", "ü": "ue",
+    "Ä": "Ae", "Ö": "Oe", "Ü": "Ue",
+    "ß": "ss",
+})
+
+_FIELD_RE = re.compile(r"<([A-Za-z0-9_]+)(?::(\d+))?(?::[A-Za-z])?>")
+
+def iter_adif_records(f, chunk_size=1024 * 1024):
+    """
+    Yield ADIF records from a text file object as dicts with upper-case field names.
+    The file is read in chunks, so large logs are never loaded completely.
+    """
+    buffer = ""
+    pos = 0
+    record = {}
+    while True:
+        match = _FIELD_RE.search(buffer, pos)
+        if match is None or match.end() + int(match.group(2) or 0) > len(buffer):
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        name = match.group(1).upper()
+        length = int(match.group(2) or 0)
+        if name == "EOR":
+            if record:
+                yield record
+            record = {}
+        elif name == "EOH":
+            record = {}  # Everything before the header end is not a QSO
+        elif length:
+            record[name] = buffer[match.end():match.end() + length]
+        pos = match.end() + length
+    if record:
+        yield record
+
+@lru_cache(maxsize=8192)
+def adif_safe(text):
+    """
+    Convert text to ADIF-safe ASCII: replaces German umlauts and ß, removes accents.
+    """
+    text = text.translate(_TRANSLITERATION)
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+def adif_freq(freq_text):
+    """
+    Convert a displayed frequency to ADIF format, e.g. "7.012.620" -> "7.01262".
+    """
+    freq_parts = freq_text.split(".")
+    if len(freq_parts) == 3:
+        return f"{freq_parts[0]}.{freq_parts[1]}{freq_parts[2]}"
+    return freq_text.replace(",", ".")  # Fallback
+
+def _append_record(parts, record, fields):
+    get = record.get
+    for name in fields:
+        value = get(name)
+        if value:
+            value = adif_safe(value.strip())
+            if value:
+                parts.append(f"<{name}:{len(value)}>{value}")
+    parts.append("<EOR>")
+
+def encode_record(record, fields=ADIF_FIELDS):
+    """
+    Encode a QSO record (dict of ADIF field name -> text) as one ADIF line.
+    Empty fields are omitted.
+    """
+    parts = []
+    _append_record(parts, record, fields)
+    return "".join(parts)
+
+def encode_records(records, fields=ADIF_FIELDS, separator="\n"):
+    """
+    Encode many QSO records in one call; records are separated by separator.
+    All fields are collected in a single part list and joined once.
+    """
+    parts = []
+    for record in records:
+        _append_record(parts, record, fields)
+        parts.append(separator)
+    return "".join(parts)
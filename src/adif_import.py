@@ -0,0 +1,181 @@
+"""
+Parallel import of large ADIF logs (LoTW, QRZ logbook, WaveLog exports) into the history archive.
+
+The file is split into byte ranges at <EOR> boundaries, the ranges are parsed and normalized
+in a process pool, and the deduplicated records are appended to the archive in bulk.
+"""
+
+import io
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from PyQt5 import QtCore
+from src import metrics
+from src.adif import iter_adif_records
+from src.dxcc import extract_core_callsign
+from src.flrig_worker import FLRigWorker
+from src.history import HISTORY_DIR, HistoryArchive, encode_entry
+from src.logger import log_error, log_info
+
+CHUNK_BYTES = 4 * 1024 * 1024
+_EOR_RE = re.compile(rb"<eor>", re.IGNORECASE)
+_EOH_RE = re.compile(rb"<eoh>", re.IGNORECASE)
+
+def split_adif_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Return (start, end) byte ranges of the file, each ending directly after an <EOR>.
+    The header up to <EOH> is skipped.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        head = f.read(min(size, 64 * 1024))
+        match = _EOH_RE.search(head)
+        start = match.end() if match else 0
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                ranges.append((start, size))
+                break
+            # Extend the range to directly after the next <EOR>
+            f.seek(end)
+            carry = b""
+            while True:
+                block = f.read(64 * 1024)
+                if not block:
+                    end = size
+                    break
+                buffer = carry + block
+                match = _EOR_RE.search(buffer)
+                if match:
+                    end += match.end()
+                    break
+                carry = buffer[-4:]  # An <EOR> may span two blocks
+                end += len(buffer) - len(carry)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def normalize_record(record):
+    """
+    Normalize a record to WLSender conventions: upper-case call, band derived from FREQ
+    (e.g. "40M") if missing, upper-case mode, HHMMSS times. Returns None for records without call.
+    """
+    call = record.get("CALL", "").strip().upper()
+    if not call:
+        return None
+    record["CALL"] = call
+    band = record.get("BAND", "").strip().upper()
+    if not band and record.get("FREQ"):
+        try:
+            band = FLRigWorker.freq_to_band(float(record["FREQ"]))
+        except ValueError:
+            band = ""
+    if band:
+        record["BAND"] = band
+    if record.get("MODE"):
+        record["MODE"] = record["MODE"].strip().upper()
+    for field in ("TIME_ON", "TIME_OFF"):
+        value = record.get(field, "").strip()
+        if len(value) == 4:
+            record[field] = value + "00"
+    return record
+
+def dedupe_key(record):
+    """
+    Two records are duplicates if core call, date, minute, band and mode match.
+    """
+    return (extract_core_callsign(record["CALL"]), record.get("QSO_DATE", ""),
+            record.get("TIME_ON", "")[:4], record.get("BAND", ""), record.get("MODE", ""))
+
+def parse_chunk(args):
+    """
+    Parse, normalize and encode one byte range of an ADIF file (runs in a worker process).
+    Returns a list of (dedupe_key, archive_entry) tuples.
+    """
+    path, start, end = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+    results = []
+    for record in iter_adif_records(io.StringIO(text)):
+        record = normalize_record(record)
+        if record:
+            results.append((dedupe_key(record), encode_entry(record)))
+    return results
+
+def import_adif_history(path, history_dir=HISTORY_DIR, workers=None, progress=None, is_cancelled=None):
+    """
+    Import an ADIF file into the history archive. Records already in the archive or repeated
+    in the file are skipped. progress(done_chunks, total_chunks) is called per chunk;
+    is_cancelled() stops the import after the current chunk.
+    Returns (imported, duplicates, records_per_second).
+    """
+    start_time = time.perf_counter()
+    archive = HistoryArchive(history_dir)
+    ranges = split_adif_chunks(path)
+    # Keys of the already archived QSOs, normalized like the imported ones
+    seen = {dedupe_key(record) for record in map(normalize_record, archive.iter_records()) if record}
+    imported = duplicates = parsed = 0
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # At most two chunks per worker are in flight, so parsed chunks never pile up in memory
+        pending = deque()
+        chunks = iter(ranges)
+        for start, end in islice(chunks, 2 * workers):
+            pending.append(executor.submit(parse_chunk, (path, start, end)))
+        done = 0
+        while pending:
+            results = pending.popleft().result()
+            next_range = next(chunks, None)
+            if next_range:
+                pending.append(executor.submit(parse_chunk, (path,) + next_range))
+            parsed += len(results)
+            fresh = []
+            for key, entry in results:
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                fresh.append(entry)
+            imported += archive.append_entries(fresh)
+            done += 1
+            if progress:
+                progress(done, len(ranges))
+            if is_cancelled and is_cancelled():
+                for future in pending:
+                    future.cancel()
+                break
+    elapsed = time.perf_counter() - start_time
+    rate = parsed / elapsed if elapsed else 0.0
+    metrics.inc("adif_import_records_total", imported)
+    metrics.REGISTRY.gauge("adif_import_records_per_second").set(round(rate))
+    log_info(f"ADIF import from {path}: {imported} imported, {duplicates} duplicates, "
+             f"{rate:.0f} records/s using {len(ranges)} chunks.")
+    return imported, duplicates, rate
+
+class AdifImportWorker(QtCore.QThread):
+    """
+    Worker thread for importing an ADIF log into the history.
+    """
+    progress = QtCore.pyqtSignal(int, int)  # done chunks, total chunks
+    finished_import = QtCore.pyqtSignal(int, int, str)  # imported records, duplicates, error message
+
+    def __init__(self, path, history_dir=HISTORY_DIR):
+        super().__init__()
+        self.path = path
+        self.history_dir = history_dir
+        self.cancelled = False
+
+    def run(self):
+        try:
+            imported, duplicates, _ = import_adif_history(self.path, self.history_dir,
+                                                          progress=self.progress.emit,
+                                                          is_cancelled=lambda: self.cancelled)
+            self.finished_import.emit(imported, duplicates, "")
+        except Exception as e:
+            log_error(f"ADIF import error: {e}")
+            self.finished_import.emit(0, 0, str(e))
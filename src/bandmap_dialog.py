@@ -0,0 +1,89 @@
+"""
+Non-modal bandmap showing the DX cluster spots around the current VFO frequency.
+"""
+
+from PyQt5 import QtWidgets, QtCore, QtGui
+from src.dx_cluster import spot_mode, worked_status
+
+STATUS_COLORS = {"new": "#4caf50", "new_band": "#ffb300", "worked": "#808080"}
+
+class BandMapDialog(QtWidgets.QDialog):
+    """
+    Table of spots near the VFO, sorted by frequency and marked new/worked.
+    Clicking a spot emits spot_selected.
+    """
+    spot_selected = QtCore.pyqtSignal(object)
+    COLUMNS = ["freq", "call", "status", "mode", "spotter", "utc", "comment"]
+    SPANS_KHZ = [5, 25, 100, 500]
+
+    def __init__(self, parent, translation, bandmap, get_vfo_khz, get_worked_index):
+        """
+        get_vfo_khz and get_worked_index are callables returning the current VFO frequency
+        in kHz (0 if unknown) and the worked-before index (or None).
+        """
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.bandmap = bandmap
+        self.get_vfo_khz = get_vfo_khz
+        self.get_worked_index = get_worked_index
+        self.shown_spots = []
+        self.setWindowTitle(self.translation.get("bandmap", "Bandmap"))
+        self.resize(620, 420)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        top = QtWidgets.QHBoxLayout()
+        self.vfo_label = QtWidgets.QLabel()
+        top.addWidget(self.vfo_label)
+        top.addStretch()
+        self.span_combo = QtWidgets.QComboBox()
+        for span in self.SPANS_KHZ:
+            self.span_combo.addItem(f"± {span} kHz", span)
+        self.span_combo.setCurrentIndex(1)
+        self.span_combo.currentIndexChanged.connect(self.refresh)
+        top.addWidget(self.span_combo)
+        layout.addLayout(top)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(
+            [self.translation.get(f"bandmap_{c}", c.capitalize()) for c in self.COLUMNS])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.cellClicked.connect(self.on_cell_clicked)
+        layout.addWidget(self.table)
+
+        self.status_label = QtWidgets.QLabel()
+        layout.addWidget(self.status_label)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Show the spots within the selected span around the VFO.
+        """
+        vfo_khz = self.get_vfo_khz()
+        span = self.span_combo.currentData()
+        self.vfo_label.setText(f"VFO {vfo_khz:.1f} kHz" if vfo_khz else "VFO -")
+        spots = self.bandmap.near(vfo_khz, span) if vfo_khz else []
+        worked_index = self.get_worked_index()
+        self.shown_spots = spots
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(spots))
+        for row, spot in enumerate(spots):
+            status = worked_status(spot, worked_index)
+            cells = [f"{spot.freq_khz:.1f}", spot.call, self.translation.get(f"spot_{status}", status),
+                     spot_mode(spot), spot.spotter, spot.utc, spot.comment]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+                item.setForeground(QtGui.QBrush(QtGui.QColor(STATUS_COLORS.get(status, "#ffffff"))))
+        self.table.setUpdatesEnabled(True)
+        self.status_label.setText(self.translation.get("bandmap_spot_count", "{count} spots in bandmap").format(
+            count=len(self.bandmap)))
+
+    def on_cell_clicked(self, row, column):
+        if 0 <= row < len(self.shown_spots):
+            self.spot_selected.emit(self.shown_spots[row])
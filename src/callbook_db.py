@@ -0,0 +1,163 @@
+"""
+Local callbook database for lookups without network access.
+"""
+
+import csv
+import os
+import sqlite3
+from functools import lru_cache
+from PyQt5 import QtCore
+from src.adif import iter_adif_records
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+
+CALLBOOK_DB_FILE = user_data_path("callbook.sqlite")
+IMPORT_BATCH_SIZE = 50000
+
+# Accepted column / ADIF field names for each callbook field (first match wins)
+FIELD_ALIASES = {
+    "call": ("CALL", "CALLSIGN"),
+    "fname": ("FNAME", "FIRST_NAME", "FIRSTNAME"),
+    "name": ("NAME", "LAST_NAME", "LASTNAME"),
+    "qth": ("QTH", "ADDR2", "CITY"),
+    "country": ("COUNTRY",),
+    "gridsquare": ("GRIDSQUARE", "GRID", "LOCATOR"),
+}
+
+def _connect(path, for_import=False):
+    conn = sqlite3.connect(path)
+    if for_import:
+        # Bulk import: no journal and no fsync, a failed import is simply repeated
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+    else:
+        conn.execute("PRAGMA mmap_size=268435456")  # Memory-map up to 256 MB of the database
+        conn.execute("PRAGMA query_only=ON")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS callbook ("
+        "call TEXT PRIMARY KEY, name TEXT, qth TEXT, country TEXT, gridsquare TEXT"
+        ") WITHOUT ROWID"
+    )
+    return conn
+
+def _normalize_row(row):
+    """
+    Map a CSV row or ADIF record (upper-case keys) to a callbook tuple, or None.
+    """
+    values = {}
+    for field, aliases in FIELD_ALIASES.items():
+        values[field] = next((row[a].strip() for a in aliases if row.get(a)), "")
+    call = values["call"].upper()
+    if not call:
+        return None
+    name = f"{values['fname']} {values['name']}".strip()
+    return (call, name, values["qth"], values["country"], values["gridsquare"].upper())
+
+def _iter_rows(path):
+    """
+    Yield callbook tuples from a CSV or ADIF file.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        if path.lower().endswith((".adi", ".adif")):
+            records = iter_adif_records(f)
+        else:
+            reader = csv.reader(f)
+            header = [column.strip().upper() for column in next(reader, [])]
+            records = (dict(zip(header, row)) for row in reader)
+        for record in records:
+            row = _normalize_row(record)
+            if row:
+                yield row
+
+def import_callbook(path, db_path=CALLBOOK_DB_FILE, progress=None, is_cancelled=None):
+    """
+    Import a CSV or ADIF file into the callbook database in batches.
+    Existing calls are replaced. Returns the number of imported rows.
+    progress(count) is called after each batch; is_cancelled() stops the import.
+    """
+    conn = _connect(db_path, for_import=True)
+    count = 0
+    try:
+        batch = []
+        for row in _iter_rows(path):
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                conn.executemany("INSERT OR REPLACE INTO callbook VALUES (?, ?, ?, ?, ?)", batch)
+                count += len(batch)
+                batch = []
+                if progress:
+                    progress(count)
+                if is_cancelled and is_cancelled():
+                    break
+        else:
+            conn.executemany("INSERT OR REPLACE INTO callbook VALUES (?, ?, ?, ?, ?)", batch)
+            count += len(batch)
+        conn.commit()
+    finally:
+        conn.close()
+    log_info(f"Callbook import from {path}: {count} rows.")
+    return count
+
+class CallbookDB:
+    """
+    Read access to the local callbook, used as first lookup tier before QRZ.com.
+    """
+    def __init__(self, db_path=CALLBOOK_DB_FILE):
+        self.db_path = db_path
+        self.conn = None
+        self.lookup = lru_cache(maxsize=1024)(self._lookup)
+
+    def is_available(self):
+        """
+        Return True if a callbook database exists.
+        """
+        return os.path.exists(self.db_path)
+
+    def reload(self):
+        """
+        Drop cached results and the connection, e.g. after an import.
+        """
+        self.lookup.cache_clear()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def _lookup(self, call):
+        """
+        Return a dict like lookup_qrz (name, qth, country, gridsquare) or None.
+        """
+        if not call or not self.is_available():
+            return None
+        try:
+            if self.conn is None:
+                self.conn = _connect(self.db_path)
+            row = self.conn.execute(
+                "SELECT name, qth, country, gridsquare FROM callbook WHERE call = ?", (call.upper(),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            log_error(f"Callbook lookup error: {e}")
+            return None
+        if not row:
+            return None
+        return {"name": row[0], "qth": row[1], "country": row[2], "gridsquare": row[3]}
+
+class CallbookImportWorker(QtCore.QThread):
+    """
+    Worker thread for importing a callbook file.
+    """
+    progress = QtCore.pyqtSignal(int)  # imported rows so far
+    finished_import = QtCore.pyqtSignal(int, str)  # imported rows, error message
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.cancelled = False
+
+    def run(self):
+        try:
+            count = import_callbook(self.path, progress=self.progress.emit,
+                                    is_cancelled=lambda: self.cancelled)
+            self.finished_import.emit(count, "")
+        except Exception as e:
+            log_error(f"Callbook import error: {e}")
+            self.finished_import.emit(0, str(e))
@@ -7,6 +7,16 @@ from src.utils import resource_path
 DATA_DIR = resource_path("data")
 CALLSIGN_TAGS_FILE = user_data_path("callsign_tags.json")
 
+def get_callsign_tags(callsign, tags_file=CALLSIGN_TAGS_FILE):
+    """
+    Return the tags stored for a callsign (empty list if none).
+    """
+    if not os.path.exists(tags_file):
+        return []
+    with open(tags_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get(callsign, [])
+
 class CallsignTagEditor(QtWidgets.QDialog):
     """
     Dialog for editing callsign tags.
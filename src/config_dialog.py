@@ -62,7 +62,10 @@ def load_config():
         # Decrypt password if present
         if cfg.get("qrz_password"):
             try:
-                cfg["qrz_password"] = decrypt_password(cfg["qrz_password"])
+                stored = cfg["qrz_password"]
+                cfg["qrz_password"] = decrypt_password(stored)
+                if not cfg["qrz_password"] and not stored.startswith("gAAAAA"):
+                    cfg["qrz_password"] = stored  # Not a Fernet token: saved in plain text by an older version
             except Exception:
                 cfg["qrz_password"] = ""
         return cfg
@@ -79,8 +82,11 @@ def load_config():
 
 def save_config(cfg):
     """
-    Save configuration to file.
+    Save configuration to file. cfg holds the plain QRZ password (as from load_config),
+    it is always written encrypted.
     """
+    cfg = dict(cfg)
+    cfg["qrz_password"] = encrypt_password(cfg.get("qrz_password", ""))
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2)
 
@@ -97,12 +103,12 @@ class ConfigDialog(QtWidgets.QDialog):
         self.config = config or load_config()
         self.translation = translation or load_translation(self.config.get("language", "en"))
         self.setWindowTitle(self.translation["config_title"])
-        self.setFixedSize(420, 360)
+        self.setFixedSize(420, 470)
         font = self.font()
         font.setPointSize(font.pointSize() + 2)  # Increase font size
         self.setFont(font)
         self.setModal(True)
-        self.resize(420, 360)
+        self.resize(420, 470)
         layout = QtWidgets.QFormLayout(self)
 
         self.wlgate_host = QtWidgets.QLineEdit(self.config.get("wlgate_host", "127.0.0.1"))
@@ -113,23 +119,32 @@ class ConfigDialog(QtWidgets.QDialog):
         self.qrz_password = QtWidgets.QLineEdit(self.config.get("qrz_password", ""))
         self.qrz_password.setEchoMode(QtWidgets.QLineEdit.Password)
         self.station_callsign = QtWidgets.QLineEdit(self.config.get("station_callsign", ""))
+        self.station_locator = QtWidgets.QLineEdit(self.config.get("station_locator", ""))
         self.flrig_host = QtWidgets.QLineEdit(self.config.get("flrig_host", "127.0.0.1"))
         self.flrig_port = QtWidgets.QSpinBox()
         self.flrig_port.setRange(1, 65535)
         self.flrig_port.setValue(self.config.get("flrig_port", 12345))
+        self.metrics_port = QtWidgets.QSpinBox()
+        self.metrics_port.setRange(0, 65535)
+        self.metrics_port.setSpecialValueText(self.translation.get("off", "Off"))
+        self.metrics_port.setValue(self.config.get("metrics_port", 0))
 
         # Set font for all widgets
         for widget in [self.wlgate_host, self.qrz_username, self.qrz_password,
-                       self.station_callsign, self.flrig_host]:
+                       self.station_callsign, self.station_locator, self.flrig_host]:
             widget.setMinimumHeight(32)
             widget.setFont(font)
         self.wlgate_port.setFont(font)
         self.flrig_port.setFont(font)
+        self.metrics_port.setFont(font)
 
         
         self.debug_checkbox = QtWidgets.QCheckBox(self.translation.get("show_debug", "Show FLRig debug field"))
         self.debug_checkbox.setChecked(self.config.get("show_debug", False))
         self.debug_checkbox.setFont(font)
+        self.sync_checkbox = QtWidgets.QCheckBox(self.translation.get("sync_bus", "Multi-op sync (LAN)"))
+        self.sync_checkbox.setChecked(self.config.get("sync_bus", False))
+        self.sync_checkbox.setFont(font)
 
         # Language selection
         self.language_combo = QtWidgets.QComboBox()
@@ -144,9 +159,12 @@ class ConfigDialog(QtWidgets.QDialog):
         layout.addRow(self.translation["qrz_username"], self.qrz_username)
         layout.addRow(self.translation["qrz_password"], self.qrz_password)
         layout.addRow(self.translation["station_callsign"], self.station_callsign)
+        layout.addRow(self.translation.get("station_locator", "Own Locator"), self.station_locator)
         layout.addRow(self.translation["flrig_host"], self.flrig_host)
         layout.addRow(self.translation["flrig_port"], self.flrig_port)
+        layout.addRow(self.translation.get("metrics_port", "Metrics HTTP Port"), self.metrics_port)
         layout.addRow(self.translation.get("show_debug", "Show FLRig debug field"), self.debug_checkbox)
+        layout.addRow(self.translation.get("sync_bus", "Multi-op sync (LAN)"), self.sync_checkbox)
         layout.addRow(self.translation["language"], self.language_combo)
 
         btn_box = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
@@ -158,16 +176,22 @@ class ConfigDialog(QtWidgets.QDialog):
 
     def get_config(self):
         """
-        Return the config as a dict.
+        Return the config as a dict (with the plain password, save_config encrypts it).
+        Settings without a field in this dialog (e.g. qrz_url) are kept.
         """
-        return {
+        cfg = dict(self.config)
+        cfg.update({
             "wlgate_host": self.wlgate_host.text().strip(),
             "wlgate_port": self.wlgate_port.value(),
             "qrz_username": self.qrz_username.text().strip(),
-            "qrz_password": encrypt_password(self.qrz_password.text()),
+            "qrz_password": self.qrz_password.text(),
             "station_callsign": self.station_callsign.text().strip(),
+            "station_locator": self.station_locator.text().strip().upper(),
             "flrig_host": self.flrig_host.text().strip(),
             "flrig_port": self.flrig_port.value(),
+            "metrics_port": self.metrics_port.value(),
             "show_debug": self.debug_checkbox.isChecked(),
+            "sync_bus": self.sync_checkbox.isChecked(),
             "language": self.language_combo.currentData()
-        }
\ No newline at end of file
+        })
+        return cfg
\ No newline at end of file
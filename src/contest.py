@@ -0,0 +1,59 @@
+"""
+Contest rapid-entry helpers: sent serial number counter and ESM (Enter Sends Message) sequencing.
+"""
+
+import json
+import os
+from src.logger import log_error
+from src.utils import user_data_path
+
+CONTEST_STATE_FILE = user_data_path("contest_state.json")
+
+# Fields shown in contest mode, all other form rows are hidden
+CONTEST_FIELDS = ("CALL", "BAND", "FREQ", "MODE", "RST_SENT", "RST_RCVD", "STX", "SRX")
+
+class SerialCounter:
+    """
+    Next serial number to send (STX); kept in a small state file so it survives a restart.
+    """
+    def __init__(self, path=CONTEST_STATE_FILE):
+        self.path = path
+        self.next = 1
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.next = max(1, int(json.load(f).get("next_serial", 1)))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            log_error(f"Could not read contest state: {e}")
+
+    def text(self):
+        return f"{self.next:03d}"
+
+    def advance(self):
+        self.next += 1
+        self.save()
+
+    def reset(self, value=1):
+        self.next = value
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"next_serial": self.next}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log_error(f"Could not save contest state: {e}")
+
+def esm_step(call, received):
+    """
+    Next step of the Enter key sequence:
+    "call" (no callsign yet), "exchange" (received exchange missing) or "log".
+    """
+    if not call.strip():
+        return "call"
+    if not received.strip():
+        return "exchange"
+    return "log"
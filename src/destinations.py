@@ -0,0 +1,245 @@
+"""
+Additional QSO destinations (second WLGate, N1MM-style UDP broadcast, ADIF file).
+
+Each destination has its own queue and sender thread with retries and a health status,
+so a slow or unreachable target never delays the others or the GUI. The deliver stage of the
+QSO pipeline sends to the primary WLGate first; these destinations receive a copy afterwards.
+
+Configured in data/wlsender_config.json, e.g.:
+    "destinations": [
+        {"name": "backup", "type": "wlgate_udp", "host": "192.168.1.20", "port": 2237},
+        {"name": "n1mm", "type": "n1mm_udp", "host": "255.255.255.255", "port": 12060},
+        {"name": "file", "type": "adif_file", "path": "data/all_qsos.adi"}
+    ]
+"""
+
+import queue
+import re
+import socket
+import threading
+import time
+import uuid
+from xml.sax.saxutils import escape
+from src import metrics
+from src.flrig_worker import FLRigWorker
+from src.logger import log_error, log_info
+
+QUEUE_SIZE = 1000
+MAX_RETRIES = 5
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+# WLSender band name -> N1MM Logger+ band (lower band edge in MHz)
+N1MM_BANDS = {
+    "160M": "1.8", "80M": "3.5", "40M": "7", "30M": "10", "20M": "14", "17M": "18",
+    "15M": "21", "12M": "24", "10M": "28", "6M": "50", "2M": "144", "70CM": "420",
+}
+
+class Destination:
+    """
+    Base class; deliver() raises on failure so the worker can retry.
+    """
+    def __init__(self, settings):
+        self.name = settings.get("name") or settings.get("type", "destination")
+        self.settings = settings
+
+    def deliver(self, record, adif):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class WLGateUdpDestination(Destination):
+    """
+    Sends the ADIF record as one UDP datagram, like the primary WLGate send.
+    """
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.address = (settings.get("host", "127.0.0.1"), int(settings.get("port", 2237)))
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def deliver(self, record, adif):
+        self.sock.sendto(adif.encode("ascii", errors="replace"), self.address)
+
+    def close(self):
+        self.sock.close()
+
+class N1MMUdpDestination(WLGateUdpDestination):
+    """
+    Broadcasts an N1MM Logger+ style <contactinfo> XML packet.
+    """
+    def __init__(self, settings):
+        settings = dict({"host": "255.255.255.255", "port": 12060}, **settings)
+        super().__init__(settings)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def deliver(self, record, adif):
+        self.sock.sendto(n1mm_contact_xml(record).encode("utf-8"), self.address)
+
+class AdifFileDestination(Destination):
+    """
+    Appends every QSO as one ADIF line to a file.
+    """
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.path = settings["path"]
+
+    def deliver(self, record, adif):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(adif + "\n")
+
+DESTINATION_TYPES = {
+    "wlgate_udp": WLGateUdpDestination,
+    "n1mm_udp": N1MMUdpDestination,
+    "adif_file": AdifFileDestination,
+}
+
+def n1mm_contact_xml(record):
+    """
+    Build an N1MM Logger+ contactinfo packet (frequencies in 10 Hz units, band as N1MM names it).
+    """
+    try:
+        mhz = float(record.get("FREQ") or 0)
+    except ValueError:
+        mhz = 0.0
+    freq = f"{mhz * 100000:.0f}"
+    band_name = FLRigWorker.freq_to_band(mhz) or record.get("BAND", "").strip().upper()
+    band = N1MM_BANDS.get(band_name, "0")
+    date, time_on = record.get("QSO_DATE", ""), record.get("TIME_ON", "").ljust(6, "0")
+    timestamp = f"{date[0:4]}-{date[4:6]}-{date[6:8]} {time_on[0:2]}:{time_on[2:4]}:{time_on[4:6]}"
+    fields = [
+        ("app", "WLSender"), ("contestname", "DX"), ("timestamp", timestamp),
+        ("mycall", record.get("STATION_CALLSIGN", "")), ("band", band), ("rxfreq", freq), ("txfreq", freq),
+        ("operator", record.get("OPERATOR", "")), ("mode", record.get("MODE", "")), ("call", record.get("CALL", "")),
+        ("snt", record.get("RST_SENT", "")), ("rcv", record.get("RST_RCVD", "")),
+        ("gridsquare", record.get("GRIDSQUARE", "")), ("name", record.get("NAME", "")),
+        ("comment", record.get("COMMENT", "")), ("ID", uuid.uuid4().hex),
+    ]
+    body = "".join(f"<{tag}>{escape(value)}</{tag}>" for tag, value in fields)
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<contactinfo>{body}</contactinfo>'
+
+class DestinationWorker(threading.Thread):
+    """
+    Sender thread of one destination with its own bounded queue and retry policy.
+    """
+    def __init__(self, destination):
+        super().__init__(daemon=True, name=f"destination-{destination.name}")
+        self.destination = destination
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.stop_event = threading.Event()
+        self.status = "idle"  # idle, ok, retrying, failed
+        self.last_error = ""
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        key = re.sub(r"[^A-Za-z0-9_]", "_", destination.name).lower()
+        self.metric_prefix = f"destination_{key}"
+        # Gauges outlive a restarted worker, so their functions are always rebound
+        metrics.REGISTRY.gauge(f"{self.metric_prefix}_queue_depth",
+                               f"QSOs waiting for destination {destination.name}").function = self.queue.qsize
+        metrics.REGISTRY.gauge(f"{self.metric_prefix}_healthy",
+                               f"1 if destination {destination.name} is delivering, 0 if failing").function = \
+            lambda: 0 if self.status in ("retrying", "failed") else 1
+
+    def submit(self, record, adif):
+        try:
+            self.queue.put_nowait((record, adif))
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc(f"{self.metric_prefix}_dropped_total")
+            log_error(f"Destination {self.destination.name}: queue full, QSO {record.get('CALL', '')} dropped.", audit=True)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                item = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            self._deliver_with_retry(*item)
+        self.destination.close()
+
+    def _deliver_with_retry(self, record, adif):
+        delay = RETRY_BASE_SECONDS
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                with metrics.timer(f"{self.metric_prefix}_send_seconds"):
+                    self.destination.deliver(record, adif)
+                self.sent += 1
+                self.status = "ok"
+                metrics.inc(f"{self.metric_prefix}_sent_total")
+                return
+            except Exception as e:
+                self.last_error = str(e)
+                self.status = "retrying"
+                log_error(f"Destination {self.destination.name}: attempt {attempt + 1} failed: {e}")
+            # Wait for the next attempt, but stop waiting when shutting down
+            if attempt == MAX_RETRIES or self.stop_event.wait(delay):
+                break
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+        self.failed += 1
+        self.status = "failed"
+        metrics.inc(f"{self.metric_prefix}_failed_total")
+        log_error(f"Destination {self.destination.name}: QSO {record.get('CALL', '')} not delivered.", audit=True)
+
+    def health(self):
+        return {
+            "name": self.destination.name,
+            "status": self.status,
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "last_error": self.last_error,
+        }
+
+class DestinationManager:
+    """
+    Fans out every sent QSO to all configured destinations.
+    """
+    def __init__(self, settings_list):
+        self.workers = []
+        for settings in settings_list or []:
+            if not settings.get("enabled", True):
+                continue
+            cls = DESTINATION_TYPES.get(settings.get("type"))
+            if cls is None:
+                log_error(f"Unknown destination type: {settings.get('type')}")
+                continue
+            try:
+                self.workers.append(DestinationWorker(cls(settings)))
+            except Exception as e:
+                log_error(f"Destination {settings.get('name', settings.get('type'))} could not be created: {e}")
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        if self.workers:
+            log_info(f"QSO destinations: {', '.join(w.destination.name for w in self.workers)}")
+
+    def submit(self, record, adif):
+        """
+        Queue a QSO for all destinations; never blocks.
+        """
+        for worker in self.workers:
+            worker.submit(record, adif)
+
+    def stop(self, timeout=2.0):
+        """
+        Let the workers finish their queues within timeout seconds, then stop them.
+        """
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            try:
+                worker.queue.put_nowait(None)
+            except queue.Full:
+                pass
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            worker.stop_event.set()
+            if worker.is_alive():
+                log_error(f"Destination {worker.destination.name}: {worker.queue.qsize()} QSOs not delivered at exit.")
+
+    def health(self):
+        return [worker.health() for worker in self.workers]
@@ -0,0 +1,68 @@
+"""
+Dialog showing the runtime metrics (lookups, rig polling, sends, queues).
+"""
+
+from PyQt5 import QtWidgets, QtCore
+from src.metrics import REGISTRY
+
+class DiagnosticsDialog(QtWidgets.QDialog):
+    """
+    Non-modal dialog with a live table of all metrics, refreshed every second.
+    """
+    COLUMNS = ["metric", "value", "mean", "p50", "p95", "max", "last"]
+
+    def __init__(self, parent=None, translation=None, registry=REGISTRY):
+        """
+        Initialize the diagnostics dialog.
+        """
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.registry = registry
+        self.setWindowTitle(self.translation.get("diagnostics", "Diagnostics"))
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)  # Also on Esc/reject, the form opens a new one next time
+        self.resize(700, 420)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([self.translation.get(f"metrics_{c}", c) for c in self.COLUMNS])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reload all metric values into the table.
+        """
+        snapshot = self.registry.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, name in enumerate(sorted(snapshot)):
+            values = snapshot[name]
+            if values["type"] == "histogram":
+                # Latencies are shown in milliseconds
+                cells = [name, str(values["count"])] + [
+                    f"{values[key] * 1000:.1f} ms" for key in ("mean", "p50", "p95", "max", "last")]
+            else:
+                cells = [name, str(values["value"]), "", "", "", "", ""]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+                if column == 0:
+                    item.setToolTip(values["help"])
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        # Hidden by close, Esc/reject or a minimized main window: no refreshes while nobody sees them
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,243 @@
+"""
+DX cluster client: telnet spot stream, incremental line parser and frequency-sorted bandmap.
+"""
+
+import bisect
+import re
+import socket
+import threading
+import time
+from collections import namedtuple
+from PyQt5 import QtCore
+from src import metrics
+from src.dxcc import extract_core_callsign
+from src.flrig_worker import FLRigWorker
+from src.logger import log_error, log_info
+
+SPOT_MAX_AGE_SECONDS = 30 * 60
+NOTIFY_INTERVAL_SECONDS = 0.5
+
+Spot = namedtuple("Spot", "freq_khz call spotter comment utc received")
+
+# DX de SP5XYZ:     14025.0  DL1ABC       CW 599 tnx                   1234Z
+_SPOT_RE = re.compile(
+    r"^DX de\s+(?P<spotter>[A-Z0-9/#-]+):?\s+(?P<freq>\d+(?:\.\d+)?)\s+(?P<call>[A-Z0-9/]+)\s+"
+    r"(?P<comment>.*?)\s*(?P<utc>\d{4})Z", re.IGNORECASE)
+
+SPOT_MODES = ("CW", "SSB", "USB", "LSB", "FT8", "FT4", "RTTY", "PSK31", "PSK", "JT65", "FM", "AM")
+_MODE_RE = re.compile(r"\b(" + "|".join(SPOT_MODES) + r")\b", re.IGNORECASE)
+
+# CW segments (kHz) of the HF bands, used when a spot comment names no mode
+CW_SEGMENTS = ((1800, 1838), (3500, 3570), (7000, 7040), (10100, 10130), (14000, 14070),
+               (18068, 18095), (21000, 21070), (24890, 24915), (28000, 28070))
+
+def parse_spot_line(line, received=None):
+    """
+    Parse one cluster line into a Spot, or None if it is not a spot.
+    """
+    match = _SPOT_RE.match(line.strip())
+    if not match:
+        return None
+    try:
+        freq = float(match.group("freq"))
+    except ValueError:
+        return None
+    return Spot(freq, match.group("call").upper(), match.group("spotter").upper(),
+                match.group("comment").strip(), match.group("utc"), received or time.time())
+
+def spot_mode(spot):
+    """
+    Mode of a spot from its comment, otherwise from the band plan (CW segment or SSB).
+    """
+    match = _MODE_RE.search(spot.comment)
+    if match:
+        return match.group(1).upper()
+    for low, high in CW_SEGMENTS:
+        if low <= spot.freq_khz <= high:
+            return "CW"
+    return "SSB"
+
+def rig_mode(spot):
+    """
+    FLRig mode to set for a spot, or None for modes that depend on the rig (digital modes).
+    """
+    mode = spot_mode(spot)
+    if mode in ("CW", "USB", "LSB", "AM", "FM"):
+        return mode
+    if mode == "SSB":
+        return "USB" if spot.freq_khz >= 10000 else "LSB"
+    return None
+
+def spot_band(spot):
+    return FLRigWorker.freq_to_band(spot.freq_khz / 1000)
+
+class LineBuffer:
+    """
+    Incremental splitter of a byte stream into text lines; telnet commands are removed.
+    """
+    def __init__(self):
+        self.buffer = b""
+
+    @staticmethod
+    def strip_telnet(data):
+        # IAC (255) followed by a command byte and, for option negotiation, an option byte
+        return re.sub(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa]", b"", data, flags=re.DOTALL)
+
+    def feed(self, data):
+        """
+        Add received bytes and return the complete lines.
+        """
+        self.buffer += self.strip_telnet(data)
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+    def pending(self):
+        """
+        Text of the incomplete last line (e.g. a login prompt).
+        """
+        return self.buffer.decode("utf-8", errors="replace")
+
+class BandMap:
+    """
+    Spots sorted by frequency. A newer spot of the same call on the same band replaces the older one.
+    """
+    def __init__(self, max_age=SPOT_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self.keys = []  # Sorted (freq_khz, call)
+        self.spots = {}  # (freq_khz, call) -> Spot
+        self.by_call_band = {}  # (call, band) -> key
+        self.lock = threading.Lock()
+
+    def add(self, spot):
+        key = (spot.freq_khz, spot.call)
+        call_band = (spot.call, spot_band(spot))
+        with self.lock:
+            old_key = self.by_call_band.get(call_band)
+            if old_key is not None:
+                self._remove(old_key)
+            bisect.insort(self.keys, key)
+            self.spots[key] = spot
+            self.by_call_band[call_band] = key
+
+    def _remove(self, key):
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+        spot = self.spots.pop(key, None)
+        if spot:
+            self.by_call_band.pop((spot.call, spot_band(spot)), None)
+
+    def expire(self, now=None):
+        """
+        Remove spots older than max_age; returns the number removed.
+        """
+        limit = (now or time.time()) - self.max_age
+        with self.lock:
+            old = [key for key, spot in self.spots.items() if spot.received < limit]
+            for key in old:
+                self._remove(key)
+        return len(old)
+
+    def near(self, freq_khz, span_khz):
+        """
+        Spots within freq_khz +- span_khz, sorted by frequency.
+        """
+        with self.lock:
+            start = bisect.bisect_left(self.keys, (freq_khz - span_khz, ""))
+            end = bisect.bisect_right(self.keys, (freq_khz + span_khz, "\uffff"))
+            return [self.spots[key] for key in self.keys[start:end]]
+
+    def __len__(self):
+        return len(self.keys)
+
+class DXClusterClient(QtCore.QThread):
+    """
+    Telnet DX cluster client; reconnects automatically. Parsed spots go into the bandmap,
+    spots_changed is emitted at most every NOTIFY_INTERVAL_SECONDS.
+    """
+    spots_changed = QtCore.pyqtSignal()
+    status = QtCore.pyqtSignal(str)
+
+    def __init__(self, host, port, login, bandmap=None):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.login = login
+        self.bandmap = bandmap if bandmap is not None else BandMap()
+        self.running = True
+        self.sock = None
+
+    def run(self):
+        delay = 2
+        while self.running:
+            try:
+                self._session()
+                delay = 2
+            except OSError as e:
+                log_error(f"DX cluster {self.host}:{self.port}: {e}")
+                self.status.emit(str(e))
+            # Reconnect with increasing delay, checking for stop every 0.2 s
+            deadline = time.monotonic() + delay
+            while self.running and time.monotonic() < deadline:
+                time.sleep(0.2)
+            delay = min(delay * 2, 60)
+
+    def _session(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=5)
+        self.sock.settimeout(0.5)
+        log_info(f"DX cluster connected: {self.host}:{self.port}")
+        self.status.emit("connected")
+        parser = LineBuffer()
+        logged_in = False
+        changed = False
+        last_notify = last_expire = time.monotonic()
+        try:
+            while self.running:
+                try:
+                    data = self.sock.recv(4096)
+                    if not data:
+                        raise OSError("connection closed by cluster")
+                except socket.timeout:
+                    data = b""
+                received = time.time()
+                for line in parser.feed(data):
+                    spot = parse_spot_line(line, received)
+                    if spot:
+                        self.bandmap.add(spot)
+                        metrics.inc("dx_spots_total")
+                        changed = True
+                prompt = parser.pending().lower()
+                if not logged_in and ("login" in prompt or "call:" in prompt):
+                    self.sock.sendall(f"{self.login}\r\n".encode("ascii", errors="replace"))
+                    parser.buffer = b""
+                    logged_in = True
+                now = time.monotonic()
+                if now - last_expire >= 60:
+                    changed |= bool(self.bandmap.expire())
+                    last_expire = now
+                if changed and now - last_notify >= NOTIFY_INTERVAL_SECONDS:
+                    self.spots_changed.emit()
+                    changed = False
+                    last_notify = now
+        finally:
+            self.sock.close()
+            self.sock = None
+
+    def request_stop(self):
+        self.running = False
+
+    def stop(self):
+        self.request_stop()
+        self.wait(2000)
+
+def worked_status(spot, worked_index):
+    """
+    "new" (never worked), "new_band" (worked, but not on this band) or "worked".
+    """
+    if worked_index is None:
+        return ""
+    entries = worked_index.lookup(extract_core_callsign(spot.call))
+    if not entries:
+        return "new"
+    band = spot_band(spot)
+    return "worked" if any(worked_band == band for worked_band, _ in entries) else "new_band"
@@ -0,0 +1,231 @@
+"""
+Offline callsign parsing and DXCC resolution from a country file (cty.dat / cty.csv).
+"""
+
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+
+COUNTRY_FILES = [user_data_path("cty.csv"), user_data_path("cty.dat")]
+
+# Suffixes that do not change the DXCC entity
+PORTABLE_SUFFIXES = ("P", "M", "QRP", "T", "A", "B", "LH", "J", "R")
+# Suffixes without a DXCC entity (maritime / aeronautical mobile)
+NO_ENTITY_SUFFIXES = ("MM", "AM")
+
+DXCCInfo = namedtuple(
+    "DXCCInfo", "country dxcc cq_zone itu_zone continent lat lon prefix"
+)
+
+# Alias modifiers in country files: (CQ) [ITU] <lat/lon> {continent} ~tz~
+_MODIFIER_RE = re.compile(r"\((\d+)\)|\[(\d+)\]|<([^>]*)>|\{([A-Z]{2})\}|~([^~]*)~")
+_DIGIT_AREA_RE = re.compile(r"^([A-Z0-9]*?[A-Z])(\d+)([A-Z]*)$")
+
+def extract_core_callsign(call):
+    """
+    Extract the core callsign from a given callsign.
+    Removes all prefixes and suffixes like /P, /M, /AM, /MM /T.
+    Examples:
+        HB9HNT/P   -> HB9HNT
+        LA/DB123/P -> DB123
+        DL/W2AEE   -> W2AEE
+        DL/W2AEE/M -> W2AEE
+        HB9HNT     -> HB9HNT
+    """
+    core = call.strip().upper().split("/")
+    if len(core) > 1 and core[-1] in ("P", "M", "AM", "MM", "T"):
+        # If the last segment is a known suffix, take the one before
+        return core[-2]
+    return core[-1]
+
+def lookup_prefix(call):
+    """
+    Return the string to use for the prefix lookup of a (portable) callsign,
+    or None if the call has no DXCC entity (/MM, /AM).
+        DL1ABC     -> DL1ABC
+        LA/DB1ABC  -> LA
+        DB1ABC/P   -> DB1ABC
+        W1ABC/4    -> W4ABC
+        DL1ABC/MM  -> None
+    """
+    parts = [p for p in call.strip().upper().split("/") if p]
+    if not parts:
+        return ""
+    if parts[-1] in NO_ENTITY_SUFFIXES:
+        return None
+    while len(parts) > 1 and parts[-1] in PORTABLE_SUFFIXES:
+        parts.pop()
+    if len(parts) == 1:
+        return parts[0]
+    if len(parts) > 2:
+        # e.g. LA/DB1ABC/QRP: the remaining middle part is the home call
+        parts = [parts[0], parts[1]]
+    first, second = parts
+    if second.isdigit():
+        # W1ABC/4: replace the call area digit
+        match = _DIGIT_AREA_RE.match(first)
+        if match:
+            return f"{match.group(1)}{second}{match.group(3)}"
+        return first
+    if first.isdigit():
+        match = _DIGIT_AREA_RE.match(second)
+        if match:
+            return f"{match.group(1)}{first}{match.group(3)}"
+        return second
+    # The shorter part is the (foreign) prefix, e.g. LA/DB1ABC or DB1ABC/LA
+    return first if len(first) <= len(second) else second
+
+class PrefixTrie:
+    """
+    Character trie for longest-prefix matching.
+    """
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, prefix, value):
+        """
+        Insert a prefix with its value.
+        """
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = value  # None marks the end of a prefix
+
+    def longest_match(self, text):
+        """
+        Return the value of the longest prefix of text, or None.
+        """
+        node = self.root
+        best = node.get(None)
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            best = node.get(None, best)
+        return best
+
+class DXCCResolver:
+    """
+    Resolve callsigns to DXCC entity, zones and continent.
+    Exact calls (=CALL entries in the country file) take precedence over prefixes.
+    Results are memoized.
+    """
+    def __init__(self):
+        self.trie = PrefixTrie()
+        self.exact = {}
+        self.entity_count = 0
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    def _resolve(self, call):
+        call = call.strip().upper()
+        if not call:
+            return None
+        info = self.exact.get(call)
+        if info:
+            return info
+        prefix = lookup_prefix(call)
+        if not prefix:
+            return None
+        return self.exact.get(prefix) or self.trie.longest_match(prefix)
+
+    def add_alias(self, alias, entity):
+        """
+        Add a prefix or exact call alias (with optional modifiers) for an entity.
+        """
+        alias = alias.strip()
+        if not alias:
+            return
+        exact = alias.startswith("=")
+        match = re.match(r"=?([A-Z0-9/]+)", alias)
+        if not match:
+            return
+        info = entity
+        for cq, itu, latlon, cont, _tz in _MODIFIER_RE.findall(alias[match.end():]):
+            if cq:
+                info = info._replace(cq_zone=int(cq))
+            elif itu:
+                info = info._replace(itu_zone=int(itu))
+            elif latlon and "/" in latlon:
+                lat, lon = latlon.split("/", 1)
+                info = info._replace(lat=float(lat), lon=-float(lon))
+            elif cont:
+                info = info._replace(continent=cont)
+        if exact:
+            self.exact[match.group(1)] = info
+        else:
+            self.trie.insert(match.group(1), info)
+
+    def load_cty_dat(self, f):
+        """
+        Load a cty.dat style file (entity header line followed by alias lines ending with ';').
+        """
+        entity = None
+        aliases = ""
+        for line in f:
+            if not line.strip():
+                continue
+            if not line[0].isspace() and line.count(":") >= 8:
+                fields = [field.strip() for field in line.split(":")]
+                prefix = fields[7].lstrip("*")
+                # cty.dat has no ADIF entity numbers; longitude is positive to the west
+                entity = DXCCInfo(fields[0], "", int(fields[1]), int(fields[2]), fields[3],
+                                  float(fields[4]), -float(fields[5]), prefix)
+                self.entity_count += 1
+                aliases = ""
+                continue
+            aliases += line.strip()
+            if aliases.endswith(";") and entity:
+                for alias in aliases[:-1].split(","):
+                    self.add_alias(alias, entity)
+                aliases = ""
+
+    def load_cty_csv(self, f):
+        """
+        Load a cty.csv style file (one entity per line, includes ADIF entity numbers).
+        """
+        for line in f:
+            fields = line.strip().split(",", 9)
+            if len(fields) < 10:
+                continue
+            prefix, name, dxcc, cont, cq, itu, lat, lon, _tz, aliases = fields
+            entity = DXCCInfo(name, dxcc, int(cq), int(itu), cont,
+                              float(lat), -float(lon), prefix.lstrip("*"))
+            self.entity_count += 1
+            for alias in aliases.rstrip(";").split():
+                self.add_alias(alias, entity)
+
+    def load(self, path):
+        """
+        Load a country file; the format is chosen by file extension.
+        """
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            if path.lower().endswith(".csv"):
+                self.load_cty_csv(f)
+            else:
+                self.load_cty_dat(f)
+        self.resolve.cache_clear()
+
+def load_resolver(paths=None):
+    """
+    Load the first existing country file into a new resolver.
+    Returns None if no country file is available.
+    """
+    for path in paths or COUNTRY_FILES:
+        if not os.path.exists(path):
+            continue
+        resolver = DXCCResolver()
+        try:
+            resolver.load(path)
+        except Exception as e:
+            log_error(f"Could not load country file {path}: {e}")
+            continue
+        log_info(f"Country file {path} loaded: {resolver.entity_count} entities, "
+                 f"{len(resolver.exact)} exact calls.")
+        return resolver
+    log_info("No country file found, offline DXCC resolution disabled.")
+    return None
@@ -4,14 +4,35 @@ Worker for FLRig communication with error handling and logging.
 
 from PyQt5 import QtCore
 from src.logger import log_error, log_info
+from src import metrics
+from src.worker_lifecycle import TimeoutTransport
+import queue
 import threading
 
+# Band edges in MHz
+BAND_TABLE = {
+    (1.8, 2.0): "160M",
+    (3.5, 4.0): "80M",
+    (7.0, 7.3): "40M",
+    (10.1, 10.15): "30M",
+    (14.0, 14.35): "20M",
+    (18.068, 18.168): "17M",
+    (21.0, 21.45): "15M",
+    (24.89, 24.99): "12M",
+    (28.0, 29.7): "10M",
+    (50.0, 54.0): "6M",
+    (144.0, 148.0): "2M",
+    (430.0, 440.0): "70CM"
+}
+
 class FLRigWorker(QtCore.QThread):
     """
     Worker thread for polling FLRig data.
     Emits signals for new data or errors.
     """
     result = QtCore.pyqtSignal(str, str, str, str)  # freq, mode, band, debug_msg
+    POLL_SECONDS = 2
+    TIMEOUT_SECONDS = 3  # Per XML-RPC call, so a hanging FLRig cannot block the worker
 
     def __init__(self, host, port):
         super().__init__()
@@ -22,9 +43,33 @@ class FLRigWorker(QtCore.QThread):
         self.last_freq_b = None
         self.last_vfo = "A"
         self._poll_now_event = threading.Event()  # <-- NEU
+        self.commands = queue.Queue()  # (method, value) sent to FLRig before the next poll
+        self.poll_interval = self.POLL_SECONDS
     def poll_now(self):
         self._poll_now_event.set() 
         # Set the event to trigger immediate polling
+
+    def tune(self, freq_hz, mode=None):
+        """
+        Queue a frequency (and optionally mode) change; it is sent to FLRig from the worker thread.
+        """
+        self.commands.put(("rig.set_frequency", float(freq_hz)))
+        if mode:
+            self.commands.put(("rig.set_mode", mode))
+        self.poll_now()
+
+    def request_stop(self):
+        """
+        Stop after the current poll; wakes the worker if it is waiting for the next one.
+        """
+        self.running = False
+        self._poll_now_event.set()
+
+    def set_poll_interval(self, seconds):
+        """
+        Change the time between polls (e.g. slower while the window is minimized).
+        """
+        self.poll_interval = seconds
              
     def run(self):
         import time
@@ -32,11 +77,21 @@ class FLRigWorker(QtCore.QThread):
         while self.running:
             debug_msg = ""
             freq = mode = band = ""
+            poll_start = time.perf_counter()
             try:
                 url = f"http://{self.host}:{self.port}/RPC2"
-                flrig = xmlrpc.client.ServerProxy(url)
+                flrig = xmlrpc.client.ServerProxy(url, transport=TimeoutTransport(self.TIMEOUT_SECONDS))
+                while not self.commands.empty():
+                    method, value = self.commands.get_nowait()
+                    try:
+                        getattr(flrig, method)(value)
+                        log_info(f"FLRig: {method}({value})")
+                    except Exception as e:
+                        log_error(f"FLRig command {method}({value}) failed: {e}")
                 try:
                     vfo_status = flrig.rig.get_vfo()
+                except TimeoutError:
+                    raise  # FLRig hangs: skip the other calls of this poll
                 except Exception as e:
                     debug_msg += f"VFO-Error: {e} | "
                     vfo_status = 0.0
@@ -54,64 +109,56 @@ class FLRigWorker(QtCore.QThread):
                     freq_b = 0.0
                     mode_b = ""
 
-                try:
-                    vfo_status_f = float(vfo_status)
-                except Exception:
-                    vfo_status_f = 0.0
-
-                if abs(vfo_status_f - freq_a) < 10:
-                    freq_val = freq_a
-                    mode = mode_a
-                    self.last_vfo = "A"
-                elif abs(vfo_status_f - freq_b) < 10:
-                    freq_val = freq_b
-                    mode = mode_b
-                    self.last_vfo = "B"
-                else:
-                    if self.last_vfo == "B":
-                        freq_val = freq_b
-                        mode = mode_b
-                    else:
-                        freq_val = freq_a
-                        mode = mode_a
+                freq, mode, band, self.last_vfo = self.decode_poll(
+                    vfo_status, freq_a, mode_a, freq_b, mode_b, self.last_vfo)
                 self.last_freq_a = freq_a
                 self.last_freq_b = freq_b
-
-                freq = str(int(freq_val)) if freq_val else ""
-                # Korrektur: Band-Berechnung immer in MHz!
-                band = self.freq_to_band(freq_val / 1_000_000) if freq_val else ""
                 debug_msg += (
                     f"FLRig: VFO-Status={vfo_status} | "
                     f"A: {round(freq_a/1e6,3) if freq_a else '-'} MHz {mode_a} | "
                     f"B: {round(freq_b/1e6,3) if freq_b else '-'} MHz {mode_b} | "
                     f"Used: {self.last_vfo} {freq} Hz {mode} Band={band}"
                 )
+                metrics.observe("flrig_poll_seconds", time.perf_counter() - poll_start)
                 self.result.emit(freq, mode, band, debug_msg)
             except Exception as e:
+                metrics.inc("flrig_poll_errors_total")
                 debug_msg += f"FLRig-Error: {e}"
                 log_error(debug_msg)
                 self.result.emit("", "", "", debug_msg)
-           # Wait on Event odorer Timeout (2 seconds)
-            self._poll_now_event.wait(timeout=2)
+           # Wait on Event odorer Timeout (poll interval)
+            self._poll_now_event.wait(timeout=self.poll_interval)
             self._poll_now_event.clear()
 
+    @staticmethod
+    def decode_poll(vfo_status, freq_a, mode_a, freq_b, mode_b, last_vfo):
+        """
+        Decide which VFO is in use and return (freq_hz_str, mode, band, used_vfo).
+        The VFO whose frequency matches the reported VFO status wins,
+        otherwise the previously used VFO is kept.
+        """
+        try:
+            vfo_status_f = float(vfo_status)
+        except Exception:
+            vfo_status_f = 0.0
+
+        if abs(vfo_status_f - freq_a) < 10:
+            freq_val, mode, last_vfo = freq_a, mode_a, "A"
+        elif abs(vfo_status_f - freq_b) < 10:
+            freq_val, mode, last_vfo = freq_b, mode_b, "B"
+        elif last_vfo == "B":
+            freq_val, mode = freq_b, mode_b
+        else:
+            freq_val, mode = freq_a, mode_a
+
+        freq = str(int(freq_val)) if freq_val else ""
+        # Korrektur: Band-Berechnung immer in MHz!
+        band = FLRigWorker.freq_to_band(freq_val / 1_000_000) if freq_val else ""
+        return freq, mode, band, last_vfo
+
     @staticmethod
     def freq_to_band(freq):
-        bands = {
-            (1.8, 2.0): "160M",
-            (3.5, 4.0): "80M",
-            (7.0, 7.3): "40M",
-            (10.1, 10.15): "30M",
-            (14.0, 14.35): "20M",
-            (18.068, 18.168): "17M",
-            (21.0, 21.45): "15M",
-            (24.89, 24.99): "12M",
-            (28.0, 29.7): "10M",
-            (50.0, 54.0): "6M",
-            (144.0, 148.0): "2M",
-            (430.0, 440.0): "70CM"
-        }
-        for (low, high), name in bands.items():
+        for (low, high), name in BAND_TABLE.items():
             if low <= freq <= high:
                 return name
         return ""
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+Compressed, indexed QSO history archive in data/historie.
+
+QSOs are stored one ADIF record per line in gzip segments (segment_000001.adi.gz, ...).
+New sessions are appended to the newest segment as additional gzip members until it
+is full. index.json keeps per segment the date range, QSO count, size and a bloom
+filter of the core callsigns, so searches only decompress matching segments.
+"""
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+from src.adif import encode_record, iter_adif_records
+from src.dxcc import extract_core_callsign
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+
+HISTORY_DIR = user_data_path("historie")
+INDEX_FILE = "index.json"
+SEGMENT_MAX_RECORDS = 5000
+SEGMENT_MAX_BYTES = 1024 * 1024
+DEFAULT_MAX_MB = 200
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+    """
+    SIZE_BITS = 65536
+    HASHES = 6
+
+    def __init__(self, data=None):
+        self.bits = bytearray(data) if data else bytearray(self.SIZE_BITS // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=4 * self.HASHES).digest()
+        for i in range(self.HASHES):
+            yield int.from_bytes(digest[4 * i:4 * i + 4], "little") % self.SIZE_BITS
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def to_text(self):
+        return base64.b64encode(bytes(self.bits)).decode("ascii")
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(base64.b64decode(text))
+
+def core_key(call):
+    """
+    Normalized callsign key used for the bloom filters.
+    """
+    return extract_core_callsign(call or "")
+
+def encode_entry(record):
+    """
+    Encode a record for the archive: returns (adif_line, core_call, qso_date).
+    """
+    # Line breaks inside values would break the one-record-per-line layout
+    record = {k: v.replace("\r", " ").replace("\n", " ") for k, v in record.items()}
+    return encode_record(record, fields=tuple(record)), core_key(record.get("CALL")), record.get("QSO_DATE", "")
+
+class HistoryArchive:
+    """
+    Append-only archive of compressed ADIF segments with a small index.
+    """
+    def __init__(self, directory=HISTORY_DIR, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        os.makedirs(directory, exist_ok=True)
+        self.segments = self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            if any(f.startswith("segment_") for f in os.listdir(self.directory)):
+                log_info("History index missing, rebuilding from segments.")
+                return self.rebuild_index()
+            return []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("segments", [])
+        except Exception as e:
+            log_error(f"Could not read history index, rebuilding: {e}")
+            return self.rebuild_index()
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "segments": self.segments}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, segment["file"])
+
+    def _new_segment(self):
+        number = max((int(s["file"][8:14]) for s in self.segments), default=0) + 1
+        segment = {"file": f"segment_{number:06d}.adi.gz", "first_date": "", "last_date": "",
+                   "count": 0, "size": 0, "bloom": BloomFilter().to_text()}
+        self.segments.append(segment)
+        return segment
+
+    def append_records(self, records):
+        """
+        Append QSO records (dicts of ADIF fields) to the archive; returns the number written.
+        """
+        return self.append_entries(encode_entry(record) for record in records)
+
+    def append_entries(self, entries):
+        """
+        Append pre-encoded (line, core_call, date) entries, see encode_entry().
+        Returns the number written.
+        """
+        written = 0
+        batch = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= 1000:
+                written += self._append_batch(batch)
+                batch = []
+        if batch:
+            written += self._append_batch(batch)
+        if written:
+            self._save_index()
+        return written
+
+    def _append_batch(self, entries):
+        written = 0
+        while entries:
+            segment = self.segments[-1] if self.segments else None
+            if (segment is None or segment["count"] >= SEGMENT_MAX_RECORDS
+                    or segment["size"] >= SEGMENT_MAX_BYTES):
+                segment = self._new_segment()
+            take = entries[:SEGMENT_MAX_RECORDS - segment["count"]]
+            entries = entries[len(take):]
+            bloom = BloomFilter.from_text(segment["bloom"])
+            for _, call, date in take:
+                bloom.add(call)
+                if date:
+                    if not segment["first_date"] or date < segment["first_date"]:
+                        segment["first_date"] = date
+                    if date > segment["last_date"]:
+                        segment["last_date"] = date
+            # Each append is a separate gzip member; readers see one continuous stream
+            with gzip.open(self._segment_path(segment), "at", encoding="utf-8") as f:
+                f.write("\n".join(entry[0] for entry in take) + "\n")
+            segment["count"] += len(take)
+            segment["size"] = os.path.getsize(self._segment_path(segment))
+            segment["bloom"] = bloom.to_text()
+            written += len(take)
+        return written
+
+    def append_file(self, path):
+        """
+        Append all QSOs of an ADIF file; returns the number of archived QSOs.
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return self.append_records(iter_adif_records(f))
+
+    def candidate_segments(self, date_from=None, date_to=None, callsign=None):
+        """
+        Return the segments that may contain matching QSOs (by date range and bloom filter).
+        Dates are ADIF dates (YYYYMMDD).
+        """
+        key = core_key(callsign) if callsign else None
+        result = []
+        for segment in self.segments:
+            if date_from and segment["last_date"] and segment["last_date"] < date_from:
+                continue
+            if date_to and segment["first_date"] and segment["first_date"] > date_to:
+                continue
+            if key and key not in BloomFilter.from_text(segment["bloom"]):
+                continue
+            result.append(segment)
+        return result
+
+    def iter_records(self, date_from=None, date_to=None, callsign=None):
+        """
+        Yield archived QSO records, oldest first, filtered by date range and core callsign.
+        Only segments that may contain matches are decompressed.
+        """
+        key = core_key(callsign) if callsign else None
+        for segment in self.candidate_segments(date_from, date_to, callsign):
+            try:
+                with gzip.open(self._segment_path(segment), "rt", encoding="utf-8") as f:
+                    for line in f:
+                        # Records are stored one per line; skip lines that cannot match before parsing
+                        if key and key not in line.upper():
+                            continue
+                        record = next(iter_adif_records(io.StringIO(line)), None)
+                        if record is None:
+                            continue
+                        date = record.get("QSO_DATE", "")
+                        if date_from and date and date < date_from:
+                            continue
+                        if date_to and date and date > date_to:
+                            continue
+                        if key and core_key(record.get("CALL")) != key:
+                            continue
+                        yield record
+            except (OSError, EOFError) as e:
+                log_error(f"Could not read history segment {segment['file']}: {e}")
+
+    def search_callsign(self, callsign):
+        """
+        Return all archived QSOs with the given (core) callsign.
+        """
+        return list(self.iter_records(callsign=callsign))
+
+    def total_size(self):
+        return sum(segment["size"] for segment in self.segments)
+
+    def total_count(self):
+        return sum(segment["count"] for segment in self.segments)
+
+    def enforce_retention(self):
+        """
+        Delete the oldest segments while the archive is larger than max_bytes.
+        Returns (deleted_segments, deleted_qsos).
+        """
+        deleted = qsos = 0
+        # The newest segment is always kept
+        while len(self.segments) > 1 and self.total_size() > self.max_bytes:
+            segment = self.segments.pop(0)
+            try:
+                os.remove(self._segment_path(segment))
+            except OSError as e:
+                log_error(f"Could not remove history segment {segment['file']}: {e}")
+            deleted += 1
+            qsos += segment["count"]
+        if deleted:
+            self._save_index()
+        return deleted, qsos
+
+    def migrate_loose_files(self):
+        """
+        Move old per-session history files (*.adi) into the archive, oldest first.
+        """
+        files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".adi")]
+        files.sort(key=os.path.getmtime)
+        for path in files:
+            try:
+                count = self.append_file(path)
+                os.remove(path)
+                log_info(f"History file {os.path.basename(path)} moved into archive ({count} QSOs).")
+            except Exception as e:
+                log_error(f"Could not migrate history file {path}: {e}")
+
+    def rebuild_index(self):
+        """
+        Rebuild the index by reading all segment files.
+        """
+        self.segments = []
+        names = sorted(f for f in os.listdir(self.directory) if f.startswith("segment_") and f.endswith(".adi.gz"))
+        for name in names:
+            segment = {"file": name, "first_date": "", "last_date": "", "count": 0, "size": 0}
+            bloom = BloomFilter()
+            path = os.path.join(self.directory, name)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for record in iter_adif_records(f):
+                        bloom.add(core_key(record.get("CALL")))
+                        date = record.get("QSO_DATE", "")
+                        if date:
+                            segment["first_date"] = min(segment["first_date"] or date, date)
+                            segment["last_date"] = max(segment["last_date"], date)
+                        segment["count"] += 1
+            except (OSError, EOFError) as e:
+                log_error(f"Could not read history segment {name}: {e}")
+            segment["size"] = os.path.getsize(path)
+            segment["bloom"] = bloom.to_text()
+            self.segments.append(segment)
+        self._save_index()
+        return self.segments
+
+def save_session_history(sent_qsos_file, max_mb=DEFAULT_MAX_MB, history_dir=HISTORY_DIR):
+    """
+    Append the session's sent QSOs to the history archive and apply size-based retention.
+    Returns (archived_qsos, deleted_segments, deleted_qsos).
+    """
+    archive = HistoryArchive(history_dir, max_mb)
+    archive.migrate_loose_files()
+    archived = 0
+    try:
+        archived = archive.append_file(sent_qsos_file)
+    except Exception as e:
+        log_error(f"Could not write session history: {e}")
+    deleted_segments, deleted_qsos = archive.enforce_retention()
+    return archived, deleted_segments, deleted_qsos
@@ -0,0 +1,162 @@
+"""
+Filtered, streaming export of the QSO history (archive and current session) to ADIF or CSV.
+"""
+
+import csv
+import fnmatch
+import json
+import os
+from PyQt5 import QtCore
+from src.adif import ADIF_FIELDS, encode_record, iter_adif_records
+from src.callsign_tag_editor import CALLSIGN_TAGS_FILE
+from src.history import HISTORY_DIR, HistoryArchive
+from src.logger import log_error, log_info
+
+PROGRESS_INTERVAL = 1000
+ADIF_HEADER = "WLSender history export\n<ADIF_VER:5>3.1.0<PROGRAMID:8>WLSender<EOH>\n"
+
+class HistoryFilter:
+    """
+    Filter for history records; empty criteria match everything.
+    Dates are ADIF dates (YYYYMMDD), call_pattern is a wildcard pattern like "DL*" or "*/P".
+    """
+    def __init__(self, date_from="", date_to="", bands=(), modes=(), call_pattern="", tag="",
+                 tags_file=CALLSIGN_TAGS_FILE):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.bands = {b.strip().lower() for b in bands if b.strip()}
+        self.modes = {m.strip().upper() for m in modes if m.strip()}
+        self.call_pattern = call_pattern.strip().upper()
+        self.tagged_calls = _calls_with_tag(tag, tags_file) if tag.strip() else None
+
+    @property
+    def exact_call(self):
+        """
+        The callsign if the pattern has no wildcards (lets the archive skip segments).
+        """
+        if self.call_pattern and not any(c in self.call_pattern for c in "*?["):
+            return self.call_pattern
+        return None
+
+    def matches(self, record):
+        date = record.get("QSO_DATE", "")
+        if self.date_from and date < self.date_from:
+            return False
+        if self.date_to and date > self.date_to:
+            return False
+        if self.bands and record.get("BAND", "").lower() not in self.bands:
+            return False
+        if self.modes and record.get("MODE", "").upper() not in self.modes:
+            return False
+        call = record.get("CALL", "").upper()
+        if self.call_pattern and not fnmatch.fnmatchcase(call, self.call_pattern):
+            return False
+        if self.tagged_calls is not None and call not in self.tagged_calls:
+            return False
+        return True
+
+def _calls_with_tag(tag, tags_file):
+    """
+    Return the set of callsigns that carry the given tag (case-insensitive).
+    """
+    if not os.path.exists(tags_file):
+        return set()
+    with open(tags_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    tag = tag.strip().lower()
+    return {call.upper() for call, tags in data.items() if any(t.lower() == tag for t in tags)}
+
+def iter_history(history_filter, sent_qsos_file=None, history_dir=HISTORY_DIR):
+    """
+    Yield the candidate records for a filter: archived QSOs first (oldest first), then the
+    current session. Archive segments that cannot match are skipped via the index; the
+    remaining records still have to be checked with history_filter.matches().
+    """
+    archive = HistoryArchive(history_dir)
+    yield from archive.iter_records(history_filter.date_from or None, history_filter.date_to or None,
+                                    history_filter.exact_call)
+    if sent_qsos_file and os.path.exists(sent_qsos_file):
+        with open(sent_qsos_file, "r", encoding="utf-8", errors="replace") as f:
+            yield from iter_adif_records(f)
+
+def estimate_total(history_filter, sent_qsos_file=None, history_dir=HISTORY_DIR):
+    """
+    Upper bound of the records to scan, from the archive index and the session file.
+    """
+    archive = HistoryArchive(history_dir)
+    total = sum(segment["count"] for segment in archive.candidate_segments(
+        history_filter.date_from or None, history_filter.date_to or None, history_filter.exact_call))
+    if sent_qsos_file and os.path.exists(sent_qsos_file):
+        with open(sent_qsos_file, "r", encoding="utf-8", errors="replace") as f:
+            total += sum(line.upper().count("<EOR>") for line in f)
+    return total
+
+def export_history(path, records, history_filter=None, fmt="adif", progress=None, is_cancelled=None):
+    """
+    Stream the records matching history_filter into an ADIF or CSV file.
+    The file is written under a temporary name and only renamed when the export completes,
+    so a cancelled export leaves no partial file. progress(scanned) is called every
+    PROGRESS_INTERVAL scanned records. Returns the number of exported records, or -1 if cancelled.
+    """
+    part_path = path + ".part"
+    scanned = exported = 0
+    cancelled = False
+    try:
+        with open(part_path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=ADIF_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                write = writer.writerow
+            else:
+                f.write(ADIF_HEADER)
+                write = lambda record: f.write(encode_record(record) + "\n")
+            for record in records:
+                scanned += 1
+                if history_filter is None or history_filter.matches(record):
+                    write(record)
+                    exported += 1
+                if scanned % PROGRESS_INTERVAL == 0:
+                    if progress:
+                        progress(scanned)
+                    if is_cancelled and is_cancelled():
+                        cancelled = True
+                        break
+        if cancelled:
+            os.remove(part_path)
+            log_info(f"History export to {path} cancelled after {scanned} records.")
+            return -1
+        os.replace(part_path, path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    log_info(f"History export to {path}: {exported} of {scanned} records ({fmt}).")
+    return exported
+
+class HistoryExportWorker(QtCore.QThread):
+    """
+    Worker thread for exporting the history.
+    """
+    progress = QtCore.pyqtSignal(int, int)  # scanned records so far, estimated total
+    finished_export = QtCore.pyqtSignal(int, str)  # exported records (-1 if cancelled), error message
+
+    def __init__(self, path, history_filter, fmt="adif", sent_qsos_file=None, history_dir=HISTORY_DIR):
+        super().__init__()
+        self.path = path
+        self.history_filter = history_filter
+        self.fmt = fmt
+        self.sent_qsos_file = sent_qsos_file
+        self.history_dir = history_dir
+        self.cancelled = False
+
+    def run(self):
+        try:
+            total = estimate_total(self.history_filter, self.sent_qsos_file, self.history_dir)
+            records = iter_history(self.history_filter, self.sent_qsos_file, self.history_dir)
+            count = export_history(self.path, records, self.history_filter, self.fmt,
+                                   progress=lambda done: self.progress.emit(done, total),
+                                   is_cancelled=lambda: self.cancelled)
+            self.finished_export.emit(count, "")
+        except Exception as e:
+            log_error(f"History export error: {e}")
+            self.finished_export.emit(0, str(e))
@@ -0,0 +1,73 @@
+"""
+Dialog for choosing the filters of a history export.
+"""
+
+from PyQt5 import QtWidgets, QtCore
+from src.history_export import HistoryFilter
+
+class HistoryExportDialog(QtWidgets.QDialog):
+    """
+    Dialog with date range, band, mode, callsign pattern, tag and format of a history export.
+    """
+    def __init__(self, parent=None, translation=None):
+        """
+        Initialize the history export dialog.
+        """
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.setWindowTitle(self.translation.get("export_history", "Export History..."))
+        layout = QtWidgets.QFormLayout(self)
+
+        today = QtCore.QDate.currentDate()
+        self.use_dates = QtWidgets.QCheckBox(self.translation.get("filter_by_date", "Filter by date"))
+        self.date_from = QtWidgets.QDateEdit(today.addYears(-1))
+        self.date_to = QtWidgets.QDateEdit(today)
+        for edit in (self.date_from, self.date_to):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+            edit.setEnabled(False)
+            self.use_dates.toggled.connect(edit.setEnabled)
+        self.bands = QtWidgets.QLineEdit()
+        self.bands.setPlaceholderText("20m, 40m")
+        self.modes = QtWidgets.QLineEdit()
+        self.modes.setPlaceholderText("CW, SSB, FT8")
+        self.call_pattern = QtWidgets.QLineEdit()
+        self.call_pattern.setPlaceholderText("DL*, */P")
+        self.tag = QtWidgets.QLineEdit()
+        self.format = QtWidgets.QComboBox()
+        self.format.addItem("ADIF (*.adi)", "adif")
+        self.format.addItem("CSV (*.csv)", "csv")
+
+        layout.addRow(self.use_dates)
+        layout.addRow(self.translation.get("date_from", "From"), self.date_from)
+        layout.addRow(self.translation.get("date_to", "To"), self.date_to)
+        layout.addRow(self.translation.get("band", "Band"), self.bands)
+        layout.addRow(self.translation.get("mode", "Mode"), self.modes)
+        layout.addRow(self.translation.get("callsign_pattern", "Callsign pattern"), self.call_pattern)
+        layout.addRow(self.translation.get("tag", "Tag"), self.tag)
+        layout.addRow(self.translation.get("format", "Format"), self.format)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_filter(self):
+        """
+        Return the HistoryFilter for the entered criteria.
+        """
+        date_from = date_to = ""
+        if self.use_dates.isChecked():
+            date_from = self.date_from.date().toString("yyyyMMdd")
+            date_to = self.date_to.date().toString("yyyyMMdd")
+        return HistoryFilter(
+            date_from=date_from,
+            date_to=date_to,
+            bands=self.bands.text().replace(";", ",").split(","),
+            modes=self.modes.text().replace(";", ",").split(","),
+            call_pattern=self.call_pattern.text(),
+            tag=self.tag.text(),
+        )
+
+    def get_format(self):
+        return self.format.currentData()
@@ -0,0 +1,153 @@
+"""
+Live QSO statistics: rates over sliding windows, per band/mode counts and unique calls and DXCC
+entities for the session and all-time. Every sent QSO updates the counters in O(1), the log
+files are never rescanned; the all-time numbers start from a baseline built once in the background.
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from src.dxcc import extract_core_callsign
+
+RATE_WINDOWS_MINUTES = (10, 60)
+
+class RateWindow:
+    """
+    Timestamps of the QSOs within the last window seconds; old ones are dropped as time moves on.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.times = deque()
+
+    def add(self, timestamp):
+        self.times.append(timestamp)
+
+    def count(self, now=None):
+        cutoff = (time.time() if now is None else now) - self.seconds
+        while self.times and self.times[0] <= cutoff:
+            self.times.popleft()
+        return len(self.times)
+
+    def per_hour(self, now=None):
+        return self.count(now) * 3600 / self.seconds
+
+def qso_timestamp(record):
+    """
+    Unix time of a record's QSO_DATE/TIME_ON, or None if they are missing or invalid.
+    """
+    try:
+        value = record.get("QSO_DATE", "") + record.get("TIME_ON", "").ljust(6, "0")[:6]
+        return datetime.strptime(value, "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+def dxcc_key(record):
+    """
+    Entity of a record: the ADIF DXCC number, or the country name if the number is unknown.
+    """
+    return (record.get("DXCC") or record.get("COUNTRY") or "").strip().upper()
+
+def entity_key(call, resolver, fallback=""):
+    """
+    Entity of a callsign as the resolver names it (DXCC number, else country), so session and
+    all-time entities are counted under the same key. fallback is used if the call cannot be resolved.
+    """
+    info = resolver.resolve(call) if resolver is not None and call else None
+    if info:
+        return (info.dxcc or info.country).upper()
+    return fallback
+
+class LiveStats:
+    """
+    Incrementally maintained statistics. add() is called for every sent QSO (GUI thread);
+    set_baseline() may be called from a loader thread. get_resolver returns the DXCC resolver,
+    or None while it is not loaded yet.
+    """
+    def __init__(self, get_resolver=lambda: None):
+        self.get_resolver = get_resolver
+        self.lock = threading.Lock()
+        self.rates = {minutes: RateWindow(minutes * 60) for minutes in RATE_WINDOWS_MINUTES}
+        self.qsos = 0
+        self.bands = Counter()
+        self.modes = Counter()
+        self.calls = set()
+        self.record_entities = {}  # Session call -> entity from its record, for unresolvable calls
+        self.entities = set()
+        self.baseline_qsos = 0  # Archived QSOs, known once the baseline is loaded
+        self.alltime_calls = set()
+        self.alltime_entities = set()
+        self.baseline_loaded = False
+
+    def add(self, record, timestamp=None):
+        """
+        Count one QSO; timestamp defaults to now (a QSO that is being sent).
+        """
+        call = extract_core_callsign(record.get("CALL", ""))
+        entity = entity_key(call, self.get_resolver(), dxcc_key(record))
+        with self.lock:
+            self.qsos += 1
+            self.bands[record.get("BAND", "").lower() or "?"] += 1
+            self.modes[record.get("MODE", "").upper() or "?"] += 1
+            if call:
+                self.calls.add(call)
+                self.record_entities.setdefault(call, dxcc_key(record))
+                self.alltime_calls.add(call)
+            if entity:
+                self.entities.add(entity)
+                self.alltime_entities.add(entity)
+            timestamp = time.time() if timestamp is None else timestamp
+            for window in self.rates.values():
+                window.add(timestamp)
+
+    def add_session(self, records):
+        """
+        Count the QSOs already in the session file at start, with their own QSO times for the rates.
+        """
+        for record in records:
+            self.add(record, qso_timestamp(record) or 0)
+
+    def set_baseline(self, archived_qsos, calls, entities, resolver=None):
+        """
+        Set the all-time numbers of the history archive (without the current session).
+        The session entities are keyed again with the resolver, which may not have been
+        loaded when the first QSOs were counted.
+        """
+        with self.lock:
+            self.baseline_qsos = archived_qsos
+            self.alltime_calls = set(calls) | self.calls
+            if resolver is not None:
+                self.entities = {entity_key(call, resolver, fallback)
+                                 for call, fallback in self.record_entities.items()}
+                self.entities.discard("")
+            self.alltime_entities = set(entities) | self.entities
+            self.baseline_loaded = True
+
+    def snapshot(self, now=None):
+        """
+        Return a dict with the current values for display.
+        """
+        with self.lock:
+            return {
+                "rates": {minutes: window.per_hour(now) for minutes, window in self.rates.items()},
+                "qsos": self.qsos,
+                "calls": len(self.calls),
+                "entities": len(self.entities),
+                "bands": self.bands.most_common(),
+                "modes": self.modes.most_common(),
+                "alltime_qsos": self.baseline_qsos + self.qsos,
+                "alltime_calls": len(self.alltime_calls),
+                "alltime_entities": len(self.alltime_entities),
+                "baseline_loaded": self.baseline_loaded,
+            }
+
+def load_baseline(stats, archived_qsos, worked_index, resolver):
+    """
+    Set the all-time baseline from the worked-before index (unique calls) and the DXCC resolver
+    (their entities). Runs in a background thread, once both are loaded.
+    """
+    with worked_index.lock:
+        calls = list(worked_index.worked)
+    entities = {entity_key(call, resolver) for call in calls} if resolver is not None else set()
+    entities.discard("")
+    stats.set_baseline(archived_qsos, calls, entities, resolver)
@@ -0,0 +1,95 @@
+"""
+Non-modal dashboard with the live QSO statistics (rates, bands, modes, unique calls and DXCC).
+"""
+
+from PyQt5 import QtWidgets, QtCore
+
+class LiveStatsDialog(QtWidgets.QDialog):
+    """
+    Shows a LiveStats snapshot; refreshed after every QSO and once per second for the rates.
+    """
+    def __init__(self, parent, translation, stats):
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.stats = stats
+        self.setWindowTitle(self.translation.get("live_stats", "Statistics"))
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)  # Deleted on Esc too, open_live_stats creates a new one
+        self.resize(460, 420)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        grid = QtWidgets.QGridLayout()
+        self.value_labels = {}
+        headers = ["", self.translation.get("stats_session", "Session"), self.translation.get("stats_alltime", "All-time")]
+        for column, text in enumerate(headers):
+            grid.addWidget(QtWidgets.QLabel(f"<b>{text}</b>"), 0, column)
+        rows = [("qsos", "stats_qsos", "QSOs"), ("calls", "stats_calls", "Unique calls"),
+                ("entities", "stats_entities", "DXCC entities")]
+        for row, (key, label_key, fallback) in enumerate(rows, start=1):
+            grid.addWidget(QtWidgets.QLabel(self.translation.get(label_key, fallback)), row, 0)
+            for column, prefix in ((1, ""), (2, "alltime_")):
+                label = QtWidgets.QLabel()
+                label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                grid.addWidget(label, row, column)
+                self.value_labels[prefix + key] = label
+        layout.addLayout(grid)
+
+        self.rate_label = QtWidgets.QLabel()
+        font = self.rate_label.font()
+        font.setPointSize(font.pointSize() + 4)
+        font.setBold(True)
+        self.rate_label.setFont(font)
+        layout.addWidget(self.rate_label)
+
+        tables = QtWidgets.QHBoxLayout()
+        self.band_table = self._count_table(self.translation.get("band", "Band"))
+        self.mode_table = self._count_table(self.translation.get("mode", "Mode"))
+        tables.addWidget(self.band_table)
+        tables.addWidget(self.mode_table)
+        layout.addLayout(tables)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def _count_table(self, title):
+        table = QtWidgets.QTableWidget(0, 2)
+        table.setHorizontalHeaderLabels([title, self.translation.get("stats_qsos", "QSOs")])
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def _fill_table(self, table, counts):
+        table.setRowCount(len(counts))
+        for row, cells in enumerate(counts):
+            for column, text in enumerate(cells):
+                item = table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    table.setItem(row, column, item)
+                item.setText(str(text))
+
+    def refresh(self):
+        """
+        Show the current statistics.
+        """
+        snapshot = self.stats.snapshot()
+        for key, label in self.value_labels.items():
+            value = snapshot[key]
+            loading = key.startswith("alltime_") and not snapshot["baseline_loaded"]
+            label.setText(f"{value}…" if loading else str(value))
+        self.rate_label.setText(" | ".join(
+            self.translation.get("stats_rate", "{minutes} min: {rate} QSOs/h").format(minutes=minutes, rate=round(rate))
+            for minutes, rate in snapshot["rates"].items()))
+        self._fill_table(self.band_table, snapshot["bands"])
+        self._fill_table(self.mode_table, snapshot["modes"])
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        # Rates are only recomputed while the dashboard is visible
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,142 @@
+"""
+Maidenhead locator engine: 4/6/8 character grid squares to coordinates, great-circle distance
+and bearing from the own station, and distance statistics over many QSOs.
+
+Single lookups are memoized. The batch statistics first reduce the QSOs to distinct locators
+(a log has far fewer grid squares than QSOs), then compute all distances in one go, vectorized
+with NumPy if it is installed and in plain Python otherwise.
+"""
+
+import math
+import re
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+from PyQt5 import QtCore
+from src.history import HISTORY_DIR
+from src.history_export import HistoryFilter, iter_history
+from src.logger import log_error, log_info
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only speeds up distance_stats()
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+
+_LOCATOR_RE = re.compile(r"^[A-R]{2}[0-9]{2}(?:[A-X]{2}(?:[0-9]{2})?)?$")
+
+DistanceStats = namedtuple("DistanceStats", "qsos total_km mean_km odx_km odx_locator")
+
+def normalize_locator(locator):
+    """
+    Return the upper-case locator if it is a valid 4, 6 or 8 character grid square, else "".
+    """
+    locator = (locator or "").strip().upper()
+    return locator if _LOCATOR_RE.match(locator) else ""
+
+@lru_cache(maxsize=16384)
+def locator_to_latlon(locator):
+    """
+    Return (lat, lon) in degrees of the centre of the grid square, or None if the locator is invalid.
+    """
+    locator = normalize_locator(locator)
+    if not locator:
+        return None
+    lon = (ord(locator[0]) - 65) * 20 - 180 + int(locator[2]) * 2
+    lat = (ord(locator[1]) - 65) * 10 - 90 + int(locator[3])
+    lon_size, lat_size = 2.0, 1.0
+    if len(locator) >= 6:
+        lon_size, lat_size = lon_size / 24, lat_size / 24
+        lon += (ord(locator[4]) - 65) * lon_size
+        lat += (ord(locator[5]) - 65) * lat_size
+    if len(locator) == 8:
+        lon_size, lat_size = lon_size / 10, lat_size / 10
+        lon += int(locator[6]) * lon_size
+        lat += int(locator[7]) * lat_size
+    return lat + lat_size / 2, lon + lon_size / 2
+
+def great_circle(lat1, lon1, lat2, lon2):
+    """
+    Return (distance in km, initial bearing in degrees) from point 1 to point 2.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+    y = math.sin(dlambda) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlambda)
+    return distance, (math.degrees(math.atan2(y, x)) + 360) % 360
+
+@lru_cache(maxsize=4096)
+def distance_bearing(from_locator, to_locator):
+    """
+    Return (distance in km, bearing in degrees) between two locators, or None if one is invalid.
+    """
+    start, end = locator_to_latlon(from_locator), locator_to_latlon(to_locator)
+    if start is None or end is None:
+        return None
+    return great_circle(*start, *end)
+
+def _distances_numpy(start, points):
+    lat1, lon1 = np.radians(start[0]), np.radians(start[1])
+    coords = np.radians(np.array(points, dtype=float))
+    lat2, lon2 = coords[:, 0], coords[:, 1]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))).tolist()
+
+def _distances_python(start, points):
+    return [great_circle(start[0], start[1], lat, lon)[0] for lat, lon in points]
+
+def distance_stats(station_locator, locators):
+    """
+    Distance statistics from the own locator over an iterable of QSO locators (invalid ones are skipped).
+    Returns DistanceStats, or None if the own locator is invalid.
+    """
+    start = locator_to_latlon(station_locator)
+    if start is None:
+        return None
+    counts = Counter()
+    for locator, count in Counter(locators).items():  # Validate each distinct spelling only once
+        counts[normalize_locator(locator)] += count
+    counts.pop("", None)
+    if not counts:
+        return DistanceStats(0, 0.0, 0.0, 0.0, "")
+    grids = list(counts)
+    points = [locator_to_latlon(grid) for grid in grids]
+    distances = (_distances_numpy if np is not None else _distances_python)(start, points)
+    qsos = sum(counts.values())
+    total = sum(distance * counts[grid] for grid, distance in zip(grids, distances))
+    odx_km, odx_locator = max(zip(distances, grids))
+    return DistanceStats(qsos, total, total / qsos, odx_km, odx_locator)
+
+class DistanceStatsWorker(QtCore.QThread):
+    """
+    Worker thread computing the distance statistics over the history archive and the current session.
+    """
+    finished_stats = QtCore.pyqtSignal(object, str)  # DistanceStats or None, error message
+
+    def __init__(self, station_locator, sent_qsos_file=None, history_dir=HISTORY_DIR):
+        super().__init__()
+        self.station_locator = station_locator
+        self.sent_qsos_file = sent_qsos_file
+        self.history_dir = history_dir
+        self.cancelled = False
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            locators = []
+            for record in iter_history(HistoryFilter(), self.sent_qsos_file, self.history_dir):
+                if self.cancelled:
+                    return
+                if record.get("GRIDSQUARE"):
+                    locators.append(record["GRIDSQUARE"])
+            read = time.perf_counter()
+            stats = distance_stats(self.station_locator, locators)
+            log_info(f"Distance statistics: {len(locators)} locators read in {read - start:.2f} s, "
+                     f"computed in {time.perf_counter() - read:.3f} s.")
+            self.finished_stats.emit(stats, "")
+        except Exception as e:
+            log_error(f"Distance statistics error: {e}")
+            self.finished_stats.emit(None, str(e))
@@ -0,0 +1,168 @@
+"""
+Paged viewer for the log file and the status history, newest entries first.
+"""
+
+from itertools import islice
+from PyQt5 import QtWidgets, QtCore
+from src.logger import iter_log_lines_reverse
+
+LEVELS = ["", "INFO", "WARNING", "ERROR"]
+
+class PagedLineModel(QtCore.QAbstractListModel):
+    """
+    List model that pulls lines from an iterator page by page.
+    Only pages the view actually scrolls to are read, so opening is instant
+    for any log size. A page is filled in steps of at most SCAN_LINES lines,
+    continued from the event loop, so a rare filter text never blocks the GUI
+    while it searches through the whole log.
+    """
+    PAGE_SIZE = 500
+    SCAN_LINES = 5000
+
+    def __init__(self, source_factory, parent=None):
+        """
+        source_factory: callable returning a new iterator of lines (newest first).
+        """
+        super().__init__(parent)
+        self.source_factory = source_factory
+        self.level = ""
+        self.text = ""
+        self.lines = []
+        self.source = None
+        self.exhausted = False
+        self.pending = 0  # Matching lines still missing for the page being filled
+        self.scan_timer = QtCore.QTimer(self)
+        self.scan_timer.setSingleShot(True)
+        self.scan_timer.setInterval(0)
+        self.scan_timer.timeout.connect(self.scan_step)
+        self.reload()
+
+    def set_filter(self, level, text):
+        """
+        Set level and text filter and reload from the newest entry.
+        """
+        self.level = level
+        self.text = text.lower()
+        self.reload()
+
+    def reload(self):
+        """
+        Restart reading from the newest entry.
+        """
+        self.scan_timer.stop()
+        self.beginResetModel()
+        self.lines = []
+        self.source = iter(self.source_factory())
+        self.exhausted = False
+        self.pending = 0
+        self.endResetModel()
+        if self.canFetchMore(QtCore.QModelIndex()):
+            self.fetchMore(QtCore.QModelIndex())
+
+    def matches(self, line):
+        """
+        Return True if the line passes the level and text filter.
+        """
+        if self.level and f" {self.level}: " not in line[:40]:
+            return False
+        return not self.text or self.text in line.lower()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and index.isValid():
+            return self.lines[index.row()]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted and not self.pending
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self.pending:
+            return
+        self.pending = self.PAGE_SIZE
+        self.scan_step()
+
+    def scan_step(self):
+        """
+        Read up to SCAN_LINES lines for the current page; schedule the next step if it is not full yet.
+        """
+        page = []
+        scanned = 0
+        for line in islice(self.source, self.SCAN_LINES):
+            scanned += 1
+            if self.matches(line):
+                page.append(line)
+                if len(page) == self.pending:
+                    break
+        if page:
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.lines), len(self.lines) + len(page) - 1)
+            self.lines.extend(page)
+            self.endInsertRows()
+        self.pending -= len(page)
+        if self.pending and scanned < self.SCAN_LINES:
+            self.exhausted = True
+            self.pending = 0
+        elif self.pending:
+            self.scan_timer.start()
+
+class LogViewerDialog(QtWidgets.QDialog):
+    """
+    Dialog showing lines newest first with level and text filter.
+    """
+    def __init__(self, parent=None, translation=None, source_factory=None, title=None, show_level=True):
+        """
+        Initialize the viewer. Without source_factory the log files are shown.
+        """
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.setWindowTitle(title or self.translation.get("log_viewer", "Log"))
+        self.resize(800, 500)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.level_combo = QtWidgets.QComboBox()
+        self.level_combo.addItem(self.translation.get("all_levels", "All levels"), "")
+        for level in LEVELS[1:]:
+            self.level_combo.addItem(level, level)
+        self.level_combo.setVisible(show_level)
+        filter_layout.addWidget(self.level_combo)
+        self.filter_input = QtWidgets.QLineEdit()
+        self.filter_input.setPlaceholderText(self.translation.get("filter_placeholder", "Filter..."))
+        self.filter_input.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.filter_input)
+        layout.addLayout(filter_layout)
+
+        self.model = PagedLineModel(source_factory or iter_log_lines_reverse, self)
+        self.view = QtWidgets.QListView()
+        self.view.setUniformItemSizes(True)  # Lets the view skip measuring rows that are not visible
+        self.view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.view.setModel(self.model)
+        layout.addWidget(self.view)
+
+        # Debounce text input so filtering does not run on every keystroke
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        self.level_combo.currentIndexChanged.connect(self.apply_filter)
+
+        btn_copy = QtWidgets.QPushButton(self.translation.get("copy_to_clipboard", "Copy to clipboard"))
+        btn_copy.clicked.connect(self.copy_selection)
+        layout.addWidget(btn_copy)
+
+    def apply_filter(self):
+        """
+        Apply the current level and text filter.
+        """
+        self.model.set_filter(self.level_combo.currentData(), self.filter_input.text().strip())
+
+    def copy_selection(self):
+        """
+        Copy the selected lines (or all loaded lines) to the clipboard.
+        """
+        rows = sorted(index.row() for index in self.view.selectionModel().selectedRows())
+        lines = [self.model.lines[row] for row in rows] if rows else self.model.lines
+        QtWidgets.QApplication.clipboard().setText("\n".join(lines))
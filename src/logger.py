@@ -3,10 +3,17 @@ Logger module for error and event logging.
 """
 
 import os
+import time
+import atexit
+import queue
+import threading
 import logging
 import logging.handlers
+from collections import OrderedDict
 
 LOGFILE = "wlsender.log"
+LOG_BACKUP_COUNT = 10
+LOG_QUEUE_SIZE = 10000  # Max. pending records before new ones are dropped
 
 logging.lastResort = None  # Disable emergency handler
 
@@ -38,34 +45,242 @@ logger = logging.getLogger("wlsender")
 logger.setLevel(logging.INFO)
 logger.propagate = False  # WICHTIG!
 
-# Rotating file handler for errors and info (max 25MB, 3 Backups)
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the calling thread.
+    If the queue is full, the record is dropped and counted instead.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RepeatFilter(logging.Filter):
+    """
+    Collapse identical repeated messages and rate-limit warnings and errors per key.
+    A run of identical consecutive messages is logged once, followed by a
+    "Last message repeated N times" summary (with the time of the last occurrence).
+    Independently, each warning/error key has a token bucket, so recurring problems
+    that are interleaved with other messages cannot flood the log file either.
+    Audit records (one per QSO, see log_info(audit=True)) are always written.
+    """
+    def __init__(self, emit, burst=5, refill_seconds=60.0, summary_interval=600.0, max_keys=500,
+                 limit_level=logging.WARNING):
+        super().__init__()
+        self._emit = emit  # Callable that writes summary records past this filter
+        self.burst = burst
+        self.limit_level = limit_level  # Lower levels are only collapsed, not rate-limited
+        self.refill_seconds = refill_seconds
+        self.summary_interval = summary_interval
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._last_key = None
+        self._last_record = None
+        self._repeat_count = 0
+        self._repeat_since = 0.0
+        self._buckets = OrderedDict()  # key -> [tokens, last_refill, suppressed]
+        self.stats = {"passed": 0, "repeated": 0, "rate_limited": 0}
+
+    def filter(self, record):
+        if getattr(record, "wlsender_summary", False):
+            return True
+        if getattr(record, "wlsender_audit", False):
+            with self._lock:
+                summary = self._take_repeat_summary()  # Keep the order: the pending run ended before
+                self._last_key = None
+                self.stats["passed"] += 1
+            if summary is not None:
+                self._emit(summary)
+            return True
+        key = (record.levelno, record.getMessage())
+        summaries = []
+        with self._lock:
+            if key == self._last_key:
+                self._repeat_count += 1
+                self._last_record = record
+                self.stats["repeated"] += 1
+                if record.created - self._repeat_since >= self.summary_interval:
+                    summaries.append(self._take_repeat_summary())
+                    self._last_key = key
+                    self._repeat_since = record.created
+                allowed = False
+            else:
+                summaries.append(self._take_repeat_summary())
+                self._last_key = key
+                self._last_record = record
+                self._repeat_since = record.created
+                if record.levelno < self.limit_level:
+                    allowed, suppressed = True, 0
+                else:
+                    allowed, suppressed = self._consume_token(key, record.created)
+                if allowed and suppressed:
+                    summaries.append(self._make_summary(
+                        record, f"Previous message suppressed {suppressed} times (rate limit): {key[1]}"))
+                if allowed:
+                    self.stats["passed"] += 1
+                else:
+                    self.stats["rate_limited"] += 1
+        for summary in summaries:
+            if summary is not None:
+                self._emit(summary)
+        return allowed
+
+    def flush(self):
+        """
+        Write pending repeat and rate-limit summaries, e.g. before shutdown.
+        """
+        with self._lock:
+            summaries = [self._take_repeat_summary()]
+            self._last_key = None
+            for (levelno, msg), bucket in self._buckets.items():
+                if bucket[2]:
+                    summaries.append(self._make_summary(
+                        logging.LogRecord(logger.name, levelno, "", 0, msg, None, None),
+                        f"Message suppressed {bucket[2]} times (rate limit): {msg}"))
+                    bucket[2] = 0
+        for summary in summaries:
+            if summary is not None:
+                self._emit(summary)
+
+    def _take_repeat_summary(self):
+        # Must be called with self._lock held
+        if not self._repeat_count:
+            return None
+        last = self._last_record
+        last_time = time.strftime("%H:%M:%S", time.localtime(last.created))
+        summary = self._make_summary(
+            last, f"Last message repeated {self._repeat_count} times (last at {last_time}): {last.getMessage()}")
+        self._repeat_count = 0
+        return summary
+
+    def _consume_token(self, key, now):
+        # Must be called with self._lock held. Returns (allowed, suppressed_before)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.burst), now, 0]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) / self.refill_seconds)
+            bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+            return True, suppressed
+        bucket[2] += 1
+        return False, 0
+
+    def _make_summary(self, record, text):
+        summary = logging.LogRecord(record.name, record.levelno, record.pathname, record.lineno, text, None, None)
+        summary.wlsender_summary = True
+        return summary
+
+# Rotating file handler for errors and info (max 100MB, 10 Backups)
 file_handler = logging.handlers.RotatingFileHandler(
-    LOGFILE, maxBytes=10 * 1024 * 1024, backupCount=10, encoding="utf-8"
+    LOGFILE, maxBytes=10 * 1024 * 1024, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
 )
 file_handler.setLevel(logging.INFO)
 file_formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
 file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+
+# File output runs in a background thread, callers (e.g. the GUI thread) only enqueue
+log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+queue_handler.setLevel(logging.INFO)
+repeat_filter = RepeatFilter(queue_handler.handle)
+queue_handler.addFilter(repeat_filter)
+logger.addHandler(queue_handler)
+queue_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+queue_listener.start()
 
 # DO NOT attach StreamHandler for console!
 
-def log_error(msg):
+def shutdown_logging():
+    """
+    Stop the background writer, write all pending records and close the log file.
+    Safe to call more than once.
+    """
+    global queue_listener
+    if queue_listener is None:
+        return
+    repeat_filter.flush()
+    stats = get_log_suppression_stats()
+    if stats["repeated"] or stats["rate_limited"] or stats["dropped"]:
+        logger.info(
+            f"Log suppression: {stats['passed']} written, {stats['repeated']} repeats collapsed, "
+            f"{stats['rate_limited']} rate-limited, {stats['dropped']} dropped (queue full)."
+        )
+    queue_listener.stop()  # Processes all records still in the queue
+    queue_listener = None
+    file_handler.close()
+
+atexit.register(shutdown_logging)
+
+def log_error(msg, audit=False):
     """
-    Log an error message with timestamp.
+    Log an error message with timestamp. Audit messages (the outcome of one QSO) are never
+    collapsed or rate-limited.
     """
-    logger.error(msg)
+    logger.error(msg, extra={"wlsender_audit": audit})
 
-def log_info(msg):
+def log_info(msg, audit=False):
     """
-    Log an info message with timestamp.
+    Log an info message with timestamp. Audit messages (the outcome of one QSO) are never
+    collapsed or rate-limited.
     """
-    logger.info(msg)
+    logger.info(msg, extra={"wlsender_audit": audit})
+
+def get_log_suppression_stats():
+    """
+    Return counters of written, collapsed, rate-limited and dropped log records.
+    """
+    with repeat_filter._lock:
+        stats = dict(repeat_filter.stats)
+    stats["dropped"] = queue_handler.dropped
+    return stats
 
 def read_log_history():
     """
     Read the log file and return its content.
+    Pending records of the background writer may not be contained yet.
     """
     if not os.path.exists(LOGFILE):
         return ""
     with open(LOGFILE, "r", encoding="utf-8") as f:
-        return f.read()
\ No newline at end of file
+        return f.read()
+
+def iter_log_lines_reverse(block_size=64 * 1024):
+    """
+    Yield log lines newest first, across the current and all rotated log files.
+    Files are read backwards block by block, so the first lines are available
+    immediately regardless of the total log size.
+    """
+    paths = [LOGFILE] + [f"{LOGFILE}.{i}" for i in range(1, LOG_BACKUP_COUNT + 1)]
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                pos = f.tell()
+                rest = b""
+                while pos > 0:
+                    read_size = min(block_size, pos)
+                    pos -= read_size
+                    f.seek(pos)
+                    lines = (f.read(read_size) + rest).split(b"\n")
+                    rest = lines[0]  # Possibly incomplete, continued by the next block
+                    for line in reversed(lines[1:]):
+                        if line.strip():
+                            yield line.decode("utf-8", errors="replace").rstrip("\r")
+                if rest.strip():
+                    yield rest.decode("utf-8", errors="replace").rstrip("\r")
+        except OSError as e:
+            log_error(f"Could not read log file {path}: {e}")
@@ -1,26 +1,32 @@
 import sys
 import os
+import multiprocessing
 from PyQt5 import QtWidgets, QtGui
 import qdarkstyle
 from src.config_dialog import load_config
 from src.utils import load_translation
 from src.qso_form import QSOForm
 from src.utils import resource_path
+from src.logger import shutdown_logging
+from src.profiling import create_application
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    config = load_config()
+    app = create_application(sys.argv, config)
     app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
     splash_pix = QtGui.QPixmap(resource_path("icons/wlicon_green.png"))
     splash = QtWidgets.QSplashScreen(splash_pix)
     splash.show()
     app.processEvents()
 
-    config = load_config()
     translation = load_translation(config.get("language", "en"))
     window = QSOForm(config, translation)
     splash.finish(window)
     window.show()
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    shutdown_logging()  # Flush pending log records before exit
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # ADIF import worker processes in the frozen executable
     main()
\ No newline at end of file
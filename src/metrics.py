@@ -0,0 +1,293 @@
+"""
+Runtime metrics (counters, gauges, latency histograms) with optional HTTP endpoint.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.logger import log_error, log_info, log_queue, get_log_suppression_stats
+
+# Upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Help texts of the metrics recorded by WLSender
+HELP_TEXTS = {
+    "qrz_lookups_total": "QRZ.com lookups started",
+    "qrz_logins_total": "QRZ.com session logins",
+    "qrz_not_found_total": "QRZ.com lookups without data",
+    "qrz_errors_total": "QRZ.com lookups failed (network or login)",
+    "qrz_lookup_seconds": "Duration of QRZ.com lookups",
+    "callbook_hits_total": "Callsigns found in the local callbook",
+    "callbook_misses_total": "Callsigns not found in the local callbook",
+    "flrig_poll_seconds": "Duration of one FLRig poll",
+    "flrig_poll_errors_total": "FLRig polls failed",
+    "wlgate_send_seconds": "Duration of sending a QSO to WLGate",
+    "qso_sent_total": "QSOs sent to WLGate",
+    "qso_send_errors_total": "QSOs that could not be sent to WLGate",
+    "tags_load_seconds": "Duration of loading callsign tags",
+    "adif_import_records_total": "QSOs imported into the history from ADIF logs",
+    "adif_import_records_per_second": "Parse throughput of the last ADIF import",
+    "sync_sent_total": "QSOs published on the multi-op sync bus",
+    "sync_received_total": "QSOs received from other stations",
+    "sync_gaps_total": "Sync messages detected as missing",
+    "sync_recovered_total": "Missing sync messages recovered by NACK",
+    "sync_resent_total": "Sync messages resent on request",
+    "sync_lost_total": "Sync messages given up after repeated NACKs",
+    "sync_invalid_total": "Malformed sync datagrams ignored",
+    "dx_spots_total": "DX cluster spots received",
+    "contest_entry_seconds": "Contest mode: time from Enter to ready for the next call",
+    "gui_field_updates_total": "Form fields changed by the render tick",
+    "gui_field_updates_skipped_total": "Queued field updates skipped because the value was unchanged",
+    "pipeline_submitted_total": "QSOs handed to the processing pipeline",
+    "pipeline_rejected_total": "QSOs refused because the pipeline was busy",
+    "pipeline_total_seconds": "Time from sending a QSO to its archiving",
+    "qrz_detail_lookups_total": "Extended QRZ.com records fetched for the detail panel",
+    "qrz_detail_lookup_seconds": "Duration of fetching an extended QRZ.com record",
+    "qrz_image_download_seconds": "Duration of downloading a QRZ.com profile image",
+    "qrz_cache_hits_total": "QRZ.com details and images read from the disk cache",
+    "qrz_cache_misses_total": "QRZ.com details and images not in the disk cache",
+    "qrz_cache_evictions_total": "Files removed from the QRZ.com disk cache to stay within its size",
+}
+
+class Counter:
+    """
+    Monotonically increasing counter.
+    """
+    kind = "counter"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def snapshot(self):
+        return {"value": self.value}
+
+class Gauge:
+    """
+    Value that can go up and down, or is read from a function on demand.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, help_text="", function=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        if self.function:
+            try:
+                return {"value": self.function()}
+            except Exception:
+                return {"value": 0}
+        return {"value": self.value}
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets (seconds).
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.bounds = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.last = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, fraction):
+        """
+        Estimate a quantile as the upper bound of the bucket it falls into.
+        """
+        with self.lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = fraction * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        with self.lock:
+            count, total, maximum, last = self.count, self.sum, self.max, self.last
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": maximum,
+            "last": last,
+        }
+
+class MetricsRegistry:
+    """
+    Registry of named metrics; metrics are created on first use.
+    """
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(name, cls(name, help_text or HELP_TEXTS.get(name, ""), **kwargs))
+        return metric
+
+    def counter(self, name, help_text=""):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text="", function=None):
+        return self._get(Gauge, name, help_text, function=function)
+
+    def histogram(self, name, help_text=""):
+        return self._get(Histogram, name, help_text)
+
+    def snapshot(self):
+        """
+        Return {name: {"type": ..., "help": ..., values...}} for all metrics.
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {m.name: dict(type=m.kind, help=m.help, **m.snapshot()) for m in metrics}
+
+    def to_prometheus(self):
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for m in metrics:
+            name = f"wlsender_{m.name}"
+            if m.help:
+                lines.append(f"# HELP {name} {m.help}")
+            lines.append(f"# TYPE {name} {m.kind}")
+            if m.kind == "histogram":
+                with m.lock:
+                    counts, count, total = list(m.counts), m.count, m.sum
+                cumulative = 0
+                for bound, bucket_count in zip(list(m.bounds) + ["+Inf"], counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum {total}")
+                lines.append(f"{name}_count {count}")
+            else:
+                lines.append(f"{name} {m.snapshot()['value']}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+REGISTRY.gauge("log_queue_depth", "Log records waiting for the background writer", function=log_queue.qsize)
+
+def _suppressed_log_records():
+    stats = get_log_suppression_stats()
+    return stats["repeated"] + stats["rate_limited"]
+
+REGISTRY.gauge("log_records_suppressed", "Log records collapsed or rate-limited", function=_suppressed_log_records)
+
+def inc(name, amount=1):
+    """
+    Increment a counter of the global registry.
+    """
+    REGISTRY.counter(name).inc(amount)
+
+def observe(name, seconds):
+    """
+    Record a latency (seconds) in a histogram of the global registry.
+    """
+    REGISTRY.histogram(name).observe(seconds)
+
+@contextmanager
+def timer(name):
+    """
+    Measure the duration of the with-block into a histogram of the global registry.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.histogram(name).observe(time.perf_counter() - start)
+
+class MetricsServer:
+    """
+    Local HTTP endpoint: /metrics (Prometheus text) and /metrics.json.
+    """
+    def __init__(self, port, host="127.0.0.1", registry=REGISTRY):
+        self.port = port
+        self.host = host
+        self.registry = registry
+        self.server = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(registry.snapshot(), indent=2).encode("utf-8")
+                    content_type = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = registry.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Requests are not logged
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            log_error(f"Metrics endpoint could not be started on port {self.port}: {e}")
+            self.server = None
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        log_info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
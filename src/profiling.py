@@ -0,0 +1,230 @@
+"""
+Opt-in profiling of a session: cProfile, tracemalloc and detection of slow GUI events.
+
+Enable with the environment variable WLSENDER_PROFILE=1 or "profiling": true in the config.
+The slow-event threshold is WLSENDER_SLOW_MS or "profiling_slow_ms" (default 100 ms).
+Reports are written to data/ when the main window is closed.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from datetime import datetime
+from PyQt5 import QtCore, QtWidgets
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+
+ACTIVE_SESSION = None
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Frames below are application code
+
+def profiling_enabled(config):
+    """
+    Return True if profiling is requested via environment or config.
+    """
+    env = os.environ.get("WLSENDER_PROFILE", "").strip().lower()
+    return env in ("1", "true", "yes", "on") or bool(config.get("profiling", False))
+
+class ProfilingSession:
+    """
+    Collects a cProfile profile of the GUI thread, tracemalloc snapshots and slow events.
+    A watchdog thread captures the GUI thread's stack while an event is still blocking.
+
+    An event counts as blocking for its own run time, including the events it sends
+    synchronously (e.g. FocusIn from setFocus). If it runs a nested event loop (a modal
+    dialog), the time that loop waits and the events it dispatches are not counted;
+    those events are reported on their own.
+    """
+    MAX_SLOW_EVENTS = 500
+
+    def __init__(self, slow_ms=100):
+        self.slow_seconds = slow_ms / 1000
+        self.profiler = cProfile.Profile()
+        self.main_thread_id = threading.get_ident()
+        # Events being dispatched: [start_time, description, stack, idle, children_busy, nested_loop]
+        self.event_stack = []
+        self.blocked_since = None  # Start of the current wait of a nested event loop
+        self.slow_events = []
+        self.start_snapshot = None
+        self.started = None
+        self.running = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Start profiling; must be called from the GUI thread.
+        """
+        self.started = datetime.now()
+        tracemalloc.start(25)
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.running = True
+        dispatcher = QtCore.QAbstractEventDispatcher.instance()
+        if dispatcher is not None:
+            dispatcher.aboutToBlock.connect(self.loop_about_to_block)
+            dispatcher.awake.connect(self.loop_awake)
+        threading.Thread(target=self._watchdog, daemon=True).start()
+        self.profiler.enable()
+        log_info(f"Profiling enabled (slow event threshold {self.slow_seconds * 1000:.0f} ms).")
+
+    def stop(self):
+        """
+        Stop profiling.
+        """
+        if not self.running:
+            return
+        self.profiler.disable()
+        self.running = False
+
+    def begin_event(self, description):
+        with self.lock:
+            self.event_stack.append([time.perf_counter(), description, None, 0.0, 0.0, False])
+
+    def end_event(self):
+        now = time.perf_counter()
+        with self.lock:
+            event = self.event_stack.pop()
+            busy = now - event[0] - event[3]
+            if self.event_stack:
+                self.event_stack[-1][4] += busy
+        blocked = self._blocking_time(event, now)
+        if blocked >= self.slow_seconds:
+            description, summary = event[1], event[2]
+            stack = "".join(summary.format()) if summary else ""
+            description = f"{description} in {application_frame(summary)}"
+            if len(self.slow_events) < self.MAX_SLOW_EVENTS:
+                self.slow_events.append((datetime.now(), blocked, description, stack))
+            log_info(f"Slow GUI event: {description} blocked the event loop "
+                     f"for {blocked * 1000:.0f} ms\n{stack or '(finished before the stack could be captured)'}")
+
+    def _blocking_time(self, event, now):
+        start, _, _, idle, children_busy, nested_loop = event
+        return now - start - idle - (children_busy if nested_loop else 0.0)
+
+    def loop_about_to_block(self):
+        """
+        The event loop waits for events; with an event on the stack this is a nested loop.
+        """
+        with self.lock:
+            self.blocked_since = time.perf_counter() if self.event_stack else None
+
+    def loop_awake(self):
+        with self.lock:
+            if self.blocked_since is None:
+                return
+            idle = time.perf_counter() - self.blocked_since
+            self.blocked_since = None
+            for event in self.event_stack:
+                event[3] += idle
+                event[5] = True
+
+    def _watchdog(self):
+        interval = max(self.slow_seconds / 4, 0.005)
+        while self.running:
+            time.sleep(interval)
+            with self.lock:
+                if not self.event_stack or self.blocked_since is not None:
+                    continue
+                event = self.event_stack[-1]
+                if event[2] is not None or self._blocking_time(event, time.perf_counter()) < self.slow_seconds:
+                    continue
+                frame = sys._current_frames().get(self.main_thread_id)
+                event[2] = traceback.extract_stack(frame) if frame else None
+
+    def dump_reports(self, directory=None):
+        """
+        Write profile, memory and slow event reports; returns the list of written files.
+        """
+        self.stop()
+        directory = directory or user_data_path("")
+        os.makedirs(directory, exist_ok=True)
+        prefix = os.path.join(directory, f"profile_{self.started:%Y%m%d_%H%M%S}")
+        written = []
+        try:
+            self.profiler.dump_stats(f"{prefix}.prof")
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(60)
+            with open(f"{prefix}_cpu.txt", "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+            written += [f"{prefix}.prof", f"{prefix}_cpu.txt"]
+
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                with open(f"{prefix}_memory.txt", "w", encoding="utf-8") as f:
+                    f.write(f"Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+                    f.write("Top allocations:\n")
+                    for stat in snapshot.statistics("lineno")[:30]:
+                        f.write(f"{stat}\n")
+                    f.write("\nGrowth since start:\n")
+                    for stat in snapshot.compare_to(self.start_snapshot, "lineno")[:30]:
+                        f.write(f"{stat}\n")
+                written.append(f"{prefix}_memory.txt")
+
+            with open(f"{prefix}_slow_events.txt", "w", encoding="utf-8") as f:
+                f.write(f"Threshold: {self.slow_seconds * 1000:.0f} ms, slow events: {len(self.slow_events)}\n")
+                for when, duration, description, stack in self.slow_events:
+                    f.write(f"\n{when:%H:%M:%S} {duration * 1000:.0f} ms {description}\n")
+                    f.write(stack or "(finished before the stack could be captured)\n")
+            written.append(f"{prefix}_slow_events.txt")
+            log_info(f"Profiling reports written: {', '.join(written)}")
+        except Exception as e:
+            log_error(f"Could not write profiling reports: {e}")
+        return written
+
+def application_frame(summary):
+    """
+    Describe the innermost application frame of a stack summary, e.g. "send_qso (src/qso_form.py:1170)":
+    the slot (or the function it called) that was running while the event loop was blocked.
+    """
+    for frame in reversed(summary or []):
+        path = os.path.abspath(frame.filename)
+        if (path.startswith(APP_DIR + os.sep) and path != os.path.abspath(__file__)
+                and "site-packages" not in path):  # A virtualenv may live in the project directory
+            return f"{frame.name} ({os.path.relpath(path, APP_DIR)}:{frame.lineno})"
+    return "unknown code"
+
+class ProfilingApplication(QtWidgets.QApplication):
+    """
+    QApplication that times every event dispatch for slow event detection.
+    """
+    def __init__(self, argv, session):
+        super().__init__(argv)
+        self.session = session
+
+    def notify(self, receiver, event):
+        session = self.session
+        if not session.running or threading.get_ident() != session.main_thread_id:
+            return super().notify(receiver, event)
+        session.begin_event(f"{type(receiver).__name__} event {int(event.type())}")
+        try:
+            return super().notify(receiver, event)
+        finally:
+            session.end_event()
+
+def create_application(argv, config):
+    """
+    Create the QApplication, with profiling hooks if profiling is enabled.
+    """
+    global ACTIVE_SESSION
+    if not profiling_enabled(config):
+        return QtWidgets.QApplication(argv)
+    slow_ms = float(os.environ.get("WLSENDER_SLOW_MS") or config.get("profiling_slow_ms", 100))
+    ACTIVE_SESSION = ProfilingSession(slow_ms)
+    app = ProfilingApplication(argv, ACTIVE_SESSION)
+    ACTIVE_SESSION.start()
+    return app
+
+def dump_active_session():
+    """
+    Write the reports of the active profiling session, if any.
+    """
+    global ACTIVE_SESSION
+    if ACTIVE_SESSION:
+        ACTIVE_SESSION.dump_reports()
+        ACTIVE_SESSION = None
@@ -0,0 +1,175 @@
+"""
+Extended QRZ.com records for the detail panel: fetched lazily in the background, with the
+details and profile images kept in a size-bounded disk cache (least recently used evicted first).
+The normal callsign lookup (lookup_qrz) is not affected.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+import requests
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtCore import pyqtSignal
+from src import metrics
+from src.logger import log_error
+from src.qrz_lookup import QRZ_URL, lookup_qrz_details
+from src.utils import user_data_path
+from src.worker_lifecycle import BackgroundTask
+
+QRZ_CACHE_DIR = user_data_path("qrz_cache")
+DEFAULT_CACHE_MB = 50
+DETAILS_MAX_AGE_SECONDS = 7 * 24 * 3600  # Cached details are fetched again after a week
+IMAGE_MAX_SIZE = 320  # Pixels, images are scaled down in the worker
+
+class DiskCache:
+    """
+    Files in one directory, named by the hash of their key. Reading a file marks it as recently
+    used (also on disk via its mtime); writing evicts the least recently used files once the
+    total size exceeds max_bytes. Safe to use from several threads.
+    """
+    def __init__(self, directory=QRZ_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = None  # file name -> size, least recently used first; read on first use
+        self.total = 0
+        metrics.REGISTRY.gauge("qrz_cache_bytes", "Size of the QRZ.com detail and image cache").function = \
+            lambda: self.total
+
+    def _index(self):
+        if self.entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+            self.entries = OrderedDict((name, size) for _, name, size in sorted(files))
+            self.total = sum(self.entries.values())
+        return self.entries
+
+    def _name(self, key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached bytes for key, or None.
+        """
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        with self.lock:
+            entries = self._index()
+            if name not in entries:
+                metrics.inc("qrz_cache_misses_total")
+                return None
+            entries.move_to_end(name)
+            try:
+                os.utime(path)
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self.total -= entries.pop(name)
+                metrics.inc("qrz_cache_misses_total")
+                return None
+        metrics.inc("qrz_cache_hits_total")
+        return data
+
+    def put(self, key, data):
+        """
+        Store bytes for key, then evict old entries down to max_bytes.
+        """
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        with self.lock:
+            entries = self._index()
+            try:
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                log_error(f"QRZ cache write error: {e}")
+                return
+            self.total += len(data) - entries.pop(name, 0)
+            entries[name] = len(data)
+            while self.total > self.max_bytes and len(entries) > 1:
+                old_name, size = entries.popitem(last=False)
+                self.total -= size
+                metrics.inc("qrz_cache_evictions_total")
+                try:
+                    os.remove(os.path.join(self.directory, old_name))
+                except OSError:
+                    pass
+
+class QRZDetailsWorker(BackgroundTask):
+    """
+    Background fetch of the extended record and the profile image of one callsign, cache first.
+    The image is decoded and scaled here, the GUI thread only converts it to a pixmap.
+    """
+    details_ready = pyqtSignal(object, str, object)  # details dict or None, call, session_key
+    image_ready = pyqtSignal(object, str)  # QImage, call
+    wait_at_exit = False
+
+    def __init__(self, call, username, password, session_key, cache, base_url=QRZ_URL):
+        super().__init__(f"qrz-details-{call}")
+        self.call = call
+        self.username = username
+        self.password = password
+        self.session_key = session_key
+        self.cache = cache
+        self.base_url = base_url
+
+    def run(self):
+        details = self.load_details()
+        if self.stop_event.is_set():
+            return
+        self.details_ready.emit(details, self.call, self.session_key)
+        if details and details.get("image"):
+            image = self.load_image(details["image"])
+            if image is not None and not self.stop_event.is_set():
+                self.image_ready.emit(image, self.call)
+
+    def load_details(self):
+        key = f"details:{self.call}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            try:
+                entry = json.loads(cached.decode("utf-8"))
+                if time.time() - entry["fetched"] < DETAILS_MAX_AGE_SECONDS:
+                    return entry["details"]
+            except (ValueError, KeyError, TypeError):
+                pass
+        details, self.session_key = lookup_qrz_details(
+            self.call, self.username, self.password, self.session_key, self.base_url)
+        if details:
+            self.cache.put(key, json.dumps({"fetched": time.time(), "details": details}).encode("utf-8"))
+        elif cached is not None:
+            try:
+                return json.loads(cached.decode("utf-8"))["details"]  # Outdated, but better than nothing
+            except (ValueError, KeyError, TypeError):
+                pass
+        return details
+
+    def load_image(self, url):
+        key = f"image:{url}"
+        data = self.cache.get(key)
+        if data is None:
+            try:
+                with metrics.timer("qrz_image_download_seconds"):
+                    r = requests.get(url, timeout=10)
+                r.raise_for_status()
+                data = r.content
+            except Exception as e:
+                log_error(f"QRZ.com image download error for {self.call}: {e}")
+                return None
+            self.cache.put(key, data)
+        image = QtGui.QImage.fromData(data)
+        if image.isNull():
+            log_error(f"QRZ.com image of {self.call} could not be decoded.")
+            return None
+        if image.width() > IMAGE_MAX_SIZE or image.height() > IMAGE_MAX_SIZE:
+            image = image.scaled(IMAGE_MAX_SIZE, IMAGE_MAX_SIZE, QtCore.Qt.KeepAspectRatio,
+                                 QtCore.Qt.SmoothTransformation)
+        return image
@@ -0,0 +1,100 @@
+"""
+Non-modal panel with the extended QRZ.com record of the current callsign (photo, address,
+licence class, e-mail, QSL preferences and biography).
+"""
+
+from html import escape
+from PyQt5 import QtWidgets, QtCore, QtGui
+from src.qrz_details import IMAGE_MAX_SIZE
+
+class QRZDetailsDialog(QtWidgets.QDialog):
+    """
+    Shows the details of one callsign; results for another callsign (a replaced fetch) are ignored.
+    """
+    ROWS = ["name", "address", "country", "grid", "class", "email", "qsl", "url", "born"]
+
+    def __init__(self, parent, translation):
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.call = ""
+        self.setWindowTitle(self.translation.get("qrz_details", "QRZ.com Details"))
+        self.resize(640, 480)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        top = QtWidgets.QHBoxLayout()
+        self.image_label = QtWidgets.QLabel()
+        self.image_label.setFixedSize(IMAGE_MAX_SIZE, IMAGE_MAX_SIZE)
+        self.image_label.setAlignment(QtCore.Qt.AlignCenter)
+        top.addWidget(self.image_label)
+
+        info = QtWidgets.QVBoxLayout()
+        self.call_label = QtWidgets.QLabel()
+        font = self.call_label.font()
+        font.setPointSize(font.pointSize() + 6)
+        font.setBold(True)
+        self.call_label.setFont(font)
+        info.addWidget(self.call_label)
+        form = QtWidgets.QFormLayout()
+        self.value_labels = {}
+        for key in self.ROWS:
+            label = QtWidgets.QLabel()
+            label.setTextInteractionFlags(QtCore.Qt.TextBrowserInteraction)
+            label.setOpenExternalLinks(True)
+            label.setWordWrap(True)
+            form.addRow(self.translation.get(f"qrz_detail_{key}", key.capitalize()), label)
+            self.value_labels[key] = label
+        info.addLayout(form)
+        info.addStretch()
+        top.addLayout(info, 1)
+        layout.addLayout(top)
+
+        self.biography = QtWidgets.QTextBrowser()
+        self.biography.setOpenExternalLinks(True)
+        layout.addWidget(self.biography, 1)
+
+    def show_loading(self, call):
+        """
+        Clear the panel for a new callsign while its details are fetched.
+        """
+        self.call = call
+        self.call_label.setText(call)
+        self.image_label.setPixmap(QtGui.QPixmap())
+        self.image_label.setText(self.translation.get("qrz_details_loading", "Loading..."))
+        for label in self.value_labels.values():
+            label.clear()
+        self.biography.clear()
+
+    def show_details(self, details, call):
+        if call != self.call:
+            return
+        if not details:
+            self.image_label.setText(self.translation.get("qrz_details_not_found", "No QRZ.com details found."))
+            return
+        get = lambda key: details.get(key, "")
+        yes_no = lambda key: self.translation.get("yes", "Yes") if get(key) == "1" else self.translation.get("no", "No")
+        address = ", ".join(part for part in (get("addr1"), get("addr2"), " ".join(
+            part for part in (get("state"), get("zip")) if part)) if part)
+        qsl = f"{self.translation.get('qrz_detail_qslmgr', 'Manager')}: {get('qslmgr')} | " if get("qslmgr") else ""
+        qsl += f"eQSL: {yes_no('eqsl')} | LoTW: {yes_no('lotw')} | {self.translation.get('qrz_detail_mqsl', 'Paper')}: {yes_no('mqsl')}"
+        values = {
+            "name": f"{get('fname')} {get('name')}".strip(),
+            "address": address,
+            "country": get("country"),
+            "grid": get("grid"),
+            "class": get("class"),
+            "email": f'<a href="mailto:{escape(get("email"))}">{escape(get("email"))}</a>' if get("email") else "",
+            "qsl": qsl,
+            "url": f'<a href="{escape(get("url"))}">{escape(get("url"))}</a>' if get("url") else "",
+            "born": get("born"),
+        }
+        for key, label in self.value_labels.items():
+            label.setTextFormat(QtCore.Qt.RichText if key in ("email", "url") else QtCore.Qt.PlainText)
+            label.setText(values[key])
+        self.call_label.setText(get("call") or call)
+        if not get("image"):
+            self.image_label.setText(self.translation.get("qrz_details_no_image", "No image"))
+        self.biography.setPlainText(get("biography"))
+
+    def show_image(self, image, call):
+        if call == self.call:
+            self.image_label.setPixmap(QtGui.QPixmap.fromImage(image))
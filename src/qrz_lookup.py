@@ -2,40 +2,117 @@
 QRZ.com lookup with error handling and logging.
 """
 
+import html
+import re
 import requests
 from src.logger import log_error, log_info
+from src import metrics
 
-def lookup_qrz(call, username, password, session_key=None):
+QRZ_URL = "https://xmldata.qrz.com/xml/current/"
+
+# Extended fields for the detail panel, only fetched on demand
+DETAIL_FIELDS = ("call", "fname", "name", "addr1", "addr2", "state", "zip", "country", "grid", "class",
+                 "email", "url", "qslmgr", "eqsl", "lotw", "mqsl", "image", "bio", "born", "moddate")
+
+def parse_qrz_response(text):
+    """
+    Extract the callsign data fields from a QRZ.com XML response.
+    """
+    def extract(tag):
+        if f"<{tag}>" in text:
+            return text.split(f"<{tag}>")[1].split(f"</{tag}>")[0]
+        return ""
+    return {
+        "name": (extract("fname") + " " + extract("name")).strip(),
+        "qth": extract("addr2"),
+        "country": extract("country"),
+        "gridsquare": extract("grid"),
+    }
+
+def parse_qrz_details(text):
     """
-    Lookup call data from QRZ.com.
+    Extract all DETAIL_FIELDS present in a QRZ.com XML response (XML entities decoded).
+    """
+    details = {}
+    for tag in DETAIL_FIELDS:
+        match = re.search(f"<{tag}>(.*?)</{tag}>", text, re.S)
+        if match:
+            details[tag] = html.unescape(match.group(1)).strip()
+    return details
+
+def html_to_text(text):
+    """
+    Plain text of a QRZ.com biography page.
+    """
+    text = re.sub(r"(?is)<(script|style)\b.*?</\1>", "", text)
+    text = re.sub(r"(?i)<br\s*/?>|</p>|</div>|</h\d>", "\n", text)
+    text = html.unescape(re.sub(r"<[^>]+>", "", text))
+    return re.sub(r"\n\s*\n+", "\n\n", text).strip()
+
+def qrz_login(username, password, base_url=QRZ_URL):
+    """
+    Log in to QRZ.com and return the session key, or None.
+    """
+    metrics.inc("qrz_logins_total")
+    url = f"{base_url}?username={username};password={password}"
+    r = requests.get(url, timeout=10)
+    if "<Key>" in r.text:
+        return r.text.split("<Key>")[1].split("</Key>")[0]
+    metrics.inc("qrz_errors_total")
+    log_error("QRZ.com login failed.")
+    return None
+
+def lookup_qrz_details(call, username, password, session_key=None, base_url=QRZ_URL):
+    """
+    Fetch the extended QRZ.com record of a callsign, with the biography as plain text
+    ("biography") if the station has one. Returns (details, session_key) or (None, session_key).
+    """
+    metrics.inc("qrz_detail_lookups_total")
+    with metrics.timer("qrz_detail_lookup_seconds"):
+        try:
+            if not session_key:
+                session_key = qrz_login(username, password, base_url)
+                if not session_key:
+                    return None, None
+            r = requests.get(f"{base_url}?s={session_key};callsign={call}", timeout=10)
+            details = parse_qrz_details(r.text)
+            if not details.get("call"):
+                metrics.inc("qrz_not_found_total")
+                log_error(f"QRZ.com: No details found for {call}.")
+                return None, session_key
+            if details.get("bio", "0") not in ("", "0"):
+                r = requests.get(f"{base_url}?s={session_key};html={call}", timeout=10)
+                if r.ok:
+                    details["biography"] = html_to_text(r.text)
+            log_info(f"QRZ.com details for {call} received.")
+            return details, session_key
+        except Exception as e:
+            metrics.inc("qrz_errors_total")
+            log_error(f"QRZ.com details error: {e}")
+            return None, session_key
+
+def lookup_qrz(call, username, password, session_key=None, base_url=QRZ_URL):
+    """
+    Lookup call data from QRZ.com (or a compatible server at base_url).
     Returns (data_dict, session_key) or (None, session_key) on error.
     """
-    try:
-        if not session_key:
-            url = f"https://xmldata.qrz.com/xml/current/?username={username};password={password}"
+    metrics.inc("qrz_lookups_total")
+    with metrics.timer("qrz_lookup_seconds"):
+        try:
+            if not session_key:
+                session_key = qrz_login(username, password, base_url)
+                if not session_key:
+                    return None, None
+            url = f"{base_url}?s={session_key};callsign={call}"
             r = requests.get(url, timeout=10)
-            if "<Key>" in r.text:
-                session_key = r.text.split("<Key>")[1].split("</Key>")[0]
-            else:
-                log_error("QRZ.com login failed.")
-                return None, None
-        url = f"https://xmldata.qrz.com/xml/current/?s={session_key};callsign={call}"
-        r = requests.get(url, timeout=10)
-        def extract(tag):
-            if f"<{tag}>" in r.text:
-                return r.text.split(f"<{tag}>")[1].split(f"</{tag}>")[0]
-            return ""
-        data = {
-            "name": (extract("fname") + " " + extract("name")).strip(),
-            "qth": extract("addr2"),
-            "country": extract("country"),
-            "gridsquare": extract("grid"),
-        }
-        if not any(data.values()):
-            log_error(f"QRZ.com: No data TESTLOG found for {call}.")
-            return None, session_key
-        log_info(f"QRZ.com data for {call} received.")
-        return data, session_key
-    except Exception as e:
-        log_error(f"QRZ.com error: {e}")
-        return None, session_key
\ No newline at end of file
+            data = parse_qrz_response(r.text)
+            if not any(data.values()):
+                metrics.inc("qrz_not_found_total")
+                log_error(f"QRZ.com: No data TESTLOG found for {call}.")
+                return None, session_key
+            log_info(f"QRZ.com data for {call} received.")
+            return data, session_key
+        except Exception as e:
+            metrics.inc("qrz_errors_total")
+            log_error(f"QRZ.com error: {e}")
+            return None, session_key
\ No newline at end of file
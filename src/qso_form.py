@@ -2,39 +2,70 @@
 Main QSO form window with statusbar, debug field, error handling, and i18n.
 """
 
-import socket
 import os
-import json
-import unicodedata
 import shutil
 import re
+import threading
+import time
+import uuid
+from collections import deque
 from src.utils import resource_path
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import QThread, pyqtSignal
 from datetime import datetime, timezone, timedelta
 from src.flrig_worker import FLRigWorker
-from src.qrz_lookup import lookup_qrz
+from src.qrz_lookup import lookup_qrz, QRZ_URL
 from src.config_dialog import ConfigDialog, save_config, load_config
 from src.logger import log_error, log_info
 from src.utils import now_utc_str, AutoCloseInfoBox
-from src.callsign_tag_editor import CallsignTagEditor
+from src.callsign_tag_editor import CallsignTagEditor, get_callsign_tags
 from src.utils import user_data_path
 from src.focus_aware_lineedit import FocusAwareLineEdit
-
-class QRZLookupWorker(QThread):
+from src.log_viewer import LogViewerDialog
+from src.dxcc import extract_core_callsign, load_resolver
+from src.callbook_db import CallbookDB, CallbookImportWorker
+from src.adif import adif_freq, adif_safe
+from src.history import save_session_history, DEFAULT_MAX_MB, HistoryArchive
+from src.history_export import HistoryExportWorker
+from src.adif_import import AdifImportWorker
+from src.worked_index import load_worked_index
+from src.session_log import SessionLogModel, SessionLogDialog
+from src.destinations import DestinationManager
+from src.sync_bus import SyncBus, DEFAULT_GROUP, DEFAULT_PORT
+from src.dx_cluster import BandMap, DXClusterClient, rig_mode
+from src.bandmap_dialog import BandMapDialog
+from src.contest import SerialCounter, CONTEST_FIELDS, esm_step
+from src.render_tick import FieldUpdater
+from src.locator import distance_bearing, great_circle, locator_to_latlon, DistanceStatsWorker
+from src.live_stats import LiveStats, load_baseline
+from src.live_stats_dialog import LiveStatsDialog
+from src.qrz_details import DiskCache, QRZDetailsWorker, QRZ_CACHE_DIR, DEFAULT_CACHE_MB
+from src.qrz_details_dialog import QRZDetailsDialog
+from src.qso_validation import QSOValidator, MESSAGES, RULES, RST_CW_MODES
+from src.worker_lifecycle import WorkerManager, BackgroundTask, SHUTDOWN_DEADLINE_SECONDS
+from src.qso_pipeline import (QSOPipeline, EnrichStage, ValidateStage, DedupeStage, EncodeStage,
+                              DeliverStage, ArchiveStage, ResendTask, load_plugins, send_to_wlgate)
+from src.history_export_dialog import HistoryExportDialog
+from src import metrics
+from src.diagnostics_dialog import DiagnosticsDialog
+from src.profiling import dump_active_session
+
+class QRZLookupWorker(BackgroundTask):
     result_ready = pyqtSignal(object, str, object)  # data, call, session_key
+    wait_at_exit = False
 
-    def __init__(self, call, username, password, session_key):
-        super().__init__()
+    def __init__(self, call, username, password, session_key, base_url=QRZ_URL):
+        super().__init__(f"qrz-{call}")
         self.call = call
         self.username = username
         self.password = password
         self.session_key = session_key
+        self.base_url = base_url
 
     def run(self):
-        from src.qrz_lookup import lookup_qrz
-        data, session_key = lookup_qrz(self.call, self.username, self.password, self.session_key)
-        self.result_ready.emit(data, self.call, session_key)
+        data, session_key = lookup_qrz(self.call, self.username, self.password, self.session_key, self.base_url)
+        if not self.stop_event.is_set():  # A replaced lookup's result is dropped
+            self.result_ready.emit(data, self.call, session_key)
 
 
 class QSOForm(QtWidgets.QMainWindow):
@@ -42,6 +73,8 @@ class QSOForm(QtWidgets.QMainWindow):
     Main window for QSO entry and sending.
     """
     SENT_QSOS_FILE = user_data_path("sent_qsos.adi")
+    STATUS_HISTORY_SIZE = 5000
+    IDLE_POLL_SECONDS = 10
      
     def __init__(self, config, translation):
         """
@@ -50,23 +83,68 @@ class QSOForm(QtWidgets.QMainWindow):
         super().__init__()
         self.config = config
         self.translation = translation
-        self.status_history = []
+        self.status_history = deque(maxlen=self.STATUS_HISTORY_SIZE)
         self.qrz_session_key = None
         self.flrig_worker = None
+        self.qrz_worker = None
+        self.qrz_details_worker = None
+        self.qrz_details_dialog = None
+        self.qrz_cache = None  # Created when the detail panel is first opened
+        self.workers = WorkerManager()
         self.last_flrig_debug = ""
         self.qso_date_user_set = False
         self.time_on_user_set = False
         self.time_off_user_set = False
+        self.dxcc_resolver = None
+        self.callbook = CallbookDB()
+        self.callbook_import_worker = None
+        self.history_export_worker = None
+        self.distance_stats_worker = None
+        self.adif_import_worker = None
+        self.worked_index = None
+        self.metrics_server = None
+        self.diagnostics_dialog = None
+        self.session_log_model = SessionLogModel(self.SENT_QSOS_FILE)
+        self.session_log_dialog = None
+        self.live_stats = LiveStats(lambda: self.dxcc_resolver)
+        self.live_stats_dialog = None
+        self.destinations = None
+        self.sync_bus = None
+        self.bandmap = BandMap()
+        self.dx_cluster = None
+        self.bandmap_dialog = None
+        self.vfo_khz = 0.0
+        self.contest_mode = self.config.get("contest_mode", False)
+        self.serials = SerialCounter()
+        self.pipeline = None
+        self.pipeline_callbook = CallbookDB()  # Used by the enrich stage thread only
+        self.field_updater = FieldUpdater(self)
+        self.validator = QSOValidator()
+        self.idle = False  # Minimized or hidden: clock stopped, FLRig polled slowly
         icon_path = resource_path("icons/wlicon_green.png")
         self.setWindowIcon(QtGui.QIcon(icon_path))
 
         self.init_ui()
+        self.apply_contest_mode()
         self.check_and_handle_old_sent_qsos() 
+        self.session_log_model.load()  # QSOs kept from an earlier session
+        self.live_stats.add_session(self.session_log_model.records)
         self.update_datetime()
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.update_datetime)
         self.timer.start(1000)
         self.start_flrig_worker()
+        self.start_metrics_server()
+        self.start_destinations()
+        self.start_sync_bus()
+        self.start_dx_cluster()
+        self.start_pipeline()
+        # Load the country file in the background, offline DXCC info is available once loaded
+        loaders = [threading.Thread(target=self.load_dxcc_resolver, daemon=True),
+                   threading.Thread(target=self.load_worked_index, daemon=True)]
+        for loader in loaders:
+            loader.start()
+        threading.Thread(target=self.load_stats_baseline, args=(loaders,), daemon=True).start()
         self.call.setFocus() # Set focus to the call sign field
         
 
@@ -112,13 +190,21 @@ class QSOForm(QtWidgets.QMainWindow):
         self.call_tags_widget.setVisible(False)
         self.call.editingFinished.connect(self.lookup_qrz_gui)
         self.call.textChanged.connect(self.call_to_upper)
+        self.call.textChanged.connect(self.update_dxcc_info)
+        self.dxcc_info_label = QtWidgets.QLabel()
+        self.dxcc_info_label.setVisible(False)
         self.band = QtWidgets.QLineEdit()
         self.freq = QtWidgets.QLineEdit()
         self.mode = QtWidgets.QLineEdit()
         self.mode.textChanged.connect(self.update_rst_fields)
         self.rst_sent = QtWidgets.QLineEdit()
         self.rst_rcvd = QtWidgets.QLineEdit()
+        self.stx = QtWidgets.QLineEdit()
+        self.srx = QtWidgets.QLineEdit()
         self.gridsquare = QtWidgets.QLineEdit()
+        self.gridsquare.textChanged.connect(self.update_distance_info)
+        self.distance_label = QtWidgets.QLabel()
+        self.distance_label.setVisible(False)
         self.comment = QtWidgets.QLineEdit()
         self.name = QtWidgets.QLineEdit()
         self.qth = QtWidgets.QLineEdit()
@@ -151,7 +237,7 @@ class QSOForm(QtWidgets.QMainWindow):
         self.flrig_debug_line.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
 
         # Set height and font size for all fields
-        for widget in [self.call, self.band, self.freq, self.mode, self.rst_sent, self.rst_rcvd,
+        for widget in [self.call, self.band, self.freq, self.mode, self.rst_sent, self.rst_rcvd, self.stx, self.srx,
                     self.gridsquare, self.comment, self.name, self.qth, self.tx_pwr,
                     self.country, self.operator, self.station_callsign, self.dxcc,
                     self.qso_date_display, self.time_on_display, self.time_off_display]:
@@ -167,11 +253,16 @@ class QSOForm(QtWidgets.QMainWindow):
             self.add_flrig_debug_field()
         self.form_layout.addRow(self.translation["call"], self.call)
         self.form_layout.addRow("", self.call_tags_widget)  
+        self.form_layout.addRow("", self.dxcc_info_label)
         self.form_layout.addRow(self.translation["band"], self.band)
         self.form_layout.addRow(self.translation["freq"], self.freq)
         self.form_layout.addRow(self.translation["mode"], self.mode)
         self.form_layout.addRow(self.translation["rst_sent"], self.rst_sent)
         self.form_layout.addRow(self.translation["rst_rcvd"], self.rst_rcvd)
+        self.form_layout.addRow(self.translation.get("stx", "Serial sent"), self.stx)
+        self.form_layout.addRow(self.translation.get("srx", "Serial rcvd"), self.srx)
+        self.form_layout.addRow(self.translation["gridsquare"], self.gridsquare)
+        self.form_layout.addRow("", self.distance_label)
         self.form_layout.addRow(self.translation["comment"], self.comment)
         self.form_layout.addRow(self.translation["qso_date"], self.qso_date_display)
         self.form_layout.addRow(self.translation["qso_start"], self.time_on_display)
@@ -198,6 +289,23 @@ class QSOForm(QtWidgets.QMainWindow):
         self.statusbar.messageChanged.connect(self.on_status_message_changed)
         self.statusbar.mousePressEvent = self.show_status_history
 
+        # Contest mode: Enter steps through call -> received exchange -> log
+        self.field_widgets = {
+            "CALL": self.call, "BAND": self.band, "FREQ": self.freq, "MODE": self.mode,
+            "RST_SENT": self.rst_sent, "RST_RCVD": self.rst_rcvd, "STX": self.stx, "SRX": self.srx,
+            "GRIDSQUARE": self.gridsquare, "COMMENT": self.comment, "NAME": self.name, "QTH": self.qth, "TX_PWR": self.tx_pwr,
+            "COUNTRY": self.country, "OPERATOR": self.operator, "STATION_CALLSIGN": self.station_callsign,
+            "DXCC": self.dxcc, "QSO_DATE": self.qso_date_display, "TIME_ON": self.time_on_display,
+            "TIME_OFF": self.time_off_display,
+        }
+        for name in CONTEST_FIELDS:
+            self.field_widgets[name].returnPressed.connect(self.contest_enter)
+        # Live validation: rechecked on every change, shown once the field is left
+        for name in RULES:
+            widget = self.field_widgets[name]
+            widget.textChanged.connect(lambda _, name=name: self.on_field_changed(name))
+            widget.editingFinished.connect(lambda name=name: self.show_field_problems((name,)))
+
     def check_and_handle_old_sent_qsos(self):
         """
         At program start: If sent_qsos.adi exists and is not empty, offer to export or clear.
@@ -235,13 +343,7 @@ class QSOForm(QtWidgets.QMainWindow):
         """
         with open(self.SENT_QSOS_FILE, "w", encoding="utf-8") as f:
             pass  # just clear
-
-    def append_sent_qso(self, adif_entry):
-        """
-        Append a sent QSO ADIF entry to the file.
-        """
-        with open(self.SENT_QSOS_FILE, "a", encoding="utf-8") as f:
-            f.write(adif_entry + "\n")
+        self.session_log_model.clear()
 
     def export_sent_qsos(self):
         """
@@ -261,7 +363,7 @@ class QSOForm(QtWidgets.QMainWindow):
     def update_rst_fields(self):
         
         mode_val = self.mode.text().strip().upper()
-        if mode_val.startswith("CW"):
+        if mode_val.startswith(RST_CW_MODES):
             self.rst_sent.setText("599")
             self.rst_rcvd.setText("599")
         elif mode_val:
@@ -294,23 +396,343 @@ class QSOForm(QtWidgets.QMainWindow):
             self.call.setText(text.upper())
             self.call.setCursorPosition(cursor_pos)
 
+    def load_dxcc_resolver(self):
+        """
+        Load the offline DXCC resolver (runs in a background thread).
+        """
+        self.dxcc_resolver = load_resolver()
+
+    def load_worked_index(self):
+        """
+        Load the worked-before index from the history (runs in a background thread).
+        """
+        self.worked_index = load_worked_index(sent_qsos_file=self.SENT_QSOS_FILE)
+
+    def load_stats_baseline(self, loaders):
+        """
+        Build the all-time statistics baseline once the resolver and the worked-before index are loaded
+        (runs in a background thread).
+        """
+        for loader in loaders:
+            loader.join()
+        if self.worked_index is None:
+            return
+        archived = sum(segment["count"] for segment in HistoryArchive().segments)
+        load_baseline(self.live_stats, archived, self.worked_index, self.dxcc_resolver)
+
+    def update_dxcc_info(self):
+        """
+        Fill country, DXCC and zone info for the current callsign from the local country file
+        and show on which bands and modes it was worked before.
+        """
+        resolver = self.dxcc_resolver
+        info = resolver.resolve(self.call.text()) if resolver else None
+        parts = []
+        if info:
+            self.country.setText(info.country)
+            self.dxcc.setText(info.dxcc)
+            parts.append(self.translation.get("dxcc_info_format", "{continent} | CQ {cq} | ITU {itu}").format(
+                continent=info.continent, cq=info.cq_zone, itu=info.itu_zone))
+        worked = self.worked_index.lookup(self.call.text()) if self.worked_index is not None else []
+        if worked:
+            parts.append(self.translation.get("worked_before", "Worked: {entries}").format(
+                entries=", ".join(f"{band} {mode}".strip() for band, mode in worked)))
+        self.dxcc_info_label.setText(" | ".join(parts))
+        self.dxcc_info_label.setVisible(bool(parts))
+        self.update_distance_info()
+
+    def update_distance_info(self):
+        """
+        Show distance and bearing from the own locator (config station_locator) to the QSO locator,
+        or approximately to the DXCC entity of the callsign while no locator is known.
+        """
+        station = locator_to_latlon(self.config.get("station_locator", ""))
+        result, approx = None, False
+        if station is not None:
+            result = distance_bearing(self.config["station_locator"], self.gridsquare.text())
+            if result is None and self.call.text().strip() and self.dxcc_resolver:
+                info = self.dxcc_resolver.resolve(self.call.text())
+                if info:
+                    result, approx = great_circle(*station, info.lat, info.lon), True
+        if result is None:
+            self.distance_label.setVisible(False)
+            return
+        self.distance_label.setText(self.translation.get("distance_format", "{approx}{km} km, bearing {bearing}°").format(
+            approx="≈ " if approx else "", km=round(result[0]), bearing=round(result[1]) % 360))
+        self.distance_label.setVisible(True)
+
+    def start_metrics_server(self):
+        """
+        Start or restart the local metrics HTTP endpoint (config metrics_port, 0 = off).
+        """
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        port = self.config.get("metrics_port", 0)
+        if port:
+            self.metrics_server = metrics.MetricsServer(port)
+            if not self.metrics_server.start():
+                self.metrics_server = None
+
+    def send_to_wlgate(self, adif):
+        """
+        Send one ADIF record to WLGate via UDP; raises on network errors.
+        """
+        send_to_wlgate(adif, self.config.get("wlgate_host", "127.0.0.1"), self.config.get("wlgate_port", 2237))
+
+    def resend_qsos(self, records):
+        """
+        Send QSOs from the session log again (e.g. after editing them) in the background, like the
+        pipeline's deliver stage: WLGate, the additional destinations and the sync bus.
+        """
+        task = ResendTask(records, self.deliver_qso)
+        task.resent.connect(self.on_qsos_resent)
+        self.workers.track(task)
+        task.start()
+        self.statusbar.showMessage(self.translation["sending_qso"])
+
+    def on_qsos_resent(self, sent, error):
+        log_info(f"{sent} QSOs resent.", audit=True)
+        if error:
+            self.statusbar.showMessage(f"{self.translation['send_error']}: {error}")
+        else:
+            self.statusbar.showMessage(self.translation.get("qsos_resent", "{count} QSOs resent.").format(count=sent))
+
+    def open_session_log(self):
+        """
+        Show the non-modal session log with all QSOs sent in this session.
+        """
+        if self.session_log_dialog is None:
+            self.session_log_dialog = SessionLogDialog(self, self.translation, self.session_log_model, self.resend_qsos)
+            self.session_log_dialog.finished.connect(lambda _: setattr(self, "session_log_dialog", None))
+        self.session_log_dialog.show()
+        self.session_log_dialog.raise_()
+
+    def start_destinations(self):
+        """
+        Start or restart the additional QSO destinations (config destinations).
+        """
+        if self.destinations:
+            self.workers.run_in_background(self.destinations.stop, "destinations-stop")  # Drains the old queues
+        self.destinations = DestinationManager(self.config.get("destinations", []))
+        self.destinations.start()
+
+    def start_sync_bus(self):
+        """
+        Start or stop the multi-operator sync bus (config sync_bus, opt-in).
+        """
+        if self.sync_bus:
+            self.sync_bus.qso_received.disconnect()
+            self.workers.retire(self.sync_bus)
+            self.sync_bus = None
+        if not self.config.get("sync_bus", False):
+            return
+        station = f"{self.config.get('station_callsign', '') or 'WLS'}-{uuid.uuid4().hex[:6]}"
+        self.sync_bus = SyncBus(self.config.get("sync_group", DEFAULT_GROUP),
+                                self.config.get("sync_port", DEFAULT_PORT), station)
+        self.sync_bus.qso_received.connect(self.on_sync_qso)
+        self.sync_bus.start()
+        self.workers.track(self.sync_bus)
+
+    def on_sync_qso(self, record, station):
+        """
+        Merge a QSO logged by another station into the worked-before index.
+        """
+        if self.worked_index is not None:
+            self.worked_index.add_record(record)
+        self.statusbar.showMessage(self.translation.get("sync_qso_received", "{call} logged by {station}").format(
+            call=record.get("CALL", ""), station=station.rsplit("-", 1)[0]))
+        self.update_dxcc_info()
+
+    def start_dx_cluster(self):
+        """
+        Start or restart the DX cluster client (config dx_cluster_host, empty = off).
+        """
+        if self.dx_cluster:
+            self.dx_cluster.spots_changed.disconnect()
+            self.workers.retire(self.dx_cluster)
+            self.dx_cluster = None
+        host = self.config.get("dx_cluster_host", "")
+        if not host:
+            return
+        login = self.config.get("dx_cluster_login") or self.config.get("station_callsign", "") or "NOCALL"
+        self.dx_cluster = DXClusterClient(host, self.config.get("dx_cluster_port", 7300), login, self.bandmap)
+        self.dx_cluster.spots_changed.connect(self.on_spots_changed)
+        self.dx_cluster.start()
+        self.workers.track(self.dx_cluster)
+
+    def on_spots_changed(self):
+        if self.bandmap_dialog:
+            self.bandmap_dialog.refresh()
+
+    def start_pipeline(self):
+        """
+        Start the staged QSO pipeline; sending only captures the form and submits the record.
+        """
+        stages = [EnrichStage(lambda: self.dxcc_resolver, self.pipeline_callbook), ValidateStage(),
+                  DedupeStage(), EncodeStage(), DeliverStage(self.deliver_qso),
+                  ArchiveStage(self.session_log_model.archive_record)]
+        self.pipeline = QSOPipeline(stages, load_plugins(self.config))
+        self.pipeline.qso_done.connect(self.on_qso_done)
+        self.pipeline.qso_failed.connect(self.on_qso_failed)
+        self.pipeline.start()
+
+    def on_qso_done(self, job):
+        """
+        A QSO went through the pipeline: update the session log and worked-before index.
+        """
+        record = job.record
+        self.session_log_model.append_record(record)
+        if self.worked_index is not None:
+            self.worked_index.add_record(record)
+        self.live_stats.add(record)
+        if self.live_stats_dialog:
+            self.live_stats_dialog.refresh()
+        if self.contest_mode:
+            return
+        self.statusbar.showMessage(self.translation["qso_sent"])
+        AutoCloseInfoBox(self, self.translation["success"], self.translation["qso_sent"], timeout=3000).show()
+
+    def on_qso_failed(self, job, stage, error):
+        """
+        A QSO was rejected by a pipeline stage: report it and put it back into the form if that is still empty.
+        """
+        message = f"{self.translation['send_error']} ({stage}): {error}"
+        self.statusbar.showMessage(message)
+        restored = self.restore_record(job.record)
+        if not self.contest_mode:
+            QtWidgets.QMessageBox.critical(self, self.translation["error"], message)
+        elif restored:
+            self.call.setFocus()
+
+    def restore_record(self, record):
+        """
+        Fill the form from a QSO record unless the operator already started the next QSO.
+        """
+        self.field_updater.flush()
+        if self.call.text().strip():
+            return False
+        for name, widget in self.field_widgets.items():
+            if name in ("QSO_DATE", "TIME_ON", "TIME_OFF", "FREQ") or not record.get(name):
+                continue
+            widget.setText(record[name])
+        if record.get("FREQ") and not self.freq.text():
+            self.freq.setText(record["FREQ"])
+        if record.get("QSO_DATE"):
+            date = record["QSO_DATE"]
+            self.qso_date_display.setText(f"{date[6:8]}.{date[4:6]}.{date[0:4]}")
+            self.qso_date_user_set = True
+        for name, display, flag in (("TIME_ON", self.time_on_display, "time_on_user_set"),
+                                    ("TIME_OFF", self.time_off_display, "time_off_user_set")):
+            if record.get(name):
+                value = record[name].ljust(6, "0")
+                display.setText(f"{value[0:2]}:{value[2:4]}:{value[4:6]}")
+                setattr(self, flag, True)
+        self.update_datetime()
+        return True
+
+    def open_bandmap(self):
+        """
+        Show the non-modal bandmap with the spots around the VFO frequency.
+        """
+        if self.bandmap_dialog is None:
+            self.bandmap_dialog = BandMapDialog(self, self.translation, self.bandmap,
+                                               lambda: self.vfo_khz, lambda: self.worked_index)
+            self.bandmap_dialog.spot_selected.connect(self.tune_to_spot)
+            self.bandmap_dialog.finished.connect(lambda _: setattr(self, "bandmap_dialog", None))
+        self.bandmap_dialog.show()
+        self.bandmap_dialog.raise_()
+
+    def tune_to_spot(self, spot):
+        """
+        Tune FLRig to a spot and prefill the QSO form with its callsign.
+        """
+        if self.flrig_worker:
+            self.flrig_worker.tune(spot.freq_khz * 1000, rig_mode(spot))
+        self.call.setText(spot.call)
+        self.lookup_qrz_gui()
+        self.activateWindow()
+        self.call.setFocus()
+
+    def open_live_stats(self):
+        """
+        Show the non-modal statistics dashboard (rates, bands, modes, unique calls and DXCC).
+        """
+        if self.live_stats_dialog is None:
+            self.live_stats_dialog = LiveStatsDialog(self, self.translation, self.live_stats)
+            self.live_stats_dialog.finished.connect(lambda _: setattr(self, "live_stats_dialog", None))
+        self.live_stats_dialog.show()
+        self.live_stats_dialog.raise_()
+
+    def open_diagnostics_dialog(self):
+        """
+        Show the non-modal diagnostics dialog with the runtime metrics.
+        """
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self, translation=self.translation)
+            self.diagnostics_dialog.finished.connect(lambda _: setattr(self, "diagnostics_dialog", None))
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
     def start_flrig_worker(self):
         """
         Start or restart the FLRig worker thread.
         """
         if self.flrig_worker:
-            self.flrig_worker.running = False
-            self.flrig_worker.wait()
+            self.flrig_worker.result.disconnect()
+            self.workers.retire(self.flrig_worker)  # Finishes in the background
         self.flrig_worker = FLRigWorker(self.config.get("flrig_host", "127.0.0.1"),
                                         self.config.get("flrig_port", 12345))
         self.flrig_worker.result.connect(self.update_flrig_fields)
+        if self.idle:
+            self.flrig_worker.set_poll_interval(self.IDLE_POLL_SECONDS)
         self.flrig_worker.start()
+        self.workers.track(self.flrig_worker)
+
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self.update_idle_state()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_idle_state()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_idle_state()
+
+    def update_idle_state(self):
+        """
+        Stop the clock and poll FLRig slowly while the window is minimized or hidden.
+        """
+        idle = self.isMinimized() or not self.isVisible()
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if idle:
+            self.timer.stop()
+        else:
+            self.update_datetime()
+            self.timer.start(1000)
+        if self.flrig_worker:
+            self.flrig_worker.set_poll_interval(self.IDLE_POLL_SECONDS if idle else FLRigWorker.POLL_SECONDS)
+            if not idle:
+                self.flrig_worker.poll_now()
 
     def update_flrig_fields(self, freq, mode, band, debug_msg):
         """
         Update form fields with data from FLRig.
         """
         flrig_connected = bool(freq or mode or band)
+        try:
+            vfo_khz = float(freq) / 1000 if freq else 0.0
+        except ValueError:
+            vfo_khz = 0.0
+        if vfo_khz != self.vfo_khz:
+            self.vfo_khz = vfo_khz
+            if self.bandmap_dialog:
+                self.bandmap_dialog.refresh()
         
         # Set mode to simple modes. From CW-L to CW etc.
         def simplify_mode(m):
@@ -345,41 +767,27 @@ class QSOForm(QtWidgets.QMainWindow):
                 return str(freq_str)
 
         if flrig_connected:
-            # Frequency always override if different
-            formatted_freq = format_freq(freq) if freq else ""
-            if self.freq.text().strip() != formatted_freq:
-                self.freq.setText(formatted_freq)
-
-            # Mode  always override if different
+            # Frequency, mode and band always override; unchanged values are skipped by the updater
+            updater = self.field_updater
+            updater.set_text(self.freq, format_freq(freq) if freq else "")
             mode_val = simplify_mode(mode) if mode else ""
-            if self.mode.text().strip().upper() != mode_val:
-                self.mode.setText(mode_val)
-            else:
-                mode_val = self.mode.text().strip().upper()
-
-            # Band  always override if different
-            band_val = band if band else ""
-            if self.band.text().strip() != band_val:
-                self.band.setText(band_val)
+            updater.set_text(self.mode, mode_val)
+            updater.set_text(self.band, band if band else "")
 
             self.last_flrig_debug = debug_msg
             if self.flrig_debug_line:
-                self.flrig_debug_line.setText(debug_msg)
+                updater.set_text(self.flrig_debug_line, debug_msg)
             # PReload RST fields (only if empty)
-            if mode_val == "CW":
-                if self.rst_sent.text().strip() == "":
-                    self.rst_sent.setText("599")
-                if self.rst_rcvd.text().strip() == "":
-                    self.rst_rcvd.setText("599")
-            elif mode_val:
-                if self.rst_sent.text().strip() == "":
-                    self.rst_sent.setText("59")
-                if self.rst_rcvd.text().strip() == "":
-                    self.rst_rcvd.setText("59")
+            rst = "599" if mode_val == "CW" else "59" if mode_val else ""
+            if rst:
+                if updater.text(self.rst_sent).strip() == "":
+                    updater.set_text(self.rst_sent, rst)
+                if updater.text(self.rst_rcvd).strip() == "":
+                    updater.set_text(self.rst_rcvd, rst)
         else:
             self.last_flrig_debug = debug_msg
             if self.flrig_debug_line:
-                self.flrig_debug_line.setText(debug_msg)
+                self.field_updater.set_text(self.flrig_debug_line, debug_msg)
 
     def create_toolbar_and_menu(self):
         """
@@ -392,6 +800,7 @@ class QSOForm(QtWidgets.QMainWindow):
         exit_icon = self.style().standardIcon(QtWidgets.QStyle.SP_DialogCloseButton)
         config_icon = self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogDetailedView)
         tag_icon = self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogInfoView)
+        log_icon = self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogContentsView)
 
         toolbar = self.addToolBar(self.translation["actions"])
         toolbar.setMovable(False)
@@ -405,6 +814,35 @@ class QSOForm(QtWidgets.QMainWindow):
         config_action.triggered.connect(self.open_config_dialog)
         tag_action = QtWidgets.QAction(tag_icon, self.translation.get("edit_callsign_tags", "Edit Callsign Tags"), self)
         tag_action.triggered.connect(self.open_callsign_tag_editor)
+        log_action = QtWidgets.QAction(log_icon, self.translation.get("log_viewer", "Log"), self)
+        log_action.triggered.connect(self.open_log_viewer)
+        callbook_action = QtWidgets.QAction(self.translation.get("import_callbook", "Import Callbook..."), self)
+        callbook_action.triggered.connect(self.import_callbook)
+        bandmap_action = QtWidgets.QAction(self.translation.get("bandmap", "Bandmap"), self)
+        bandmap_action.triggered.connect(self.open_bandmap)
+        session_log_action = QtWidgets.QAction(self.translation.get("session_log", "Session Log"), self)
+        session_log_action.triggered.connect(self.open_session_log)
+        live_stats_action = QtWidgets.QAction(self.translation.get("live_stats", "Statistics"), self)
+        live_stats_action.setShortcut("Ctrl+Shift+S")
+        live_stats_action.triggered.connect(self.open_live_stats)
+        qrz_details_action = QtWidgets.QAction(self.translation.get("qrz_details", "QRZ.com Details"), self)
+        qrz_details_action.setShortcut("Ctrl+I")
+        qrz_details_action.triggered.connect(self.open_qrz_details)
+        diagnostics_action = QtWidgets.QAction(self.translation.get("diagnostics", "Diagnostics"), self)
+        diagnostics_action.triggered.connect(self.open_diagnostics_dialog)
+        export_history_action = QtWidgets.QAction(self.translation.get("export_history", "Export History..."), self)
+        export_history_action.triggered.connect(self.export_history)
+        distance_stats_action = QtWidgets.QAction(self.translation.get("distance_stats", "Distance Statistics..."), self)
+        distance_stats_action.triggered.connect(self.show_distance_stats)
+        import_adif_action = QtWidgets.QAction(self.translation.get("import_adif_log", "Import ADIF Log..."), self)
+        import_adif_action.triggered.connect(self.import_adif_log)
+        contest_action = QtWidgets.QAction(self.translation.get("contest_mode", "Contest Mode"), self)
+        contest_action.setCheckable(True)
+        contest_action.setChecked(self.contest_mode)
+        contest_action.setShortcut("Ctrl+K")
+        contest_action.toggled.connect(self.toggle_contest_mode)
+        reset_serial_action = QtWidgets.QAction(self.translation.get("reset_serial", "Reset Serial Number..."), self)
+        reset_serial_action.triggered.connect(self.reset_serial)
 
         toolbar.addAction(send_action)
         toolbar.addAction(reset_action)
@@ -436,6 +874,19 @@ class QSOForm(QtWidgets.QMainWindow):
         file_menu.addAction(reset_action)
         file_menu.addAction(config_action)
         file_menu.addAction(tag_action)
+        file_menu.addAction(log_action)
+        file_menu.addAction(session_log_action)
+        file_menu.addAction(live_stats_action)
+        file_menu.addAction(qrz_details_action)
+        file_menu.addAction(bandmap_action)
+        file_menu.addAction(callbook_action)
+        file_menu.addAction(import_adif_action)
+        file_menu.addAction(export_history_action)
+        file_menu.addAction(distance_stats_action)
+        file_menu.addAction(diagnostics_action)
+        file_menu.addSeparator()
+        file_menu.addAction(contest_action)
+        file_menu.addAction(reset_serial_action)
         file_menu.addSeparator()
         file_menu.addAction(exit_action)
 
@@ -472,30 +923,189 @@ class QSOForm(QtWidgets.QMainWindow):
         Update the date and time fields.
         Only update date if empty, and time fields only if not user-set.
         """
-        now = datetime.now()
         now_utc = datetime.now(timezone.utc)
+        updater = self.field_updater
         # Only set date if field is empty
         if not self.qso_date_user_set:
-            self.qso_date_display.setText(now.strftime("%d.%m.%Y"))
+            updater.set_text(self.qso_date_display, now_utc.astimezone().strftime("%d.%m.%Y"))
         # Zeitfelder nur setzen, wenn nicht user-set
         if not self.time_on_user_set:
-            self.time_on_display.setText(now_utc.strftime("%H:%M:%S"))
+            updater.set_text(self.time_on_display, now_utc.strftime("%H:%M:%S"))
         if not self.time_off_user_set:
             time_off_utc = now_utc + timedelta(seconds=20)
-            self.time_off_display.setText(time_off_utc.strftime("%H:%M:%S"))
+            updater.set_text(self.time_off_display, time_off_utc.strftime("%H:%M:%S"))
         # ADIF fields always from display fields
         self.qso_date_adif = now_utc.strftime("%Y%m%d")
-        self.time_on_adif = self.time_on_display.text().replace(":", "")
-        self.time_off_adif = self.time_off_display.text().replace(":", "")
+        self.time_on_adif = updater.text(self.time_on_display).replace(":", "")
+        self.time_off_adif = updater.text(self.time_off_display).replace(":", "")
+
+    def apply_contest_mode(self):
+        """
+        Show only the contest fields (with serial numbers) in contest mode, all fields otherwise.
+        """
+        for name, widget in self.field_widgets.items():
+            visible = name in CONTEST_FIELDS if self.contest_mode else name not in ("STX", "SRX")
+            widget.setVisible(visible)
+            label = self.form_layout.labelForField(widget)
+            if label:
+                label.setVisible(visible)
+        if self.contest_mode:
+            self.stx.setText(self.serials.text())
+            if not self.rst_sent.text():
+                self.update_rst_fields()
+        self.mark_invalid_fields([])
+        self.call.setFocus()
+
+    def toggle_contest_mode(self, checked):
+        self.contest_mode = checked
+        self.config["contest_mode"] = checked
+        save_config(self.config)
+        self.apply_contest_mode()
+        self.statusbar.showMessage(self.translation.get("contest_mode_on" if checked else "contest_mode_off",
+                                                        "Contest mode on" if checked else "Contest mode off"))
+
+    def reset_serial(self):
+        """
+        Start a new contest: the next sent serial number is 001.
+        """
+        reply = QtWidgets.QMessageBox.question(
+            self, self.translation.get("contest_mode", "Contest Mode"),
+            self.translation.get("reset_serial_question", "Start again with serial number 001?"),
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+        if reply == QtWidgets.QMessageBox.Yes:
+            self.serials.reset()
+            self.stx.setText(self.serials.text())
+
+    def contest_enter(self):
+        """
+        Enter key in contest mode (ESM): call -> received serial -> log the QSO.
+        """
+        if not self.contest_mode:
+            return
+        step = esm_step(self.call.text(), self.srx.text())
+        if step == "call":
+            self.call.setFocus()
+        elif step == "exchange":
+            self.srx.setFocus()
+        else:
+            self.log_contest_qso()
+
+    def log_contest_qso(self):
+        """
+        Send the QSO without any dialog: problems are marked in the form, after handing it
+        to the pipeline only the per-QSO fields are cleared and the next serial number is set.
+        """
+        start = time.perf_counter()
+        self.update_datetime()
+        if not self.check_qso_fields():
+            return
+        record = self.collect_qso_record()
+        if not self.pipeline.submit(record):
+            self.statusbar.showMessage(self.translation.get("pipeline_busy", "Still sending earlier QSOs, please retry."))
+            return
+        self.serials.advance()
+        self.reset_contest_fields()
+        metrics.observe("contest_entry_seconds", time.perf_counter() - start)
+        self.statusbar.showMessage(self.translation.get("contest_qso_logged", "{call} logged, serial {serial}").format(
+            call=record["CALL"], serial=record["STX"]))
+
+    def reset_contest_fields(self):
+        """
+        Light reset after a contest QSO: band, frequency, mode and RST stay.
+        """
+        self.field_updater.flush()
+        for widget in (self.call, self.srx, self.comment, self.name, self.qth, self.gridsquare,
+                       self.country, self.dxcc):
+            widget.clear()
+        self.stx.setText(self.serials.text())
+        self.update_rst_fields()
+        self.mark_invalid_fields([])
+        self.qso_date_user_set = False
+        self.time_on_user_set = False
+        self.time_off_user_set = False
+        self.show_callsign_tags([])
+        self.call.setFocus()
+
+    def form_values(self):
+        """
+        Current text of all form fields by ADIF field name (including pending updates).
+        """
+        return {name: self.field_updater.text(widget) for name, widget in self.field_widgets.items()}
+
+    def problem_message(self, problem):
+        return self.translation.get(problem.key, MESSAGES[problem.key]).format(**problem.params)
+
+    def validate_qso_fields(self):
+        """
+        Check all fields; returns (widget, message) for every problem.
+        """
+        self.field_updater.flush()
+        problems = self.validator.validate(self.form_values(), self.contest_mode)
+        return [(self.field_widgets[problem.field], self.problem_message(problem)) for problem in problems]
+
+    def check_qso_fields(self):
+        """
+        Validate before sending: all problems are marked in the form and listed in the statusbar
+        at once, the cursor goes to the first one. Returns True if the QSO can be sent.
+        """
+        problems = self.validate_qso_fields()
+        self.mark_invalid_fields(problems)
+        if problems:
+            problems[0][0].setFocus()
+            self.statusbar.showMessage(" | ".join(message for _, message in problems))
+            return False
+        return True
+
+    def on_field_changed(self, name):
+        """
+        Recheck a changed field; while it is being typed in, a new problem is not marked yet.
+        """
+        widget = self.field_widgets[name]
+        fields = self.validator.update(name, self.form_values(), self.contest_mode)
+        self.show_field_problems(fields, editing=name if widget.hasFocus() else None)
+
+    def show_field_problems(self, fields, editing=None):
+        """
+        Update the marks of fields from the validator. Empty required fields are only marked
+        by a send attempt, so a new QSO does not start all red.
+        """
+        for name in fields:
+            widget = self.field_widgets[name]
+            problem = self.validator.problems.get(name)
+            marked = bool(widget.styleSheet())
+            if problem is None:
+                if marked:
+                    self.set_field_mark(widget, None)
+            elif marked or (name != editing and not problem.key.endswith("_required")):
+                self.set_field_mark(widget, self.problem_message(problem))
+
+    def set_field_mark(self, widget, message):
+        widget.setStyleSheet("border: 2px solid #e53935;" if message else "")
+        widget.setToolTip(message or "")
+
+    def mark_invalid_fields(self, problems):
+        """
+        Mark the fields of the (widget, message) problems, clear all other marks.
+        """
+        messages = dict(problems)
+        for widget in self.field_widgets.values():
+            if widget in messages:
+                self.set_field_mark(widget, messages[widget])
+            elif widget.styleSheet():
+                self.set_field_mark(widget, None)
 
     def reset_fields(self):
         """
         Reset all input fields to their default state.
         """
+        self.field_updater.flush()
         for widget in [self.call, self.band, self.freq, self.mode, self.rst_sent, self.rst_rcvd,
                        self.gridsquare, self.comment, self.name, self.qth, self.tx_pwr,
-                       self.country, self.operator, self.dxcc]:
+                       self.country, self.operator, self.dxcc, self.srx]:
             widget.clear()
+        self.mark_invalid_fields([])
+        if self.contest_mode:
+            self.stx.setText(self.serials.text())
         self.station_callsign.setText(self.config.get("station_callsign", ""))
         self.qso_date_user_set = False
         self.time_on_user_set = False
@@ -511,98 +1121,80 @@ class QSOForm(QtWidgets.QMainWindow):
         """
         Convert frequency to ADIF format.
         """
-        # Converts "7.012.620" to "7.01262"
-        freq_parts = self.freq.text().split(".")
-        if len(freq_parts) == 3:
-            return f"{freq_parts[0]}.{freq_parts[1]}{freq_parts[2]}"
-        return self.freq.text().replace(",", ".")  # Fallback
+        return adif_freq(self.freq.text())
 
     def adif_safe(self, text):
         """
         Convert text to ADIF-safe ASCII: replaces German umlauts and ß, removes accents.
         """
-        text = text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue")
-        text = text.replace("Ä", "Ae").replace("Ö", "Oe").replace("Ü", "Ue")
-        text = text.replace("ß", "ss")
-        # Remove all other accents
-        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
-        return text
+        return adif_safe(text)
+
+    def collect_qso_record(self):
+        """
+        Collect the form fields as a plain QSO record (ADIF field name -> text).
+        """
+        self.field_updater.flush()
+        return {
+            "CALL": self.call.text(),
+            "QSO_DATE": self.qso_date_adif,
+            "TIME_ON": self.time_on_adif,
+            "TIME_OFF": self.time_off_adif,
+            "BAND": self.band.text(),
+            "FREQ": self.adif_freq_value(),
+            "MODE": self.mode.text(),
+            "RST_SENT": self.rst_sent.text(),
+            "RST_RCVD": self.rst_rcvd.text(),
+            "GRIDSQUARE": self.gridsquare.text(),
+            "COMMENT": self.comment.text(),
+            "NAME": self.name.text(),
+            "QTH": self.qth.text(),
+            "TX_PWR": self.tx_pwr.text(),
+            "COUNTRY": self.country.text(),
+            "OPERATOR": self.operator.text(),
+            "STATION_CALLSIGN": self.station_callsign.text(),
+            "DXCC": self.dxcc.text(),
+            "STX": self.stx.text() if self.contest_mode else "",
+            "SRX": self.srx.text() if self.contest_mode else "",
+            "CONTEST_ID": self.config.get("contest_id", "") if self.contest_mode else "",
+        }
 
     def send_qso(self):
         """
-        Send the QSO data to WLGate via UDP.
+        Hand the QSO to the pipeline, which sends it to WLGate via UDP.
         """
-        self.statusbar.showMessage(self.translation["sending_qso"])
-        if not self.call.text().strip():
-            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation["call_required"])
-            self.statusbar.showMessage(self.translation["call_required"])
-            return
-        if not self.band.text().strip():
-            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation["band_required"])
-            self.statusbar.showMessage(self.translation["band_required"])
+        if self.contest_mode:
+            self.log_contest_qso()
             return
-        if not self.mode.text().strip():
-            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation["mode_required"])
-            self.statusbar.showMessage(self.translation["mode_required"])
+        if not self.check_qso_fields():
             return
-        if not self.rst_sent.text().strip():
-            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation["rst_sent_required"])
-            self.statusbar.showMessage(self.translation["rst_sent_required"])
+        record = self.collect_qso_record()
+        if not self.pipeline.submit(record):
+            busy = self.translation.get("pipeline_busy", "Still sending earlier QSOs, please retry.")
+            QtWidgets.QMessageBox.warning(self, self.translation["error"], busy)
+            self.statusbar.showMessage(busy)
             return
-        if not self.rst_rcvd.text().strip():
-            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation["rst_rcvd_required"])
-            self.statusbar.showMessage(self.translation["rst_rcvd_required"])
-            return
-
+        self.reset_fields()
+        self.statusbar.showMessage(self.translation["sending_qso"])  # Result from on_qso_done/on_qso_failed
 
-        def adif_field(name, value):
-            """
-           Build ADIF field name value pair.
-            """
-            # Remove German umlauts and ß
-            value = self.adif_safe(value.strip())
-            return f"<{name}:{len(value)}>{value}" if value else ""
-
-        adif = (
-            adif_field("CALL", self.call.text()) +
-            adif_field("QSO_DATE", self.qso_date_adif) +
-            adif_field("TIME_ON", self.time_on_adif) +
-            adif_field("TIME_OFF", self.time_off_adif) +
-            adif_field("BAND", self.band.text()) +
-            adif_field("FREQ", self.adif_freq_value()) +
-            adif_field("MODE", self.mode.text()) +
-            adif_field("RST_SENT", self.rst_sent.text()) +
-            adif_field("RST_RCVD", self.rst_rcvd.text()) +
-            adif_field("GRIDSQUARE", self.gridsquare.text()) +
-            adif_field("COMMENT", self.comment.text()) +
-            adif_field("NAME", self.name.text()) +
-            adif_field("QTH", self.qth.text()) +
-            adif_field("TX_PWR", self.tx_pwr.text()) +
-            adif_field("COUNTRY", self.country.text()) +
-            adif_field("OPERATOR", self.operator.text()) +
-            adif_field("STATION_CALLSIGN", self.station_callsign.text()) +
-            adif_field("DXCC", self.dxcc.text()) +
-            "<EOR>"
-        )
+        if self.flrig_worker: # Poll FLRig for current values
+            self.flrig_worker.poll_now()
 
+    def deliver_qso(self, record, adif):
+        """
+        Deliver stage of the pipeline (runs in its thread): send the QSO to WLGate, then hand it
+        to the additional destinations and the sync bus. Raises if WLGate cannot be reached.
+        """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.sendto(adif.encode('ascii', errors='replace'), (self.config.get("wlgate_host", "127.0.0.1"), self.config.get("wlgate_port", 2237)))
-            sock.close()
- 
-            # QtWidgets.QMessageBox.information(self, self.translation["success"], self.translation["qso_sent"])
-            AutoCloseInfoBox(self, self.translation["success"], self.translation["qso_sent"], timeout=3000).exec_()
-            self.statusbar.showMessage(self.translation["qso_sent"])
-            self.reset_fields()
-            log_info("QSO sent to WLGate.")
-            self.append_sent_qso(adif)
+            self.send_to_wlgate(adif)
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, self.translation["error"], f"{self.translation['send_error']}: {e}")
-            self.statusbar.showMessage(f"{self.translation['send_error']}: {e}")
-            log_error(f"WLGate send error: {e}")
-
-        if self.flrig_worker: # Poll FLRig for current values
-            self.flrig_worker.poll_now()
+            metrics.inc("qso_send_errors_total")
+            log_error(f"WLGate send error for {record.get('CALL', '')}: {e}", audit=True)
+            raise
+        log_info(f"QSO {record.get('CALL', '')} sent to WLGate.", audit=True)
+        self.destinations.submit(record, adif)  # Additional destinations, asynchronous
+        sync_bus = self.sync_bus
+        if sync_bus:
+            sync_bus.publish(record)
             
     def add_flrig_debug_field(self):
         """
@@ -644,6 +1236,8 @@ class QSOForm(QtWidgets.QMainWindow):
         self.form_layout.labelForField(self.mode).setText(self.translation["mode"])
         self.form_layout.labelForField(self.rst_sent).setText(self.translation["rst_sent"])
         self.form_layout.labelForField(self.rst_rcvd).setText(self.translation["rst_rcvd"])
+        self.form_layout.labelForField(self.stx).setText(self.translation.get("stx", "Serial sent"))
+        self.form_layout.labelForField(self.srx).setText(self.translation.get("srx", "Serial rcvd"))
         self.form_layout.labelForField(self.gridsquare).setText(self.translation["gridsquare"])
         self.form_layout.labelForField(self.comment).setText(self.translation["comment"])
         self.form_layout.labelForField(self.name).setText(self.translation["name"])
@@ -680,6 +1274,10 @@ class QSOForm(QtWidgets.QMainWindow):
             self.station_callsign.setText(self.config.get("station_callsign", ""))
             self.statusbar.showMessage(self.translation["config_saved"])
             self.start_flrig_worker()
+            self.start_metrics_server()
+            self.start_destinations()
+            self.start_sync_bus()
+            self.start_dx_cluster()
             # remove Debugfield, if exist
             if self.form_layout.rowCount() > 0:
                 label_item = self.form_layout.itemAt(0, QtWidgets.QFormLayout.LabelRole)
@@ -715,11 +1313,8 @@ class QSOForm(QtWidgets.QMainWindow):
             return
         tags = []
         try:
-            tags_file = user_data_path("callsign_tags.json")
-            if os.path.exists(tags_file):
-                with open(tags_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                tags = data.get(callsign, [])
+            with metrics.timer("tags_load_seconds"):
+                tags = get_callsign_tags(callsign)
         except Exception as e:
             log_error(f"Error loading callsign tags: {e}")
         self.show_callsign_tags(tags)
@@ -734,31 +1329,212 @@ class QSOForm(QtWidgets.QMainWindow):
     def extract_core_callsign(self, call):
         """
         Extract the core callsign from a given callsign.
-        Removes all prefixes and suffixes like /P, /M, /AM, /MM /T.
-        Examples:
-            HB9HNT/P   -> HB9HNT
-            LA/DB123/P -> DB123
-            DL/W2AEE   -> W2AEE
-            DL/W2AEE/M -> W2AEE
-            HB9HNT     -> HB9HNT
-        """
-        import re
-        call = call.strip().upper()
-        # Remove all prefixes (everything before the last slash)
-        core = re.split(r"/", call)
-        if len(core) > 1 and core[-1] in ("P", "M", "AM", "MM", "T"):
-            # If the last segment is a known suffix, take the one before
-            core_call = core[-2]
-        else:
-            core_call = core[-1]
+        See src.dxcc.extract_core_callsign.
+        """
+        core_call = extract_core_callsign(call)
         log_info(f"Extracted core callsign: {core_call}")
         return core_call
 
+    def lookup_callbook(self, call):
+        """
+        Look up the callsign (or its core callsign) in the local callbook.
+        Fills the fields and returns True on a hit.
+        """
+        if not self.callbook.is_available():
+            return False
+        found_call = call
+        data = self.callbook.lookup(call)
+        if not data:
+            found_call = self.extract_core_callsign(call)
+            data = self.callbook.lookup(found_call) if found_call != call else None
+        if not data:
+            metrics.inc("callbook_misses_total")
+            return False
+        metrics.inc("callbook_hits_total")
+        log_info(f"Callbook: Data found for '{found_call}': {data}")
+        self.fill_lookup_fields(data, keep_country=True)
+        self.statusbar.showMessage(self.translation.get("callbook_data_ok", "Local callbook data for {call}.").format(call=found_call))
+        self.comment.setFocus()
+        self.load_and_show_callsign_tags()
+        return True
+
+    def fill_lookup_fields(self, data, keep_country=False):
+        """
+        Queue name, QTH, country and locator from a lookup result (empty dict clears them).
+        keep_country keeps the offline DXCC country if the result has none.
+        """
+        updater = self.field_updater
+        updater.set_text(self.name, data.get("name", ""))
+        updater.set_text(self.qth, data.get("qth", ""))
+        if data.get("country") or not keep_country:
+            updater.set_text(self.country, data.get("country", ""))
+        updater.set_text(self.gridsquare, data.get("gridsquare", ""))
+
+    def import_callbook(self):
+        """
+        Import a CSV or ADIF file into the local callbook in a background thread.
+        """
+        if self.callbook_import_worker and self.callbook_import_worker.isRunning():
+            return
+        filename, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, self.translation.get("import_callbook", "Import Callbook..."), "",
+            "Callbook (*.csv *.adi *.adif);;All Files (*)"
+        )
+        if not filename:
+            return
+        self.callbook.reload()  # Release the read connection during the import
+        progress = QtWidgets.QProgressDialog(
+            self.translation.get("importing_callbook", "Importing callbook..."),
+            self.translation.get("cancel", "Cancel"), 0, 0, self)
+        progress.setWindowModality(QtCore.Qt.NonModal)
+        worker = CallbookImportWorker(filename)
+        worker.progress.connect(lambda count: progress.setLabelText(
+            self.translation.get("callbook_import_progress", "{count} entries imported...").format(count=count)))
+        progress.canceled.connect(lambda: setattr(worker, "cancelled", True))
+
+        def on_finished(count, error):
+            progress.close()
+            self.callbook.reload()
+            self.pipeline_callbook.lookup.cache_clear()
+            if error:
+                self.statusbar.showMessage(f"{self.translation['error']}: {error}")
+            else:
+                self.statusbar.showMessage(
+                    self.translation.get("callbook_imported", "{count} callbook entries imported.").format(count=count))
+
+        worker.finished_import.connect(on_finished)
+        self.callbook_import_worker = worker
+        worker.start()
+        self.workers.track(worker)
+        progress.show()
+
+    def import_adif_log(self):
+        """
+        Import an existing ADIF log (LoTW, QRZ logbook, WaveLog...) into the history for worked-before data.
+        """
+        if self.adif_import_worker and self.adif_import_worker.isRunning():
+            return
+        filename, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, self.translation.get("import_adif_log", "Import ADIF Log..."), "",
+            "ADIF Files (*.adi *.adif);;All Files (*)"
+        )
+        if not filename:
+            return
+        progress = QtWidgets.QProgressDialog(
+            self.translation.get("importing_adif_log", "Importing ADIF log..."),
+            self.translation.get("cancel", "Cancel"), 0, 0, self)
+        progress.setWindowModality(QtCore.Qt.NonModal)
+        worker = AdifImportWorker(filename)
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        worker.progress.connect(on_progress)
+        progress.canceled.connect(lambda: setattr(worker, "cancelled", True))
+
+        def on_finished(imported, duplicates, error):
+            progress.close()
+            if error:
+                self.statusbar.showMessage(f"{self.translation['error']}: {error}")
+                return
+            self.statusbar.showMessage(self.translation.get(
+                "adif_log_imported", "{count} QSOs imported, {duplicates} duplicates skipped."
+            ).format(count=imported, duplicates=duplicates))
+            threading.Thread(target=self.load_worked_index, daemon=True).start()
+
+        worker.finished_import.connect(on_finished)
+        self.adif_import_worker = worker
+        worker.start()
+        self.workers.track(worker)
+        progress.show()
+
+    def export_history(self):
+        """
+        Export the filtered QSO history (archive and current session) to ADIF or CSV in a background thread.
+        """
+        if self.history_export_worker and self.history_export_worker.isRunning():
+            return
+        dlg = HistoryExportDialog(self, translation=self.translation)
+        if dlg.exec_() != QtWidgets.QDialog.Accepted:
+            return
+        fmt = dlg.get_format()
+        file_filter = "CSV Files (*.csv);;All Files (*)" if fmt == "csv" else "ADIF Files (*.adi);;All Files (*)"
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, self.translation.get("export_history", "Export History..."), "", file_filter
+        )
+        if not filename:
+            return
+        progress = QtWidgets.QProgressDialog(
+            self.translation.get("exporting_history", "Exporting history..."),
+            self.translation.get("cancel", "Cancel"), 0, 0, self)
+        progress.setWindowModality(QtCore.Qt.NonModal)
+        worker = HistoryExportWorker(filename, dlg.get_filter(), fmt, sent_qsos_file=self.SENT_QSOS_FILE)
+
+        def on_progress(done, total):
+            progress.setMaximum(max(total, done))
+            progress.setValue(done)
+
+        worker.progress.connect(on_progress)
+        progress.canceled.connect(lambda: setattr(worker, "cancelled", True))
+
+        def on_finished(count, error):
+            progress.close()
+            if error:
+                self.statusbar.showMessage(f"{self.translation['error']}: {error}")
+            elif count < 0:
+                self.statusbar.showMessage(self.translation.get("history_export_cancelled", "History export cancelled."))
+            else:
+                self.statusbar.showMessage(
+                    self.translation.get("history_exported", "{count} QSOs exported.").format(count=count))
+
+        worker.finished_export.connect(on_finished)
+        self.history_export_worker = worker
+        worker.start()
+        self.workers.track(worker)
+        progress.show()
+
+    def show_distance_stats(self):
+        """
+        Compute QSO count, total and mean distance and ODX over the whole history in a background thread.
+        """
+        if self.distance_stats_worker and self.distance_stats_worker.isRunning():
+            return
+        station_locator = self.config.get("station_locator", "")
+        if locator_to_latlon(station_locator) is None:
+            QtWidgets.QMessageBox.warning(self, self.translation["error"], self.translation.get(
+                "station_locator_required", "Please enter your own locator in the settings."))
+            return
+        self.statusbar.showMessage(self.translation.get("computing_distance_stats", "Computing distance statistics..."))
+        worker = DistanceStatsWorker(station_locator, sent_qsos_file=self.SENT_QSOS_FILE)
+
+        def on_finished(stats, error):
+            if error or stats is None:
+                self.statusbar.showMessage(f"{self.translation['error']}: {error}")
+                return
+            self.statusbar.clearMessage()
+            QtWidgets.QMessageBox.information(
+                self, self.translation.get("distance_stats", "Distance Statistics..."),
+                self.translation.get("distance_stats_text",
+                                     "QSOs with locator: {qsos}\nTotal: {total} km\nAverage: {mean} km\n"
+                                     "ODX: {odx} km ({locator})").format(
+                    qsos=stats.qsos, total=f"{stats.total_km:,.0f}", mean=round(stats.mean_km),
+                    odx=round(stats.odx_km), locator=stats.odx_locator or "-"))
+
+        worker.finished_stats.connect(on_finished)
+        self.distance_stats_worker = worker
+        worker.start()
+        self.workers.track(worker)
+
     def lookup_qrz_gui(self):
         """
         Start QRZ.com lookup in a separate thread to avoid blocking the GUI.
         """
         call = self.call.text().strip().upper()
+        if self.qrz_details_dialog and call:
+            self.load_qrz_details(call)  # Only while the detail panel is open
+        if call and self.lookup_callbook(call):
+            return
         log_info(f"QRZ Lookup: Starting for input '{call}'")
         if not call or not self.config.get("qrz_username") or not self.config.get("qrz_password"):
             log_info("QRZ Lookup: Skipped (missing call or credentials)")
@@ -767,16 +1543,69 @@ class QSOForm(QtWidgets.QMainWindow):
             return
 
         self.statusbar.showMessage(self.translation["qrz_query"].format(call=call))
-        # Start worker thread
+        self.start_qrz_worker(call, self.handle_qrz_result)
+
+    def start_qrz_worker(self, call, handler):
+        """
+        Start a QRZ.com lookup in the background; a lookup still running is replaced.
+        """
+        self.workers.retire(self.qrz_worker)
         self.qrz_worker = QRZLookupWorker(
             call,
             self.config.get("qrz_username"),
             self.config.get("qrz_password"),
-            self.qrz_session_key
+            self.qrz_session_key,
+            self.config.get("qrz_url", QRZ_URL)
         )
-        self.qrz_worker.result_ready.connect(self.handle_qrz_result)
+        self.qrz_worker.result_ready.connect(handler)
+        self.workers.track(self.qrz_worker)
         self.qrz_worker.start()
         
+    def open_qrz_details(self):
+        """
+        Show the non-modal QRZ.com detail panel for the current callsign; details and image are
+        only fetched while it is open.
+        """
+        if not self.config.get("qrz_username") or not self.config.get("qrz_password"):
+            self.statusbar.showMessage(self.translation["qrz_skipped"])
+            return
+        if self.qrz_details_dialog is None:
+            self.qrz_details_dialog = QRZDetailsDialog(self, self.translation)
+            self.qrz_details_dialog.finished.connect(self.close_qrz_details)
+        self.qrz_details_dialog.show()
+        self.qrz_details_dialog.raise_()
+        self.load_qrz_details(self.call.text().strip().upper())
+
+    def close_qrz_details(self):
+        self.workers.retire(self.qrz_details_worker)
+        self.qrz_details_worker = None
+        self.qrz_details_dialog = None
+
+    def load_qrz_details(self, call):
+        """
+        Fetch the extended record of call for the detail panel; a fetch still running is replaced.
+        """
+        dialog = self.qrz_details_dialog
+        if dialog is None or not call or call == dialog.call:
+            return
+        if self.qrz_cache is None:
+            self.qrz_cache = DiskCache(QRZ_CACHE_DIR, self.config.get("qrz_cache_mb", DEFAULT_CACHE_MB) * 1024 * 1024)
+        dialog.show_loading(call)
+        self.workers.retire(self.qrz_details_worker)
+        self.qrz_details_worker = QRZDetailsWorker(
+            call, self.config.get("qrz_username"), self.config.get("qrz_password"), self.qrz_session_key,
+            self.qrz_cache, self.config.get("qrz_url", QRZ_URL))
+        self.qrz_details_worker.details_ready.connect(self.handle_qrz_details)
+        self.qrz_details_worker.image_ready.connect(dialog.show_image)
+        self.workers.track(self.qrz_details_worker)
+        self.qrz_details_worker.start()
+
+    def handle_qrz_details(self, details, call, session_key):
+        if session_key:
+            self.qrz_session_key = session_key
+        if self.qrz_details_dialog:
+            self.qrz_details_dialog.show_details(details, call)
+
     def handle_qrz_result(self, data, call, session_key):
         """
         Handle the result from the QRZ.com lookup worker.
@@ -803,33 +1632,20 @@ class QSOForm(QtWidgets.QMainWindow):
             if core_call != call:
                 self.statusbar.showMessage(self.translation["qrz_query"].format(call=core_call))
                 # Start another worker for the core call
-                self.qrz_worker = QRZLookupWorker(
-                    core_call,
-                    self.config.get("qrz_username"),
-                    self.config.get("qrz_password"),
-                    self.qrz_session_key
-                )
-                self.qrz_worker.result_ready.connect(self.handle_qrz_result_core)
-                self.qrz_worker.start()
+                self.start_qrz_worker(core_call, self.handle_qrz_result_core)
                 return
             else:
                 log_info("QRZ Lookup: Core callsign is identical to input, not retrying.")
 
         if data:
             log_info(f"QRZ Lookup: Data accepted for '{call}': {data}")
-            self.name.setText(data.get("name", ""))
-            self.qth.setText(data.get("qth", ""))
-            self.country.setText(data.get("country", ""))
-            self.gridsquare.setText(data.get("gridsquare", ""))
+            self.fill_lookup_fields(data)
             self.statusbar.showMessage(self.translation["qrz_data_ok"].format(call=call))
         else:
             log_info(f"QRZ Lookup: No valid data found for '{call}' or its core callsign.")
             self.statusbar.showMessage(self.translation.get("qrz_not_found", "Callsign not found on QRZ"))
-            # Clear fields if no data found
-            self.name.clear()
-            self.qth.clear()
-            self.country.clear()
-            self.gridsquare.clear()
+            self.fill_lookup_fields({})  # Clear fields if no data found
+            self.update_dxcc_info()  # Keep offline country info
         self.comment.setFocus()
         self.load_and_show_callsign_tags()
 
@@ -840,19 +1656,13 @@ class QSOForm(QtWidgets.QMainWindow):
         self.qrz_session_key = session_key
         if data:
             log_info(f"QRZ Lookup: Data accepted for core callsign '{call}': {data}")
-            self.name.setText(data.get("name", ""))
-            self.qth.setText(data.get("qth", ""))
-            self.country.setText(data.get("country", ""))
-            self.gridsquare.setText(data.get("gridsquare", ""))
+            self.fill_lookup_fields(data)
             self.statusbar.showMessage(self.translation["qrz_data_ok"].format(call=call))
         else:
             log_info(f"QRZ Lookup: No valid data found for core callsign '{call}'.")
             self.statusbar.showMessage(self.translation.get("qrz_not_found", "Callsign not found on QRZ"))
-            # Clear fields if no data found
-            self.name.clear()
-            self.qth.clear()
-            self.country.clear()
-            self.gridsquare.clear()            
+            self.fill_lookup_fields({})  # Clear fields if no data found
+            self.update_dxcc_info()  # Keep offline country info
         self.comment.setFocus()
         self.load_and_show_callsign_tags()
             
@@ -869,61 +1679,53 @@ class QSOForm(QtWidgets.QMainWindow):
         """
         Show a dialog with the status message history.
         """
-        dlg = QtWidgets.QDialog(self)
-        dlg.setWindowTitle(self.translation.get("status_history", "Status History"))
-        layout = QtWidgets.QVBoxLayout(dlg)
-        text = QtWidgets.QTextEdit("\n".join(self.status_history))
-        text.setReadOnly(True)
-        layout.addWidget(text)
-        btn_copy = QtWidgets.QPushButton(self.translation.get("copy_to_clipboard", "Copy to clipboard"))
-        btn_copy.clicked.connect(lambda: QtWidgets.QApplication.clipboard().setText(text.toPlainText()))
-        layout.addWidget(btn_copy)
+        # Snapshot, so new status messages do not change the deque while the view reads it
+        history = list(self.status_history)
+        dlg = LogViewerDialog(
+            self,
+            translation=self.translation,
+            source_factory=lambda: reversed(history),
+            title=self.translation.get("status_history", "Status History"),
+            show_level=False,
+        )
+        dlg.exec_()
+
+    def open_log_viewer(self):
+        """
+        Show the log files, newest entries first.
+        """
+        dlg = LogViewerDialog(self, translation=self.translation)
         dlg.exec_()
 
     def save_session_history_adif(self):
         """
-        Save all sent QSOs of this session as an ADIF file in data/historie with a localized timestamped filename.
-        Keep only the 100 most recent history files in the directory.
+        Append all sent QSOs of this session to the compressed history archive in data/historie.
+        The oldest segments are removed when the archive exceeds history_max_mb.
         """
-        history_dir = user_data_path(os.path.join("", "historie"))
-        os.makedirs(history_dir, exist_ok=True)
-
-        fmt = self.translation.get("history_filename_format", "%Y-%m-%d_%H-%M-%S_history.adi")
-        now = datetime.now()
-        filename = now.strftime(fmt)
-        full_path = os.path.join(history_dir, filename)
-
-        if os.path.exists(self.SENT_QSOS_FILE):
-            try:
-                with open(self.SENT_QSOS_FILE, "r", encoding="utf-8") as src, open(full_path, "w", encoding="utf-8") as dst:
-                    dst.write(src.read())
-            except Exception as e:
-                log_error(f"Could not write session history ADIF: {e}")
-
-        # --- Keep only the 100 newest history files ---
-        try:
-            files = [os.path.join(history_dir, f) for f in os.listdir(history_dir) if f.endswith(".adi")]
-            files.sort(key=lambda x: os.path.getmtime(x))  # oldest first
-            limit = 100
-            num_to_delete = len(files) - limit
-            if num_to_delete > 0:
-                for old_file in files[:num_to_delete]:
-                    try:
-                        os.remove(old_file)
-                    except Exception as e:
-                        log_error(f"Could not remove old history file {old_file}: {e}")
-                # log userinfo
-                log_info(self.translation["history_cleanup_info"].format(count=num_to_delete, limit=limit))
-        except Exception as e:
-            log_error(f"Could not clean up history directory: {e}")
+        max_mb = self.config.get("history_max_mb", DEFAULT_MAX_MB)
+        archived, deleted, deleted_qsos = save_session_history(self.SENT_QSOS_FILE, max_mb=max_mb)
+        if deleted:
+            # log userinfo
+            log_info(self.translation.get(
+                "history_cleanup_info",
+                "{count} old history segments ({qsos} QSOs) were deleted to keep the archive below {limit} MB."
+            ).format(count=deleted, qsos=deleted_qsos, limit=max_mb))
 
     def closeEvent(self, event):
         """
         Handle the window close event.
         """
-        if self.flrig_worker:
-            self.flrig_worker.running = False
-            self.flrig_worker.wait()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        # Drain the pipeline first: its deliver stage still hands QSOs to the destinations and the sync bus
+        if self.pipeline and not self.pipeline.stop(SHUTDOWN_DEADLINE_SECONDS):
+            log_error(f"QSO pipeline did not finish, {self.pipeline.pending()} QSOs not processed.")
+        if self.destinations:
+            self.workers.run_in_background(self.destinations.stop, "destinations-stop")
+        # All workers wind down in parallel while the session is saved
+        self.workers.request_stop_all()
+        if self.adif_import_worker and self.adif_import_worker.isRunning():
+            self.adif_import_worker.wait()  # Writes to the history archive, like the session save below
         
         # Write History adif anyways.
         self.save_session_history_adif()
@@ -945,4 +1747,11 @@ class QSOForm(QtWidgets.QMainWindow):
                 if reply == QtWidgets.QMessageBox.Yes:
                     self.export_sent_qsos()
                 self.clear_sent_qsos_file()
+        dump_active_session()  # Write profiling reports if profiling is enabled
+        # Wait for the workers out of sight, within one deadline. Threads still blocked in a
+        # (timed) call are waited for anyway, a QThread must not be destroyed while running.
+        self.hide()
+        for worker in self.workers.shutdown():
+            if isinstance(worker, QThread):
+                worker.wait()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""
+Staged QSO processing: enrich -> validate -> dedupe -> encode -> deliver -> archive,
+followed by optional plugin stages.
+
+Every stage runs in its own thread behind a bounded queue, so the GUI only captures the form
+and hands the record over. A full first queue refuses the QSO (backpressure) instead of
+blocking the operator. Plugin stages run after the archive stage: they never delay delivery,
+and a plugin that falls behind loses QSOs (counted) rather than slowing the pipeline.
+
+Plugins are Python files in data/plugins with a function create_stage(config) returning a
+Stage (or a list of stages), e.g.:
+
+    from src.qso_pipeline import Stage
+
+    class PrintStage(Stage):
+        name = "print"
+
+        def process(self, job):
+            print(job.record["CALL"])
+
+    def create_stage(config):
+        return PrintStage()
+"""
+
+import glob
+import importlib.util
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from PyQt5 import QtCore
+from src import metrics
+from src.adif import encode_record
+from src.adif_import import dedupe_key
+from src.callbook_db import CallbookDB
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+from src.worker_lifecycle import BackgroundTask
+
+QUEUE_SIZE = 50
+PLUGIN_QUEUE_SIZE = 200
+PLUGIN_DIR = user_data_path("plugins")
+DEDUPE_MEMORY = 5000  # Dedupe keys remembered per session
+
+REQUIRED_FIELDS = ("CALL", "QSO_DATE", "TIME_ON", "BAND", "MODE")
+
+def send_to_wlgate(adif, host="127.0.0.1", port=2237):
+    """
+    Send one ADIF record to WLGate via UDP; raises on network errors.
+    """
+    with metrics.timer("wlgate_send_seconds"):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.sendto(adif.encode("ascii", errors="replace"), (host, port))
+        finally:
+            sock.close()
+    metrics.inc("qso_sent_total")
+
+class StageError(Exception):
+    """
+    Raised by a stage to reject a QSO; the message is shown to the operator.
+    """
+
+class QSOJob:
+    """
+    One QSO travelling through the pipeline.
+    """
+    __slots__ = ("record", "adif", "submitted", "timings")
+
+    def __init__(self, record):
+        self.record = record
+        self.adif = ""
+        self.submitted = time.perf_counter()
+        self.timings = {}  # stage name -> seconds
+
+class Stage:
+    """
+    Base class of a pipeline stage. process() changes the job in place or raises StageError.
+    """
+    name = "stage"
+
+    def process(self, job):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class EnrichStage(Stage):
+    """
+    Fill empty country/DXCC from the offline resolver and name/QTH/locator from the local callbook.
+    """
+    name = "enrich"
+
+    def __init__(self, get_resolver, callbook=None):
+        self.get_resolver = get_resolver  # Callable, the resolver is loaded in the background
+        self.callbook = callbook if callbook is not None else CallbookDB()  # Own connection for this thread
+
+    def process(self, job):
+        record = job.record
+        resolver = self.get_resolver()
+        if resolver and not (record.get("COUNTRY") and record.get("DXCC")):
+            info = resolver.resolve(record["CALL"])
+            if info:
+                record["COUNTRY"] = record.get("COUNTRY") or info.country
+                record["DXCC"] = record.get("DXCC") or info.dxcc
+        if not (record.get("NAME") and record.get("QTH") and record.get("GRIDSQUARE")):
+            data = self.callbook.lookup(record["CALL"].upper()) or {}
+            for field, key in (("NAME", "name"), ("QTH", "qth"), ("GRIDSQUARE", "gridsquare")):
+                if not record.get(field) and data.get(key):
+                    record[field] = data[key]
+
+    def close(self):
+        self.callbook.reload()
+
+class ValidateStage(Stage):
+    """
+    Reject records without the fields every logbook needs.
+    """
+    name = "validate"
+
+    def process(self, job):
+        missing = [field for field in REQUIRED_FIELDS if not job.record.get(field, "").strip()]
+        if missing:
+            raise StageError(f"Missing fields: {', '.join(missing)}")
+
+class DedupeStage(Stage):
+    """
+    Reject a QSO that was already sent in this session (same call, date, minute, band and mode).
+    """
+    name = "dedupe"
+
+    def __init__(self, memory=DEDUPE_MEMORY):
+        self.keys = set()
+        self.order = deque()
+        self.memory = memory
+
+    def process(self, job):
+        key = dedupe_key(job.record)
+        if key in self.keys:
+            raise StageError(f"Duplicate QSO: {job.record['CALL']}")
+        self.keys.add(key)
+        self.order.append(key)
+        if len(self.order) > self.memory:
+            self.keys.discard(self.order.popleft())
+
+    def forget(self, record):
+        """
+        Allow a record again, e.g. when a later stage failed and the operator retries it.
+        """
+        self.keys.discard(dedupe_key(record))
+
+class EncodeStage(Stage):
+    name = "encode"
+
+    def process(self, job):
+        job.adif = encode_record(job.record)
+
+class DeliverStage(Stage):
+    """
+    Hand the encoded QSO to a delivery function (WLGate, destinations, sync bus); raises on failure.
+    """
+    name = "deliver"
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def process(self, job):
+        self.deliver(job.record, job.adif)
+
+class ArchiveStage(Stage):
+    """
+    Append the sent QSO to the session ADIF file through an archive function
+    (SessionLogModel.archive_record, the owner of that file).
+    """
+    name = "archive"
+
+    def __init__(self, archive):
+        self.archive = archive
+
+    def process(self, job):
+        self.archive(job.record, job.adif)
+
+class ResendTask(BackgroundTask):
+    """
+    Send QSOs from the session log again (e.g. after editing them) with the deliver function
+    of the pipeline, off the GUI thread. Dedupe and archive are skipped: the QSOs are already
+    in the session file. Stops at the first failed delivery.
+    """
+    resent = QtCore.pyqtSignal(int, str)  # QSOs sent, error message
+
+    def __init__(self, records, deliver):
+        super().__init__("qso-resend")
+        self.records = records
+        self.deliver = deliver
+
+    def run(self):
+        sent = 0
+        for record in self.records:
+            if self.stop_event.is_set():
+                break
+            try:
+                self.deliver(record, encode_record(record))
+            except Exception as e:
+                self.resent.emit(sent, str(e))
+                return
+            sent += 1
+        self.resent.emit(sent, "")
+
+def load_plugins(config, directory=PLUGIN_DIR):
+    """
+    Load the plugin stages from the *.py files in directory; broken plugins are logged and skipped.
+    """
+    stages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            spec = importlib.util.spec_from_file_location(f"wlsender_plugin_{name}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            created = module.create_stage(config)
+        except Exception as e:
+            log_error(f"Pipeline plugin {name} could not be loaded: {e}")
+            continue
+        for stage in created if isinstance(created, (list, tuple)) else [created]:
+            if isinstance(stage, Stage):
+                stages.append(stage)
+                log_info(f"Pipeline plugin stage {stage.name} loaded from {name}.")
+            else:
+                log_error(f"Pipeline plugin {name}: create_stage() did not return a Stage.")
+    return stages
+
+class StageWorker(threading.Thread):
+    """
+    Thread running one stage: takes jobs from its queue and passes them on to the next worker.
+    Core stages pass jobs on with a blocking put, so a slow stage fills the queues back to submit().
+    """
+    def __init__(self, stage, pipeline, plugin=False):
+        super().__init__(daemon=True, name=f"pipeline-{stage.name}")
+        self.stage = stage
+        self.pipeline = pipeline
+        self.plugin = plugin
+        self.queue = queue.Queue(maxsize=PLUGIN_QUEUE_SIZE if plugin else QUEUE_SIZE)
+        self.next = None
+        self.emit_done = False  # Set on the last core stage
+        # Gauges outlive a restarted pipeline, so their functions are always rebound
+        metrics.REGISTRY.gauge(f"pipeline_{stage.name}_queue_depth",
+                               f"QSOs waiting for pipeline stage {stage.name}").function = self.queue.qsize
+
+    def put(self, job):
+        """
+        Called by the previous stage; plugin stages drop jobs instead of waiting.
+        """
+        if not self.plugin:
+            self.queue.put(job)
+            return
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            metrics.inc(f"pipeline_{self.stage.name}_dropped_total")
+            log_error(f"Pipeline stage {self.stage.name}: queue full, QSO {job.record.get('CALL', '')} dropped.", audit=True)
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            if self._process(job) and self.next is not None:
+                self.next.put(job)
+        self.stage.close()
+        if self.next is not None:
+            self.next.queue.put(None)  # Stop the next stage after its queued jobs
+
+    def _process(self, job):
+        start = time.perf_counter()
+        try:
+            self.stage.process(job)
+        except Exception as e:
+            metrics.inc(f"pipeline_{self.stage.name}_errors_total")
+            log_error(f"Pipeline stage {self.stage.name} failed for {job.record.get('CALL', '')}: {e}", audit=True)
+            if self.plugin:
+                return True  # A broken plugin must not stop the following plugins
+            self.pipeline.job_failed(job, self.stage.name, str(e))
+            return False
+        finally:
+            job.timings[self.stage.name] = elapsed = time.perf_counter() - start
+            metrics.observe(f"pipeline_{self.stage.name}_seconds", elapsed)
+        if self.emit_done:
+            metrics.observe("pipeline_total_seconds", time.perf_counter() - job.submitted)
+            self.pipeline.qso_done.emit(job)
+        return True
+
+class QSOPipeline(QtCore.QObject):
+    """
+    Chain of stage threads. qso_done and qso_failed are delivered in the GUI thread.
+    """
+    qso_done = QtCore.pyqtSignal(object)  # QSOJob
+    qso_failed = QtCore.pyqtSignal(object, str, str)  # QSOJob, stage name, error
+
+    def __init__(self, stages, plugin_stages=()):
+        super().__init__()
+        self.dedupe = next((stage for stage in stages if isinstance(stage, DedupeStage)), None)
+        self.core_workers = [StageWorker(stage, self) for stage in stages]
+        self.core_workers[-1].emit_done = True
+        self.workers = self.core_workers + [StageWorker(stage, self, plugin=True) for stage in plugin_stages]
+        for worker, following in zip(self.workers, self.workers[1:]):
+            worker.next = following
+        self.stopped = False
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, record):
+        """
+        Queue a QSO record without blocking. Returns False if the pipeline is busy or stopped.
+        """
+        if self.stopped:
+            return False
+        try:
+            self.workers[0].queue.put_nowait(QSOJob(record))
+        except queue.Full:
+            metrics.inc("pipeline_rejected_total")
+            log_error(f"Pipeline busy, QSO {record.get('CALL', '')} not accepted.", audit=True)
+            return False
+        metrics.inc("pipeline_submitted_total")
+        return True
+
+    def job_failed(self, job, stage, error):
+        if self.dedupe is not None and stage != self.dedupe.name:
+            self.dedupe.forget(job.record)  # The operator may send it again
+        self.qso_failed.emit(job, stage, error)
+
+    def pending(self):
+        """
+        Number of QSOs not yet delivered and archived.
+        """
+        return sum(worker.queue.qsize() for worker in self.core_workers)
+
+    def stop(self, timeout=None):
+        """
+        Process the queued QSOs, then end all stage threads. Returns True if every QSO was
+        delivered and archived within timeout; plugin stages get the remaining time, if any.
+        """
+        if not self.stopped:
+            self.stopped = True
+            self.workers[0].queue.put(None)
+        end = None if timeout is None else time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(None if end is None else max(0, end - time.monotonic()))
+        return not any(worker.is_alive() for worker in self.core_workers)
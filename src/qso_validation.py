@@ -0,0 +1,187 @@
+"""
+QSO field validation: precompiled rules per field (callsign, locator, RST by mode, frequency
+within the band, date/time), checked incrementally when a field changes. All problems are
+reported together instead of one message box per problem.
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+from src.adif import adif_freq
+from src.flrig_worker import BAND_TABLE
+from src.locator import normalize_locator
+
+Problem = namedtuple("Problem", "field key params")  # ADIF field, translation key, format values
+
+# English texts, used when the translation has no entry
+MESSAGES = {
+    "call_required": "Callsign is required.",
+    "band_required": "Band is required.",
+    "mode_required": "Mode is required.",
+    "rst_sent_required": "RST Sent is required.",
+    "rst_rcvd_required": "RST Received is required.",
+    "srx_required": "Received serial is required.",
+    "call_invalid": "{value} is not a valid callsign.",
+    "grid_invalid": "{value} is not a valid locator.",
+    "rst_invalid": "RST {value} does not fit mode {mode}.",
+    "freq_invalid": "{value} is not a valid frequency.",
+    "freq_band_mismatch": "{value} MHz is not in the {band} band.",
+    "date_invalid": "{value} is not a valid date (DD.MM.YYYY).",
+    "date_future": "QSO date {value} is in the future.",
+    "time_invalid": "{value} is not a valid time (HH:MM:SS).",
+    "tx_pwr_invalid": "Power {value} must be a number (watts).",
+}
+
+# Optional prefix (e.g. VP2V/), prefix with digit(s), suffix ending in a letter, optional /P, /MM, /5 ...
+CALL_RE = re.compile(r"^(?:[A-Z0-9]{1,4}/)?[A-Z0-9]{1,3}[0-9]{1,4}[A-Z0-9]{0,3}[A-Z](?:/[A-Z0-9]{1,4})?$")
+RST_CW_RE = re.compile(r"^[1-5][1-9][1-9]$")
+RST_PHONE_RE = re.compile(r"^[1-5][1-9]$")
+RST_DIGITAL_RE = re.compile(r"^(?:[1-5][1-9][1-9]?|[+-]?[0-9]{1,2})$")  # RS(T) or a dB report (FT8 ...)
+TIME_RE = re.compile(r"^([01][0-9]|2[0-3]):?([0-5][0-9])(?::?([0-5][0-9]))?$")
+NUMBER_RE = re.compile(r"^[0-9]+(?:\.[0-9]+)?$")
+RST_CW_MODES = ("CW", "RTTY", "PSK")  # Mode prefixes with three-digit RST
+PHONE_MODES = {"SSB", "USB", "LSB", "AM", "FM", "NFM", "DSB", "DV"}
+
+BAND_EDGES = {name: edges for edges, name in BAND_TABLE.items()}
+
+def rst_pattern(mode):
+    mode = mode.strip().upper()
+    if mode.startswith(RST_CW_MODES):
+        return RST_CW_RE
+    if mode in PHONE_MODES:
+        return RST_PHONE_RE
+    return RST_DIGITAL_RE
+
+def _required(field, key):
+    def check(values, contest):
+        if not values.get(field, "").strip():
+            return Problem(field, key, {})
+        return None
+    return check
+
+def check_call(values, contest):
+    call = values.get("CALL", "").strip().upper()
+    if not call:
+        return Problem("CALL", "call_required", {})
+    return None if CALL_RE.match(call) else Problem("CALL", "call_invalid", {"value": call})
+
+def _check_rst(field, key):
+    def check(values, contest):
+        rst = values.get(field, "").strip()
+        if not rst:
+            return Problem(field, key, {})
+        mode = values.get("MODE", "")
+        if mode.strip() and not rst_pattern(mode).match(rst):
+            return Problem(field, "rst_invalid", {"value": rst, "mode": mode.strip().upper()})
+        return None
+    return check
+
+def check_freq(values, contest):
+    text = values.get("FREQ", "").strip()
+    if not text:
+        return None  # Optional, the band is required
+    try:
+        freq = float(adif_freq(text))
+    except ValueError:
+        return Problem("FREQ", "freq_invalid", {"value": text})
+    if freq <= 0:
+        return Problem("FREQ", "freq_invalid", {"value": text})
+    band = values.get("BAND", "").strip().upper()
+    edges = BAND_EDGES.get(band)
+    if edges and not edges[0] <= freq <= edges[1]:
+        return Problem("FREQ", "freq_band_mismatch", {"value": f"{freq:g}", "band": band})
+    return None
+
+def check_grid(values, contest):
+    grid = values.get("GRIDSQUARE", "").strip()
+    if grid and not normalize_locator(grid):
+        return Problem("GRIDSQUARE", "grid_invalid", {"value": grid})
+    return None
+
+def check_date(values, contest):
+    text = values.get("QSO_DATE", "").strip()
+    try:
+        date = datetime.strptime(text, "%d.%m.%Y")
+    except ValueError:
+        return Problem("QSO_DATE", "date_invalid", {"value": text})
+    if date.year < 1930:
+        return Problem("QSO_DATE", "date_invalid", {"value": text})
+    if date > datetime.now() + timedelta(days=1):  # One day of slack for the time zones
+        return Problem("QSO_DATE", "date_future", {"value": text})
+    return None
+
+def _check_time(field):
+    def check(values, contest):
+        text = values.get(field, "").strip()
+        return None if TIME_RE.match(text) else Problem(field, "time_invalid", {"value": text})
+    return check
+
+def check_tx_pwr(values, contest):
+    text = values.get("TX_PWR", "").strip()
+    if text and not NUMBER_RE.match(text):
+        return Problem("TX_PWR", "tx_pwr_invalid", {"value": text})
+    return None
+
+def check_srx(values, contest):
+    if contest and not values.get("SRX", "").strip():
+        return Problem("SRX", "srx_required", {})
+    return None
+
+# One check per field, in the order problems are reported
+RULES = {
+    "CALL": check_call,
+    "BAND": _required("BAND", "band_required"),
+    "FREQ": check_freq,
+    "MODE": _required("MODE", "mode_required"),
+    "RST_SENT": _check_rst("RST_SENT", "rst_sent_required"),
+    "RST_RCVD": _check_rst("RST_RCVD", "rst_rcvd_required"),
+    "SRX": check_srx,
+    "GRIDSQUARE": check_grid,
+    "QSO_DATE": check_date,
+    "TIME_ON": _check_time("TIME_ON"),
+    "TIME_OFF": _check_time("TIME_OFF"),
+    "TX_PWR": check_tx_pwr,
+}
+
+# Checks that read other fields, rerun when those change
+DEPENDENTS = {
+    "BAND": ("BAND", "FREQ"),
+    "MODE": ("MODE", "RST_SENT", "RST_RCVD"),
+}
+
+class QSOValidator:
+    """
+    Current problems of the form, updated field by field.
+    """
+    def __init__(self):
+        self.problems = {}  # field -> Problem
+
+    def update(self, field, values, contest=False):
+        """
+        Recheck a changed field (and the fields depending on it). Returns the rechecked fields.
+        """
+        fields = DEPENDENTS.get(field, (field,))
+        for name in fields:
+            rule = RULES.get(name)
+            if rule is None:
+                continue
+            problem = rule(values, contest)
+            if problem:
+                self.problems[name] = problem
+            else:
+                self.problems.pop(name, None)
+        return fields
+
+    def validate(self, values, contest=False):
+        """
+        Check all fields; returns the problems in report order.
+        """
+        self.problems = {}
+        for name, rule in RULES.items():
+            problem = rule(values, contest)
+            if problem:
+                self.problems[name] = problem
+        return self.current()
+
+    def current(self):
+        return [self.problems[name] for name in RULES if name in self.problems]
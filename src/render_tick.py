@@ -0,0 +1,60 @@
+"""
+Coalesced GUI field updates: the clock, FLRig polls and lookups queue their values,
+a single render tick applies them together and skips values a field already shows.
+"""
+
+from PyQt5 import QtCore
+from src import metrics
+
+TICK_MS = 50
+
+class FieldUpdater(QtCore.QObject):
+    """
+    Pending text per widget (the last value wins), applied in one batch per tick
+    with repaints of the window held back until all fields are set.
+    """
+    def __init__(self, window, interval_ms=TICK_MS):
+        super().__init__(window)
+        self.window = window
+        self.pending = {}  # widget -> text
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def set_text(self, widget, text):
+        """
+        Queue a text for a widget; the tick starts with the first pending update.
+        """
+        self.pending[widget] = text
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def text(self, widget):
+        """
+        Text the widget will show after the next tick (pending value or current text).
+        """
+        return self.pending[widget] if widget in self.pending else widget.text()
+
+    def flush(self):
+        """
+        Apply all pending updates now, e.g. before the form fields are read.
+        """
+        self.timer.stop()
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        applied = 0
+        self.window.setUpdatesEnabled(False)
+        try:
+            for widget, text in pending.items():
+                try:
+                    if widget.text() != text:
+                        widget.setText(text)
+                        applied += 1
+                except RuntimeError:
+                    pass  # Widget deleted meanwhile (e.g. the debug line)
+        finally:
+            self.window.setUpdatesEnabled(True)
+        metrics.inc("gui_field_updates_total", applied)
+        metrics.inc("gui_field_updates_skipped_total", len(pending) - applied)
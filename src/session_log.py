@@ -0,0 +1,214 @@
+"""
+In-memory log of the QSOs sent in this session, with table model and dialog for edit and resend.
+"""
+
+import os
+import sys
+import threading
+from PyQt5 import QtWidgets, QtCore
+from src.adif import ADIF_FIELDS, encode_record, iter_adif_records
+from src.logger import log_error
+
+# Fields whose values repeat a lot and are shared between records
+INTERNED_FIELDS = ("CALL", "QSO_DATE", "BAND", "FREQ", "MODE", "RST_SENT", "RST_RCVD", "OPERATOR", "STATION_CALLSIGN")
+
+class QSORecord:
+    """
+    Compact QSO record: one slot per ADIF field, repeated strings are interned.
+    """
+    __slots__ = ADIF_FIELDS
+
+    def __init__(self, record):
+        for name in ADIF_FIELDS:
+            value = record.get(name, "")
+            setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
+
+    def get(self, name, default=""):
+        return getattr(self, name, default) if name in ADIF_FIELDS else default
+
+    def set(self, name, value):
+        setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in ADIF_FIELDS}
+
+class SessionLogModel(QtCore.QAbstractTableModel):
+    """
+    Table model of the session QSOs, newest first. Rows are handed to the view page by page,
+    and the view only asks for the cells it shows, so large sessions stay responsive.
+
+    The model owns the session file: the pipeline appends through archive_record() (its thread),
+    save() rewrites it (GUI thread), both under file_lock. QSOs archived but not yet added to
+    the model by append_record() are kept in in_flight, so a save() in between keeps them.
+    """
+    COLUMNS = ("CALL", "QSO_DATE", "TIME_ON", "BAND", "FREQ", "MODE", "RST_SENT", "RST_RCVD",
+               "NAME", "QTH", "COUNTRY", "GRIDSQUARE", "COMMENT")
+    PAGE_SIZE = 500
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.records = []  # Oldest first, rows are shown in reverse
+        self.loaded = 0
+        self.file_lock = threading.Lock()
+        self.in_flight = []  # Record dicts archived by the pipeline, not yet in records
+
+    def load(self, path=None):
+        """
+        Load the QSOs of a session file (e.g. left over from an earlier session).
+        """
+        self.path = path or self.path
+        records = []
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                records = [QSORecord(record) for record in iter_adif_records(f)]
+        self.beginResetModel()
+        self.records = records
+        self.loaded = 0
+        self.endResetModel()
+        if self.canFetchMore(QtCore.QModelIndex()):
+            self.fetchMore(QtCore.QModelIndex())
+
+    def clear(self):
+        self.beginResetModel()
+        self.records = []
+        self.loaded = 0
+        self.endResetModel()
+
+    def archive_record(self, record, adif):
+        """
+        Append a sent QSO to the session file (called from the pipeline thread).
+        """
+        with self.file_lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(adif + "\n")
+            self.in_flight.append(record)
+
+    def append_record(self, record):
+        """
+        Add a sent QSO (dict of ADIF fields); it becomes the first row.
+        """
+        with self.file_lock:
+            for i, pending in enumerate(self.in_flight):
+                if pending is record:
+                    del self.in_flight[i]
+                    break
+        self.beginInsertRows(QtCore.QModelIndex(), 0, 0)
+        self.records.append(QSORecord(record))
+        self.loaded += 1
+        self.endInsertRows()
+
+    def record_at(self, row):
+        return self.records[len(self.records) - 1 - row]
+
+    def save(self):
+        """
+        Rewrite the session file from the records, e.g. after an edit.
+        """
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with self.file_lock:
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for record in self.records:
+                        f.write(encode_record(record.to_dict()) + "\n")
+                    for record in self.in_flight:
+                        f.write(encode_record(record) + "\n")
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                log_error(f"Could not save session log: {e}")
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.records)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self.records) - self.loaded)
+        if count:
+            self.beginInsertRows(QtCore.QModelIndex(), self.loaded, self.loaded + count - 1)
+            self.loaded += count
+            self.endInsertRows()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.isValid() and role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self.record_at(index.row()).get(self.COLUMNS[index.column()])
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | QtCore.Qt.ItemIsEditable
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole or not index.isValid():
+            return False
+        name = self.COLUMNS[index.column()]
+        value = str(value).strip()
+        if name in ("CALL", "BAND", "MODE"):
+            value = value.upper()
+        self.record_at(index.row()).set(name, value)
+        self.save()
+        self.dataChanged.emit(index, index)
+        return True
+
+class SessionLogDialog(QtWidgets.QDialog):
+    """
+    Non-modal dialog with the session QSOs; cells can be edited and QSOs resent.
+    """
+    def __init__(self, parent, translation, model, resend):
+        """
+        resend: callable taking a list of QSO dicts to send to WLGate again.
+        """
+        super().__init__(parent)
+        self.translation = translation or {}
+        self.model = model
+        self.resend = resend
+        self.setWindowTitle(self.translation.get("session_log", "Session Log"))
+        self.resize(900, 450)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.view = QtWidgets.QTableView()
+        self.view.setModel(model)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked | QtWidgets.QAbstractItemView.EditKeyPressed)
+        # Fixed row heights let the view skip measuring rows that are not visible
+        self.view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.view.verticalHeader().setVisible(False)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.view)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        self.count_label = QtWidgets.QLabel()
+        button_layout.addWidget(self.count_label)
+        button_layout.addStretch()
+        resend_button = QtWidgets.QPushButton(self.translation.get("resend_selected", "Resend Selected"))
+        resend_button.clicked.connect(self.resend_selected)
+        button_layout.addWidget(resend_button)
+        close_button = QtWidgets.QPushButton(self.translation.get("close", "Close"))
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        model.rowsInserted.connect(self.update_count)
+        model.modelReset.connect(self.update_count)
+        self.update_count()
+
+    def update_count(self, *args):
+        self.count_label.setText(
+            self.translation.get("session_qso_count", "{count} QSOs").format(count=len(self.model.records)))
+
+    def resend_selected(self):
+        rows = sorted({index.row() for index in self.view.selectionModel().selectedRows()})
+        if rows:
+            self.resend([self.model.record_at(row).to_dict() for row in rows])
@@ -0,0 +1,246 @@
+"""
+Multi-operator sync bus: shares sent QSOs between WLSender instances on the LAN via UDP multicast.
+
+Every station numbers its messages. Receivers track the last sequence number per station,
+request missing messages with a NACK and the sender repeats them from a ring buffer.
+Heartbeats carry the latest sequence number, so a lost last message is detected as well.
+A station joining later requests the last MAX_MISSING QSOs of every other station.
+No central server is needed.
+
+Messages are compact JSON datagrams:
+    {"t": "qso", "s": station, "n": seq, "r": {"CALL": ..., "QSO_DATE": ..., ...}}
+    {"t": "hb", "s": station, "n": last_seq}
+    {"t": "nack", "s": station, "to": station, "n": [missing seqs]}
+"""
+
+import json
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from PyQt5 import QtCore
+from src import metrics
+from src.logger import log_error, log_info
+
+DEFAULT_GROUP = "239.255.42.73"
+DEFAULT_PORT = 47342
+SYNC_FIELDS = ("CALL", "QSO_DATE", "TIME_ON", "BAND", "FREQ", "MODE", "RST_SENT", "RST_RCVD",
+               "OPERATOR", "STATION_CALLSIGN")
+RING_SIZE = 2000
+MAX_MISSING = 500
+HEARTBEAT_SECONDS = 5.0
+NACK_RETRY_SECONDS = 2.0
+NACK_MAX_TRIES = 5
+
+def _seq(value):
+    """
+    Return a sequence number from a message; raises TypeError if it is not an integer.
+    """
+    if type(value) is not int:  # Also rejects JSON true/false
+        raise TypeError("Sequence number is not an integer")
+    return value
+
+class PeerState:
+    """
+    Receive state of one remote station.
+    """
+    __slots__ = ("last_seq", "missing", "last_seen")
+
+    def __init__(self, seq):
+        self.last_seq = seq
+        self.missing = {}  # seq -> [next NACK time, tries]
+        self.last_seen = time.monotonic()
+
+class SyncBus(QtCore.QThread):
+    """
+    Sends own QSOs to the multicast group and merges QSOs of the other stations.
+    """
+    qso_received = QtCore.pyqtSignal(dict, str)  # record, station id
+
+    def __init__(self, group=DEFAULT_GROUP, port=DEFAULT_PORT, station=None, send=None):
+        """
+        send: optional callable(bytes) replacing the multicast socket (used for tests).
+        """
+        super().__init__()
+        self.group = group
+        self.port = port
+        self.station = station or uuid.uuid4().hex[:8]
+        self.send_override = send
+        self.sock = None
+        self.running = False
+        self.seq = 0
+        self.ring = OrderedDict()  # seq -> encoded message, for resends
+        self.ring_lock = threading.Lock()
+        self.peers = {}
+        self.last_heartbeat = 0.0
+
+    def open_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("", self.port))
+        membership = struct.pack("4s4s", socket.inet_aton(self.group), socket.inet_aton("0.0.0.0"))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)  # Several instances on one host
+        sock.settimeout(0.5)
+        self.sock = sock
+
+    def _send(self, data):
+        if self.send_override:
+            self.send_override(data)
+        elif self.sock:
+            try:
+                self.sock.sendto(data, (self.group, self.port))
+            except OSError as e:
+                log_error(f"Sync bus send error: {e}")
+
+    @staticmethod
+    def _encode(message):
+        return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+    def publish(self, record):
+        """
+        Broadcast a sent QSO to the other stations.
+        """
+        with self.ring_lock:
+            self.seq += 1
+            data = self._encode({"t": "qso", "s": self.station, "n": self.seq,
+                                 "r": {k: record[k] for k in SYNC_FIELDS if record.get(k)}})
+            self.ring[self.seq] = data
+            if len(self.ring) > RING_SIZE:
+                self.ring.popitem(last=False)
+        self._send(data)
+        metrics.inc("sync_sent_total")
+
+    def handle_datagram(self, data):
+        """
+        Process one received datagram. Anything on the multicast group can send to us, so a
+        malformed message is counted and ignored instead of ending the thread.
+        """
+        try:
+            self._handle_message(json.loads(data.decode("utf-8")))
+        except (KeyError, TypeError, ValueError):  # Includes JSON and Unicode decode errors
+            metrics.inc("sync_invalid_total")
+
+    def _handle_message(self, message):
+        if not isinstance(message, dict) or not isinstance(message["s"], str):
+            raise TypeError("Not a sync message")
+        kind, station = message["t"], message["s"]
+        if station == self.station:
+            return  # Own message via multicast loopback
+        if kind == "qso":
+            self._handle_qso(station, message)
+        elif kind == "hb":
+            self._handle_heartbeat(station, _seq(message["n"]))
+        elif kind == "nack" and message.get("to") == self.station:
+            seqs = message.get("n", [])
+            if not isinstance(seqs, list):
+                raise TypeError("NACK without sequence list")
+            for seq in map(_seq, seqs):
+                with self.ring_lock:
+                    data = self.ring.get(seq)
+                if data:
+                    self._send(data)
+                    metrics.inc("sync_resent_total")
+
+    def _handle_qso(self, station, message):
+        seq = _seq(message["n"])
+        record = message.get("r", {})
+        if not isinstance(record, dict):
+            raise TypeError("QSO record is not an object")
+        record = {k: v for k, v in record.items() if k in SYNC_FIELDS and isinstance(v, str)}
+        peer = self.peers.get(station)
+        if peer is None:
+            # First message of this station: its earlier QSOs are requested as missing
+            peer = self.peers[station] = PeerState(0)
+        peer.last_seen = time.monotonic()
+        if seq in peer.missing:
+            del peer.missing[seq]
+            metrics.inc("sync_recovered_total")
+        elif seq <= peer.last_seq:
+            return  # Duplicate
+        else:
+            self._mark_missing(peer, peer.last_seq + 1, seq)
+            peer.last_seq = seq
+        metrics.inc("sync_received_total")
+        self.qso_received.emit(record, station)
+
+    def _handle_heartbeat(self, station, seq):
+        peer = self.peers.get(station)
+        if peer is None:
+            peer = self.peers[station] = PeerState(0)
+        peer.last_seen = time.monotonic()
+        if seq > peer.last_seq:
+            self._mark_missing(peer, peer.last_seq + 1, seq + 1)
+            peer.last_seq = seq
+
+    def _mark_missing(self, peer, first, end):
+        """
+        Remember the sequence numbers first..end-1 as missing (only the newest MAX_MISSING).
+        """
+        if end <= first:
+            return
+        now = time.monotonic()
+        for seq in range(max(first, end - MAX_MISSING), end):
+            peer.missing[seq] = [now, 0]
+        metrics.inc("sync_gaps_total", end - first)
+
+    def send_nacks(self):
+        """
+        Request missing messages; give up after NACK_MAX_TRIES per message.
+        """
+        now = time.monotonic()
+        for station, peer in self.peers.items():
+            due = []
+            for seq, state in list(peer.missing.items()):
+                if state[0] > now:
+                    continue
+                if state[1] >= NACK_MAX_TRIES:
+                    del peer.missing[seq]
+                    metrics.inc("sync_lost_total")
+                    log_error(f"Sync bus: QSO {seq} of station {station} lost.", audit=True)
+                    continue
+                state[0] = now + NACK_RETRY_SECONDS
+                state[1] += 1
+                due.append(seq)
+            for i in range(0, len(due), 100):
+                self._send(self._encode({"t": "nack", "s": self.station, "to": station, "n": due[i:i + 100]}))
+
+    def tick(self):
+        """
+        Periodic work: heartbeat and NACKs.
+        """
+        now = time.monotonic()
+        if now - self.last_heartbeat >= HEARTBEAT_SECONDS:
+            self.last_heartbeat = now
+            self._send(self._encode({"t": "hb", "s": self.station, "n": self.seq}))
+        self.send_nacks()
+
+    def run(self):
+        try:
+            self.open_socket()
+        except OSError as e:
+            log_error(f"Sync bus could not join {self.group}:{self.port}: {e}")
+            return
+        log_info(f"Sync bus joined {self.group}:{self.port} as station {self.station}.")
+        self.running = True
+        while self.running:
+            try:
+                data, _ = self.sock.recvfrom(65535)
+                self.handle_datagram(data)
+            except socket.timeout:
+                pass
+            except OSError as e:
+                log_error(f"Sync bus receive error: {e}")
+                time.sleep(1)
+            self.tick()
+        self.sock.close()
+
+    def request_stop(self):
+        self.running = False
+
+    def stop(self):
+        self.request_stop()
+        self.wait(2000)
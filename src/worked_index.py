@@ -0,0 +1,98 @@
+"""
+Worked-before index: which bands and modes a callsign has been worked on.
+"""
+
+import json
+import os
+import sys
+import threading
+from src.adif import iter_adif_records
+from src.dxcc import extract_core_callsign
+from src.history import HISTORY_DIR, HistoryArchive
+from src.logger import log_error, log_info
+from src.utils import user_data_path
+
+WORKED_CACHE_FILE = user_data_path("worked_index.json")
+
+class WorkedIndex:
+    """
+    Map of core callsign -> set of (band, mode), built from the history.
+    """
+    def __init__(self):
+        self.worked = {}
+        self.lock = threading.Lock()
+
+    def add(self, call, band="", mode=""):
+        key = extract_core_callsign(call or "")
+        if not key:
+            return
+        entry = (sys.intern(band.upper()), sys.intern(mode.upper()))
+        with self.lock:
+            self.worked.setdefault(key, set()).add(entry)
+
+    def add_record(self, record):
+        self.add(record.get("CALL", ""), record.get("BAND", ""), record.get("MODE", ""))
+
+    def lookup(self, call):
+        """
+        Return the sorted (band, mode) pairs the callsign was worked on.
+        """
+        entries = self.worked.get(extract_core_callsign(call or ""))
+        return sorted(entries) if entries else []
+
+    def is_worked(self, call, band=None, mode=None):
+        """
+        Return True if the callsign was worked (optionally on the given band and/or mode).
+        """
+        for worked_band, worked_mode in self.lookup(call):
+            if (band is None or worked_band == band.upper()) and (mode is None or worked_mode == mode.upper()):
+                return True
+        return False
+
+    def __len__(self):
+        return len(self.worked)
+
+    def to_dict(self):
+        with self.lock:
+            return {call: sorted(entries) for call, entries in self.worked.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.worked = {call: {(sys.intern(b), sys.intern(m)) for b, m in entries} for call, entries in data.items()}
+        return index
+
+def _archive_signature(archive):
+    return [[segment["file"], segment["count"]] for segment in archive.segments]
+
+def load_worked_index(history_dir=HISTORY_DIR, sent_qsos_file=None, cache_file=WORKED_CACHE_FILE):
+    """
+    Build the worked-before index from the history archive and the current session.
+    The archive part is cached and only rebuilt when the archive has changed.
+    """
+    archive = HistoryArchive(history_dir)
+    signature = _archive_signature(archive)
+    index = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                index = WorkedIndex.from_dict(cached.get("worked", {}))
+        except Exception as e:
+            log_error(f"Could not read worked-before cache: {e}")
+    if index is None:
+        index = WorkedIndex()
+        for record in archive.iter_records():
+            index.add_record(record)
+        try:
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({"signature": signature, "worked": index.to_dict()}, f)
+        except Exception as e:
+            log_error(f"Could not write worked-before cache: {e}")
+        log_info(f"Worked-before index built: {len(index)} callsigns.")
+    if sent_qsos_file and os.path.exists(sent_qsos_file):
+        with open(sent_qsos_file, "r", encoding="utf-8", errors="replace") as f:
+            for record in iter_adif_records(f):
+                index.add_record(record)
+    return index
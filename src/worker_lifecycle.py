@@ -0,0 +1,160 @@
+"""
+Lifecycle of the background workers: cooperative stop requests, bounded shutdown deadlines
+and teardown off the GUI thread, so reconfiguring or quitting never freezes the window.
+"""
+
+import threading
+import time
+import xmlrpc.client
+from PyQt5 import QtCore
+from src.logger import log_error, log_info
+
+SHUTDOWN_DEADLINE_SECONDS = 2.0
+
+class TimeoutTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport with a socket timeout, so a hanging server cannot block a worker forever.
+    """
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+class BackgroundTask(QtCore.QObject):
+    """
+    Short-lived job (e.g. a QRZ.com lookup) in a daemon thread with the QThread-like
+    start/isRunning/wait interface. Unlike a QThread, a task still blocked in I/O at exit
+    does not hold up or abort the process.
+    """
+    finished = QtCore.pyqtSignal()
+    wait_at_exit = True  # False for tasks whose result is useless once the app closes
+
+    def __init__(self, name=None):
+        super().__init__()
+        self.name = name or type(self).__name__
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            self.run()
+        except Exception as e:
+            log_error(f"{self.name} failed: {e}")
+        finally:
+            self.finished.emit()
+
+    def run(self):
+        raise NotImplementedError
+
+    def request_stop(self):
+        self.stop_event.set()
+
+    def isRunning(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def wait(self, msecs=None):
+        if self.thread is not None:
+            self.thread.join(None if msecs is None else msecs / 1000)
+        return not self.isRunning()
+
+def request_stop(worker):
+    """
+    Ask a worker to stop: request_stop() if it has one, otherwise its cancelled flag (import/export workers).
+    """
+    if hasattr(worker, "request_stop"):
+        worker.request_stop()
+    elif hasattr(worker, "cancelled"):
+        worker.cancelled = True
+
+class WorkerManager:
+    """
+    Keeps every started worker referenced until it has finished (a QThread object must not be
+    destroyed while running), retires replaced workers without waiting and stops all workers
+    at exit within one common deadline.
+    """
+    def __init__(self):
+        self.workers = set()
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def track(self, worker):
+        """
+        Register a started worker (QThread or BackgroundTask); it is forgotten when it finishes.
+        """
+        with self.lock:
+            self.workers.add(worker)
+        worker.finished.connect(lambda: self._forget(worker))
+        if self.closed:
+            request_stop(worker)  # Started during shutdown (e.g. by a focus change)
+        return worker
+
+    def _forget(self, worker):
+        with self.lock:
+            self.workers.discard(worker)
+
+    def retire(self, worker):
+        """
+        Ask a worker to stop and return immediately; it stays referenced until it is done.
+        """
+        if worker is None:
+            return
+        request_stop(worker)
+        with self.lock:
+            known = worker in self.workers
+        if not known and worker.isRunning():
+            self.track(worker)
+
+    def run_in_background(self, function, name="teardown"):
+        """
+        Run a blocking stop function (e.g. draining a queue) in a tracked daemon thread.
+        """
+        task = _FunctionTask(function, name)
+        self.track(task)
+        task.start()
+        return task
+
+    def running(self):
+        with self.lock:
+            return [worker for worker in self.workers if worker.isRunning()]
+
+    def request_stop_all(self):
+        """
+        Ask all workers to stop without waiting; workers started afterwards are stopped right away.
+        """
+        self.closed = True
+        for worker in self.running():
+            request_stop(worker)
+
+    def shutdown(self, deadline=SHUTDOWN_DEADLINE_SECONDS):
+        """
+        Ask all workers to stop, then wait for them in parallel at most deadline seconds in total.
+        Returns the workers still running.
+        """
+        self.request_stop_all()
+        workers = [worker for worker in self.running() if getattr(worker, "wait_at_exit", True)]
+        end = time.monotonic() + deadline
+        for worker in workers:
+            worker.wait(max(0, int((end - time.monotonic()) * 1000)))
+        remaining = [worker for worker in workers if worker.isRunning()]
+        if remaining:
+            log_error(f"Workers still running after {deadline} s: "
+                      f"{', '.join(getattr(worker, 'name', type(worker).__name__) for worker in remaining)}")
+        else:
+            log_info("All workers stopped.")
+        return remaining
+
+class _FunctionTask(BackgroundTask):
+    def __init__(self, function, name):
+        super().__init__(name)
+        self.function = function
+
+    def run(self):
+        self.function()